@@ -1,10 +1,16 @@
 import os
 import numpy as np
+from typing import Optional
 from rlgym_ppo.util import MetricsLogger
 from slime_api.slimestate import VolleyballState
 
 
 class MyLogger(MetricsLogger):
+    def __init__(self, recordings_dir="recordings"):
+        super().__init__()
+        self.recordings_dir = recordings_dir # Where an EpisodeRecorder saves, new recordings get uploaded with the metrics
+        self.uploaded = set()
+
     def _collect_metrics(self, game_state) -> list:
         game_state: VolleyballState = game_state
         player_0_id = next(iter(game_state.slimes))
@@ -34,28 +40,46 @@ class MyLogger(MetricsLogger):
             "points": points,
         }
 
+        # Recordings show up under their final name only when complete, the .npy ones are [frames, H, W, 3] chunks
+        if os.path.isdir(self.recordings_dir):
+            import wandb
+            for name in sorted(os.listdir(self.recordings_dir)):
+                path = os.path.join(self.recordings_dir, name)
+                if name in self.uploaded or not name.endswith((".npy", ".mp4")):
+                    continue
+                self.uploaded.add(name)
+                video = wandb.Video(path) if name.endswith(".mp4") else wandb.Video(np.load(path).transpose(0, 3, 1, 2), fps=15)
+                report["recording " + name] = video
+
         wandb_run.log(report, step=cumulative_timesteps)
 
 
-def build_indiedev_500_env():
+PRINT_WORKER_STATS = False  # Every worker prints its RSS and startup time once its env is built, for debugging
+
+
+def build_indiedev_500_env(worker: Optional[int] = None):
+    # rlgym_ppo calls this with no arguments, a launcher that knows the worker index can pass it (see slimeworker)
     import gym
     from rlgym.api import RLGym
     from slime_api.slimeengine import IndieDevEngine
     from slime_api.slimeactions import SlimeActions
-    from slime_api.slimeterminalcondition import IndieDevTerminalCondition
-    from slime_api.slimetrucatedcondition import IndieDevTruncatedCondition
+    from slime_api.slimedone import IndieDevDoneEvaluator
     from slime_api.slimeexampleobs import IndieDevDefaultObs
     from slime_api.slimemutator import IndieDevMutator
-    from slime_api.slimerenderer import SlimeRenderer
+    from slime_api.slimeasyncrenderer import AsyncSlimeRenderer
+    from slime_api.slimecapture import EpisodeRecorder
+    from slime_api.slimerenderer import renderer_for_worker
+    from slime_api.slimeworker import worker_stats, format_worker_stats
 
 
-    from rlgym.rocket_league.done_conditions import AnyCondition, AllCondition # Some condition that may be helpful
-    from rlgym.rocket_league.action_parsers import  RepeatAction # Skip some actions, so faster training
-    from rlgym.rocket_league.reward_functions import CombinedReward # Combine multiple rewards into one
-    from rlgym.rocket_league.state_mutators import MutatorSequence # Combine multiple state mutators into one, and they will be applied in order
+    # Helpful ones from rlgym, commented out since every worker would import them at startup even unused
+    # from rlgym.rocket_league.done_conditions import AnyCondition, AllCondition # Some condition that may be helpful
+    # from rlgym.rocket_league.action_parsers import  RepeatAction # Skip some actions, so faster training
+    # from rlgym.rocket_league.reward_functions import CombinedReward # Combine multiple rewards into one
+    # from rlgym.rocket_league.state_mutators import MutatorSequence # Combine multiple state mutators into one, and they will be applied in order
 
 
-    from martico_rewards import PointRward, TouchesReward, BallDistanceReward
+    from slime_api.slimerewards import WeightedReward, PointTerm, TouchesTerm, BallDistanceTerm
 
 
 
@@ -67,13 +91,15 @@ def build_indiedev_500_env():
 
 
     action_parser = SlimeActions()
-    termination_condition = IndieDevTerminalCondition()
-    truncated_condition = IndieDevTruncatedCondition(600)
+    done_evaluator = IndieDevDoneEvaluator(600) # Terminated and truncated checked together
+    termination_condition = done_evaluator.terminal
+    truncated_condition = done_evaluator.truncated
     state_mutator = IndieDevMutator()
 
-    reward_fn = CombinedReward((PointRward(), 50), # 50 to prevent farming having 3 touches
-                               (TouchesReward(), 0.2),
-                               (BallDistanceReward(), 1)
+    # Same rewards as martico_rewards, but computed as arrays (reward_fn.breakdown() has every term for logging)
+    reward_fn = WeightedReward((PointTerm(), 50), # 50 to prevent farming having 3 touches
+                               (TouchesTerm(), 0.2),
+                               (BallDistanceTerm(), 1)
                                )
 
     obs_builder = IndieDevDefaultObs()
@@ -86,11 +112,16 @@ def build_indiedev_500_env():
         termination_cond=termination_condition,
         truncation_cond=truncated_condition,
         transition_engine=IndieDevEngine(),
-        renderer=SlimeRenderer("human"))
+        # Only worker 0 (the one rlgym_ppo renders) gets a renderer, the others get a NullRenderer that does nothing
+        # AsyncSlimeRenderer draws in its own process, render() only copies the state so the env doesn't wait on it
+        renderer=renderer_for_worker(lambda: AsyncSlimeRenderer(fps=60), index=worker))
+        # renderer=renderer_for_worker(lambda: EpisodeRecorder("recordings", stride=4, every=10), index=worker)) # Or save every 10th episode (every 4th step) for MyLogger to upload
 
     wrapped_env = RLGymV2GymWrapper(indie_dev_env)
     wrapped_env.action_space = gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32)  # Set the action space to continuous, not automaticly set
 
+    if PRINT_WORKER_STATS:
+        print(format_worker_stats(worker_stats(worker), "env built"))
     return wrapped_env  # Return the wrapped environment
 
 if __name__ == "__main__":
@@ -119,7 +150,7 @@ if __name__ == "__main__":
                       timestep_limit=1_000_000_000, # Train for 1B steps
                       wandb_project_name="slime_ai", # WandB project name
                       log_to_wandb=True,
-                      render=True, #? Set to what you want, NOTE: rendering slows down 1 env if render delay is set to something, that is recomended to be 0.1
+                      render=True, #? Set to what you want, NOTE: with AsyncSlimeRenderer this costs the env nothing, but render delay still sleeps, keep it 0
                       )
     
 
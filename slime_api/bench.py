@@ -0,0 +1,339 @@
+"""
+Benchmarks for the sim, the engine and the full RLGym pipeline.
+
+python -m slime_api.bench                                  # Everything, printed as JSON
+python -m slime_api.bench -o baseline.json                 # Save it
+python -m slime_api.bench --baseline baseline.json         # Compare against a saved run, exits 1 on a regression
+python -m slime_api.bench --only sim --seconds 5
+
+Every result is a rate (higher is better), the sim ones are per backend: the scalar python loop, the numba loop
+(if numba is installed) and the batched numpy sim. pipeline_* is the original CombinedReward env, pipeline_weighted_*
+the one example_main builds now.
+"""
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
+from slime_api.slimestate import VolleyballState
+from slime_api.sim.batched_sim import BatchedSlimeVolleyballSim, create_base_state
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.fidelity import random_toss
+
+TICK_SKIP = 6  # IndieDevEngine default
+ACTION_POOL = 64  # Actions get drawn once up front and cycled, so drawing them isn't benchmarked
+BATCHED_ARENAS = 256
+
+# name -> SlimeVolleyballSim kwargs
+SIM_CONFIGS = {
+    "python": dict(backend="python"),
+    "python_fast_forward": dict(backend="python", fast_forward=True),
+    "python_continuous_collision": dict(backend="python", continuous_collision=True),
+    "numba": dict(backend="numba"),
+    "numba_fast_forward": dict(backend="numba", fast_forward=True),
+}
+
+
+def measure(run: Callable[[], int], seconds: float) -> float:
+    """Calls run (which returns how much work it did) until seconds have passed, returns work per second"""
+    run()  # Warm up, numba compiles here
+    done = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        done += run()
+        elapsed = time.perf_counter() - start
+    return done / elapsed
+
+
+def random_actions(rng: np.random.Generator, count: int) -> List[Dict[int, np.ndarray]]:
+    """Targets on each slime's own side and a jump now and then, in sim units"""
+    actions = []
+    for _ in range(count):
+        actions.append({
+            0: np.array([rng.uniform(1, 6), 0, rng.uniform(-3, 3), rng.random() < 0.2], dtype=np.float32),
+            1: np.array([rng.uniform(-6, -1), 0, rng.uniform(-3, 3), rng.random() < 0.2], dtype=np.float32),
+        })
+    return actions
+
+
+def random_states(rng: np.random.Generator, count: int) -> List[VolleyballState]:
+    states = []
+    for _ in range(count):
+        state = create_base_state()
+        random_toss(state, rng)
+        states.append(state)
+    return states
+
+
+def bench_sim(seconds: float, seed: int = 0) -> Dict[str, float]:
+    """SlimeVolleyballSim.step_game in sim ticks/s (TICK_SKIP ticks per call, new toss after every point)"""
+    results = {}
+    for name, kwargs in SIM_CONFIGS.items():
+        if kwargs.get("backend") == "numba":
+            from slime_api.sim import jit_kernel
+            if not jit_kernel.NUMBA_AVAILABLE:
+                continue
+        rng = np.random.default_rng(seed)
+        states = random_states(rng, ACTION_POOL)
+        actions = random_actions(rng, ACTION_POOL)
+        sim = SlimeVolleyballSim(copy.deepcopy(states[0]), **kwargs)
+        counter = [0]
+
+        def run() -> int:
+            ticks = 0
+            for action in actions:
+                state = sim.step_game(action, TICK_SKIP)
+                ticks += TICK_SKIP
+                if state.point_scored:
+                    counter[0] += 1
+                    sim.set_state(states[counter[0] % ACTION_POOL])
+            return ticks
+
+        results[f"sim_{name}_ticks_per_sec"] = measure(run, seconds)
+
+    # Batched, every arena counts
+    rng = np.random.default_rng(seed)
+    states = random_states(rng, ACTION_POOL)
+    counter = [0]
+
+    def reset_fn(state: VolleyballState) -> None:
+        counter[0] += 1
+        sim_state = states[counter[0] % ACTION_POOL]
+        for sid, slime in state.slimes.items():
+            slime.position[:] = sim_state.slimes[sid].position
+        state.ball_position[:] = sim_state.ball_position
+        state.ball_velocity[:] = sim_state.ball_velocity
+
+    batched = BatchedSlimeVolleyballSim(BATCHED_ARENAS, reset_fn=reset_fn)
+    pool = np.stack([
+        np.stack([np.stack([a[0], a[1]]) for a in random_actions(rng, BATCHED_ARENAS)])
+        for _ in range(8)
+    ])
+
+    def run_batched() -> int:
+        for actions in pool:
+            batched.step_game(actions, TICK_SKIP)
+        return len(pool) * TICK_SKIP * BATCHED_ARENAS
+
+    results[f"sim_batched{BATCHED_ARENAS}_ticks_per_sec"] = measure(run_batched, seconds)
+    return results
+
+
+def bench_engine(seconds: float, seed: int = 0) -> Dict[str, float]:
+    """IndieDevEngine.step in env steps/s, and a reset through IndieDevMutator (or a BankMutator) + set_state in resets/s"""
+    from slime_api.slimeengine import IndieDevEngine
+    from slime_api.slimemutator import IndieDevMutator
+    from slime_api.slimebank import BankMutator, indiedev_bank, INDIEDEV_WEIGHTS
+
+    rng = np.random.default_rng(seed)
+    actions = random_actions(rng, ACTION_POOL)
+    engine = IndieDevEngine()
+    mutator = IndieDevMutator(seed)
+    shared_info: Dict[str, Any] = {}
+
+    bank_mutator = BankMutator(indiedev_bank(100_000, seed), INDIEDEV_WEIGHTS, seed)
+
+    def reset(mutator=mutator) -> None:
+        state = engine.create_base_state()
+        mutator.apply(state, shared_info)
+        engine.set_state(state, shared_info)
+
+    def run_steps() -> int:
+        for action in actions:
+            if engine.step(action, shared_info).point_scored:
+                reset()
+        return len(actions)
+
+    def run_resets() -> int:
+        for _ in range(ACTION_POOL):
+            reset()
+        return ACTION_POOL
+
+    def run_bank_resets() -> int:
+        for _ in range(ACTION_POOL):
+            reset(bank_mutator)
+        return ACTION_POOL
+
+    reset()
+    return {
+        "engine_steps_per_sec": measure(run_steps, seconds),
+        "mutator_resets_per_sec": measure(run_resets, seconds),
+        "bank_resets_per_sec": measure(run_bank_resets, seconds),
+    }
+
+
+def build_pipeline(seed=None):
+    """
+    The env the pipeline_* results have always measured: CombinedReward over the martico_rewards and the two
+    separate done conditions. Kept as it was so those numbers stay comparable with older baselines.
+    """
+    from rlgym.api import RLGym
+    from rlgym.rocket_league.reward_functions import CombinedReward
+    from slime_api.slimeengine import IndieDevEngine
+    from slime_api.slimeactions import SlimeActions
+    from slime_api.slimeterminalcondition import IndieDevTerminalCondition
+    from slime_api.slimetrucatedcondition import IndieDevTruncatedCondition
+    from slime_api.slimeexampleobs import IndieDevDefaultObs
+    from slime_api.slimemutator import IndieDevMutator
+    from martico_rewards import PointRward, TouchesReward, BallDistanceReward
+
+    return RLGym(
+        state_mutator=IndieDevMutator(seed),
+        obs_builder=IndieDevDefaultObs(),
+        action_parser=SlimeActions(),
+        reward_fn=CombinedReward((PointRward(), 50), (TouchesReward(), 0.2), (BallDistanceReward(), 1)),
+        termination_cond=IndieDevTerminalCondition(),
+        truncation_cond=IndieDevTruncatedCondition(600),
+        transition_engine=IndieDevEngine())
+
+
+def build_weighted_pipeline(seed=None):
+    """Same env as example_main.build_indiedev_500_env (WeightedReward, IndieDevDoneEvaluator), without the renderer and the gym wrapper"""
+    from rlgym.api import RLGym
+    from slime_api.slimeengine import IndieDevEngine
+    from slime_api.slimeactions import SlimeActions
+    from slime_api.slimedone import IndieDevDoneEvaluator
+    from slime_api.slimeexampleobs import IndieDevDefaultObs
+    from slime_api.slimemutator import IndieDevMutator
+    from slime_api.slimerewards import WeightedReward, PointTerm, TouchesTerm, BallDistanceTerm
+
+    done = IndieDevDoneEvaluator(600)
+    return RLGym(
+        state_mutator=IndieDevMutator(seed),
+        obs_builder=IndieDevDefaultObs(),
+        action_parser=SlimeActions(),
+        reward_fn=WeightedReward((PointTerm(), 50), (TouchesTerm(), 0.2), (BallDistanceTerm(), 1)),
+        termination_cond=done.terminal,
+        truncation_cond=done.truncated,
+        transition_engine=IndieDevEngine())
+
+
+def _bench_env(env, seconds: float, seed: int, prefix: str) -> Dict[str, float]:
+    """env.step in env steps/s (new episode when any agent is done), and env.reset in resets/s"""
+    rng = np.random.default_rng(seed)
+    env.reset()
+    actions = [{agent: rng.uniform(-1, 1, 4).astype(np.float32) for agent in env.agents} for _ in range(ACTION_POOL)]
+
+    def run_steps() -> int:
+        for action in actions:
+            _, _, terminated, truncated = env.step(action)
+            if any(terminated.values()) or any(truncated.values()):
+                env.reset()
+        return len(actions)
+
+    def run_resets() -> int:
+        for _ in range(ACTION_POOL):
+            env.reset()
+        return ACTION_POOL
+
+    return {
+        f"{prefix}_steps_per_sec": measure(run_steps, seconds),
+        f"{prefix}_resets_per_sec": measure(run_resets, seconds),
+    }
+
+
+def bench_pipeline(seconds: float, seed: int = 0) -> Dict[str, float]:
+    """RLGym.step and RLGym.reset on build_pipeline"""
+    return _bench_env(build_pipeline(seed), seconds, seed, "pipeline")
+
+
+def bench_weighted_pipeline(seconds: float, seed: int = 0) -> Dict[str, float]:
+    """RLGym.step and RLGym.reset on build_weighted_pipeline, the same env with the slimerewards / slimedone versions"""
+    return _bench_env(build_weighted_pipeline(seed), seconds, seed, "pipeline_weighted")
+
+
+BENCHMARKS = {
+    "sim": bench_sim,
+    "engine": bench_engine,
+    "pipeline": bench_pipeline,
+    "pipeline_weighted": bench_weighted_pipeline,
+}
+
+
+def run_benchmarks(only: Optional[List[str]] = None, seconds: float = 2.0, seed: int = 0) -> Dict[str, Any]:
+    """Runs the benchmarks (all of them if only is None), the ones missing a dependency end up in skipped"""
+    results: Dict[str, float] = {}
+    skipped: Dict[str, str] = {}
+    for name, bench in BENCHMARKS.items():
+        if only is not None and name not in only:
+            continue
+        try:
+            results.update(bench(seconds, seed))
+        except ImportError as e:
+            skipped[name] = str(e)
+
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "numba": numba_version,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "seconds": seconds,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Prints current vs baseline for every result, returns the ones that got slower by more than tolerance"""
+    regressions = []
+    print(f"{'benchmark':<46} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<46} {'-':>12} {value:12.1f} {'new':>8}")
+            continue
+        change = value / base - 1
+        flag = ""
+        if change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<46} {base:12.1f} {value:12.1f} {change:+8.1%}{flag}")
+    for name in baseline["results"]:
+        if name not in current["results"]:
+            print(f"{name:<46} {baseline['results'][name]:12.1f} {'-':>12} {'gone':>8}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m slime_api.bench", description="Sim, engine and pipeline benchmarks")
+    parser.add_argument("--only", help="Comma separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent on each measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write the results as JSON here")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Slowdown that counts as a regression (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    results = run_benchmarks(only, args.seconds, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, reason in results["skipped"].items():
+            print(f"skipped {name}: {reason}")
+        return 1 if regressions else 0
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+from slime_api.common_values import *
+from slime_api.slimestate import VolleyballState, Slime
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+NUM_SLIMES = 2
+
+# Scalar versions of the vector constants, so the masks below stay f32
+GRAVITY_Y = np.float32(GRAVITY[1])
+GROUNDED_HEIGHT = np.float32(SLIME_CENTER_ON_FLOOR + 0.1)
+REDUCED_MASS = 1.0 / (1.0 / SLIME_MASS + 1.0 / BALL_MASS)
+SLIME_SHARE = BALL_MASS / (SLIME_MASS + BALL_MASS)  # How much of the overlap the slime is pushed back
+BALL_SHARE = SLIME_MASS / (SLIME_MASS + BALL_MASS)
+
+
+def create_base_state() -> VolleyballState:
+    # Same as IndieDevEngine.create_base_state, but without needing rlgym
+    return VolleyballState({0: Slime(np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), 3, False, 0, 0),
+                            1: Slime(np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), 3, False, 0, 0)},
+                           np.zeros(3, dtype=np.float32),
+                           np.zeros(3, dtype=np.float32),
+                           False,
+                           None)
+
+
+@dataclass
+class RolloutOutcome:
+    """What happened in each branch of BatchedSlimeVolleyballSim.rollout"""
+    point_scored: np.ndarray  # [M] bool
+    scoring_slime: np.ndarray  # [M] int8, -1 if nobody scored
+    ticks: np.ndarray  # [M] ticks simulated before the point (or all of them)
+    touches: np.ndarray  # [M, 2] ball contacts per slime, including the one that gives the point away
+    landing_position: np.ndarray  # [M, 2] ball x/z where it hit the floor, NaN if it didn't
+
+
+class BatchedSlimeVolleyballSim:
+    """
+    Steps N arenas at once. Same physics as SlimeVolleyballSim.step_game, but every arena is a row in packed
+    f32 arrays and every branch is a mask, so the python overhead is paid once per tick instead of once per arena.
+    """
+    def __init__(
+        self,
+        num_arenas: int,
+        initial_state: Optional[VolleyballState] = None,
+        max_speed: float = 6.0,
+        acceleration: float = 2.0,
+        jump_force: float = 2.0,
+        auto_reset: bool = True,
+        reset_fn: Optional[Callable[[VolleyballState], None]] = None
+    ):
+        n = int(num_arenas)
+        self.num_arenas = n
+
+        self.ball_position = np.zeros((n, 3), dtype=np.float32)
+        self.ball_velocity = np.zeros((n, 3), dtype=np.float32)
+        self.slime_position = np.zeros((n, NUM_SLIMES, 3), dtype=np.float32)
+        self.slime_velocity = np.zeros((n, NUM_SLIMES, 3), dtype=np.float32)
+        self.slime_target = np.zeros((n, NUM_SLIMES, 3), dtype=np.float32)
+        self.jump_cooldown = np.zeros((n, NUM_SLIMES), dtype=np.float32)
+        self.touch_cooldown = np.zeros((n, NUM_SLIMES), dtype=np.float32)
+        self.touches_remaining = np.zeros((n, NUM_SLIMES), dtype=np.float32)
+        self.can_jump = np.zeros((n, NUM_SLIMES), dtype=bool)
+        self.point_scored = np.zeros(n, dtype=bool)
+        self.scoring_slime = np.full(n, -1, dtype=np.int8)  # -1 means None
+        self.steps = np.zeros(n, dtype=np.int64)
+        # Not part of VolleyballState, bookkeeping since the arena was last set/reset
+        self.touches = np.zeros((n, NUM_SLIMES), dtype=np.int32)
+        self.landing_position = np.full((n, 2), np.nan, dtype=np.float32)
+
+        self.max_speed_points = max_speed
+        self.acceleration_points = acceleration
+        self.jump_force_points = jump_force
+        self.max_speed = MAX_SPEED_RANGE[int(max_speed)]
+        self.acceleration = ACCELERATION_RANGE[int(acceleration)]
+        self.jump_force = JUMP_FORCE_RANGE[int(jump_force)]
+
+        self.auto_reset = auto_reset
+        self.reset_fn = reset_fn
+        self._initial_state = initial_state if initial_state is not None else create_base_state()
+
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Resets the arenas in mask (all of them if None), with reset_fn if we have one, or the initial state"""
+        indices = range(self.num_arenas) if mask is None else np.flatnonzero(mask)
+        if self.reset_fn is None:
+            for idx in indices:
+                self.set_state(idx, self._initial_state)
+            return
+        for idx in indices:
+            state = create_base_state()
+            self.reset_fn(state)
+            self.set_state(idx, state)
+
+    def set_state(self, idx: int, state: VolleyballState) -> None:
+        """Loads a VolleyballState into arena idx"""
+        for sid in range(NUM_SLIMES):
+            slime = state.slimes[sid]
+            self.slime_position[idx, sid] = slime.position
+            self.slime_velocity[idx, sid] = slime.velocity
+            self.slime_target[idx, sid] = slime.target
+            self.jump_cooldown[idx, sid] = slime.jump_cooldown
+            self.touch_cooldown[idx, sid] = slime.touch_cooldown
+            self.touches_remaining[idx, sid] = slime.touches_remaining
+            self.can_jump[idx, sid] = slime.can_jump
+        self.ball_position[idx] = state.ball_position
+        self.ball_velocity[idx] = state.ball_velocity
+        self.point_scored[idx] = state.point_scored
+        self.scoring_slime[idx] = -1 if state.scoring_slime is None else state.scoring_slime
+        self.steps[idx] = state.steps
+        self.touches[idx] = 0
+        self.landing_position[idx] = np.nan
+
+    def set_state_all(self, state: VolleyballState) -> None:
+        """Loads the same VolleyballState into every arena"""
+        self.set_state(0, state)
+        for array in (self.ball_position, self.ball_velocity, self.slime_position, self.slime_velocity,
+                      self.slime_target, self.jump_cooldown, self.touch_cooldown, self.touches_remaining,
+                      self.can_jump, self.point_scored, self.scoring_slime, self.steps, self.touches,
+                      self.landing_position):
+            array[1:] = array[0]
+
+    def get_state(self, idx: int) -> VolleyballState:
+        """Copies arena idx out as a VolleyballState"""
+        slimes = {
+            sid: Slime(
+                self.slime_position[idx, sid].copy(),
+                self.slime_velocity[idx, sid].copy(),
+                self.slime_target[idx, sid].copy(),
+                float(self.touches_remaining[idx, sid]),
+                bool(self.can_jump[idx, sid]),
+                float(self.jump_cooldown[idx, sid]),
+                float(self.touch_cooldown[idx, sid])
+            )
+            for sid in range(NUM_SLIMES)
+        }
+        scorer = int(self.scoring_slime[idx])
+        return VolleyballState(
+            slimes,
+            self.ball_position[idx].copy(),
+            self.ball_velocity[idx].copy(),
+            bool(self.point_scored[idx]),
+            None if scorer < 0 else scorer,
+            int(self.steps[idx])
+        )
+
+    def step_game(self, actions: np.ndarray, ticks: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advances every arena by ticks. actions is [N, 2, 4] (x, y, z target + jump flag).
+        Arenas that score stop for the rest of the call, like the scalar sim.
+        Returns (point_scored, scoring_slime) as they were before auto reset.
+        """
+        actions = np.asarray(actions, dtype=np.float32)
+        for _ in range(ticks):
+            active = ~self.point_scored
+            if not active.any():
+                break
+            self.scoring_slime[active] = -1
+
+            for sid in range(NUM_SLIMES):
+                self._step_slime(sid, actions[:, sid], active)
+
+            self._step_ball(active)
+            self.steps[active] += 1
+
+        point_scored = self.point_scored.copy()
+        scoring_slime = self.scoring_slime.copy()
+        if self.auto_reset and point_scored.any():
+            self.reset(point_scored)
+        return point_scored, scoring_slime
+
+    def rollout(self, state: VolleyballState, actions: np.ndarray, ticks_per_action: int = 1) -> RolloutOutcome:
+        """
+        What-if search: plays M candidate action sequences from the same state, one per arena, in one vectorized call.
+        actions is [M, K, 2, 4], each of the K actions is held for ticks_per_action ticks, like an env step.
+        The final states stay in the arenas (get_state(i)), no auto reset happens here.
+        """
+        actions = np.asarray(actions, dtype=np.float32)
+        assert actions.shape[0] == self.num_arenas and actions.shape[2:] == (NUM_SLIMES, 4)
+        self.set_state_all(state)
+        start_steps = int(self.steps[0])
+
+        auto_reset = self.auto_reset
+        self.auto_reset = False
+        try:
+            for k in range(actions.shape[1]):
+                if self.point_scored.all():
+                    break
+                self.step_game(actions[:, k], ticks_per_action)
+        finally:
+            self.auto_reset = auto_reset
+
+        return RolloutOutcome(
+            self.point_scored.copy(),
+            self.scoring_slime.copy(),
+            self.steps - start_steps,
+            self.touches.copy(),
+            self.landing_position.copy()
+        )
+
+    def _step_slime(self, sid: int, action: np.ndarray, active: np.ndarray) -> None:
+        pos = self.slime_position[:, sid]
+        vel = self.slime_velocity[:, sid]
+
+        jump_cooldown = np.where(active, np.maximum(self.jump_cooldown[:, sid] - DT, 0), self.jump_cooldown[:, sid])
+        self.touch_cooldown[:, sid] = np.where(active, np.maximum(self.touch_cooldown[:, sid] - DT, 0), self.touch_cooldown[:, sid])
+
+        # Controller
+        target = action[:, :3]
+        self.slime_target[active, sid] = target[active]
+        jump_req = action[:, 3] != 0
+        is_grounded = pos[:, 1] <= GROUNDED_HEIGHT
+        can_jump = is_grounded & (jump_cooldown <= 0.0)
+        self.can_jump[:, sid] = np.where(active, can_jump, self.can_jump[:, sid])
+
+        do_jump = active & jump_req & can_jump
+        jump_vel_y = np.where(do_jump, self.jump_force, vel[:, 1])
+        self.jump_cooldown[:, sid] = np.where(do_jump, np.float32(JUMP_COOLDOWN_SECONDS), jump_cooldown)
+
+        dir_x = target[:, 0] - pos[:, 0]
+        dir_z = target[:, 2] - pos[:, 2]
+        dist = np.sqrt(dir_x * dir_x + dir_z * dir_z)
+        stopped = dist <= np.float32(STOPPING_DISTANCE)
+
+        vel_x = vel[:, 0]
+        vel_z = vel[:, 2]
+        max_delta = self.acceleration * DT[0]
+
+        # Close enough, brake (the jump velocity is dropped here, same as the scalar sim)
+        lerp_factor = 1 - max_delta
+        stop_x = vel_x * lerp_factor
+        stop_z = vel_z * lerp_factor
+
+        # Otherwise accelerate towards the target, slowing down when we would overshoot
+        mag_sq = vel_x * vel_x + vel_z * vel_z
+        threshold = 0.5 * mag_sq / self.acceleration + STOPPING_DISTANCE
+        braking = (np.sqrt(mag_sq) > 1e-5) & (dist <= threshold)
+        temp_max_speed = np.where(
+            braking,
+            np.sqrt(2 * self.acceleration * np.maximum(dist - np.float32(STOPPING_DISTANCE), 0)),
+            self.max_speed
+        )
+        safe_dist = np.where(stopped, 1, dist)
+        target_x = dir_x / safe_dist * temp_max_speed
+        target_z = dir_z / safe_dist * temp_max_speed
+
+        # move_towards
+        delta_x = target_x - vel_x
+        delta_z = target_z - vel_z
+        delta_dist = np.sqrt(delta_x * delta_x + delta_z * delta_z)
+        reached = (delta_dist <= max_delta) | (delta_dist == 0)
+        safe_delta = np.where(reached, 1, delta_dist)
+        move_x = np.where(reached, target_x, vel_x + delta_x / safe_delta * max_delta)
+        move_z = np.where(reached, target_z, vel_z + delta_z / safe_delta * max_delta)
+
+        new_vel = np.empty_like(vel)
+        new_vel[:, 0] = np.where(stopped, stop_x, move_x)
+        new_vel[:, 1] = np.where(stopped, vel[:, 1], jump_vel_y)
+        new_vel[:, 2] = np.where(stopped, stop_z, move_z)
+
+        # Gravity & move
+        new_vel[:, 1] += GRAVITY_Y * DT[0]
+        new_pos = pos + new_vel * DT[0]
+
+        # Floor
+        on_floor = (new_pos[:, 1] < SLIME_CENTER_ON_FLOOR) & (new_vel[:, 1] < 0)
+        new_pos[on_floor, 1] = SLIME_CENTER_ON_FLOOR
+        new_vel[on_floor, 1] = 0.0
+
+        # Slime can't cross
+        blocked = new_pos[:, 1] < SLIME_BLOCKER_HEIGHT_FLT
+        left = blocked & (pos[:, 0] < 0) & (new_pos[:, 0] + SLIME_RADIUS > -NET_PLANE_X)
+        new_pos[left, 0] = 0 - NET_HALF_THICKNESS - SLIME_RADIUS
+        new_vel[left, 0] = 0.0
+        right = blocked & (pos[:, 0] > 0) & (new_pos[:, 0] - SLIME_RADIUS < NET_PLANE_X)
+        new_pos[right, 0] = NET_PLANE_X + SLIME_RADIUS
+        new_vel[right, 0] = 0.0
+
+        vel[active] = new_vel[active]
+        pos[active] = new_pos[active]
+
+        # Ball collision
+        delta_pos = self.ball_position - pos
+        distance = np.sqrt(np.einsum('ij,ij->i', delta_pos, delta_pos))
+        min_distance = SLIME_RADIUS + BALL_RADIUS
+        hit = active & (distance <= min_distance)
+        if not hit.any():
+            return
+
+        normal = delta_pos[hit] / distance[hit, None]
+        relative_vel = self.ball_velocity[hit] - vel[hit]
+        velocity_along_normal = np.einsum('ij,ij->i', relative_vel, normal)
+        approaching = velocity_along_normal <= 0
+        hit_idx = np.flatnonzero(hit)[approaching]
+        normal = normal[approaching]
+
+        impulse = (-(1 + BALL_RESTITUTION) * velocity_along_normal[approaching] * REDUCED_MASS)[:, None] * normal
+        vel[hit_idx] -= impulse / SLIME_MASS
+        self.ball_velocity[hit_idx] += impulse / BALL_MASS
+
+        overlap = np.maximum(min_distance - distance[hit_idx], 0)[:, None] * normal
+        pos[hit_idx] -= SLIME_SHARE * overlap
+        self.ball_position[hit_idx] += BALL_SHARE * overlap
+
+        touched = hit_idx[self.touch_cooldown[hit_idx, sid] <= 0]
+        self.touch_cooldown[touched, sid] = SLIME_TOUCH_COOLDOWN
+        self.touches[touched, sid] += 1
+        has_touches = self.touches_remaining[touched, sid] > 0
+        self.touches_remaining[touched[has_touches], sid] -= 1
+        out_of_touches = touched[~has_touches]
+        self.point_scored[out_of_touches] = True
+        self.scoring_slime[out_of_touches] = np.where(self.ball_position[out_of_touches, 0] < 0, 1, 0)
+
+    def _step_ball(self, active: np.ndarray) -> None:
+        pos = self.ball_position
+        vel = self.ball_velocity
+
+        prev_x = pos[:, 0].copy()
+        vel[active, 1] += GRAVITY_Y * DT[0]
+        pos[active] += vel[active] * DT[0]
+
+        bx = pos[:, 0].copy()
+        by = pos[:, 1]
+        bz = pos[:, 2].copy()
+        # Distance from net
+        bndx = np.abs(bx) - (BALL_RADIUS + NET_HALF_THICKNESS)
+        bndy = by - NET_HEIGHT_FLT - BALL_RADIUS
+
+        self.touches_remaining[active & (bndx <= 0)] = 3
+
+        in_net = active & (bndx < 0) & (bndy < 0)
+        # Same as the scalar sim: whichever wall it's closer to is the one it's bouncing off
+        net_side = in_net & (bndx >= bndy)
+        vel[net_side, 0] *= -BALL_RESTITUTION
+        pos[net_side, 0] = np.where(prev_x[net_side] < 0, NET_HALF_THICKNESS - BALL_RADIUS, NET_HALF_THICKNESS + BALL_RADIUS)
+        net_top = in_net & ~net_side
+        vel[net_top, 1] *= -BALL_RESTITUTION
+        pos[net_top, 1] = NET_HEIGHT_FLT + BALL_RADIUS
+
+        back_wall = active & ~in_net & (np.abs(bx) > STAGE_RADIUS[0] - BALL_RADIUS)
+        vel[back_wall, 0] *= -BALL_RESTITUTION
+        pos[back_wall, 0] = np.sign(bx[back_wall]) * (STAGE_RADIUS[0] - BALL_RADIUS)
+
+        side_wall = active & (np.abs(bz) > STAGE_RADIUS[1] - BALL_RADIUS)
+        vel[side_wall, 2] *= -BALL_RESTITUTION
+        pos[side_wall, 2] = np.sign(bz[side_wall]) * (STAGE_RADIUS[1] - BALL_RADIUS)
+
+        # Floor collision -> point scored, so we can reset
+        floor = active & (pos[:, 1] <= 0)
+        pos[floor, 1] = 0
+        self.point_scored[floor] = True
+        self.landing_position[floor] = pos[floor][:, ::2]
+        self.scoring_slime[floor] = np.where(pos[floor, 0] < 0, 1, 0)
@@ -0,0 +1,169 @@
+"""
+How far a coarser DT drifts from the reference sim (discrete collision at DT), with and without continuous collision.
+Both sims play the same hard tosses with the same ball chasing policy, an action lasts the same time in both.
+Both get stepped one tick per call so the overlaps can be checked after every tick.
+Continuous collision takes the net and wall penetration to zero, but it doesn't make the scorer agree more often, the
+ball meets slimes at the time of impact while the reference resolves them after they overlap, so the bounces differ.
+
+python -m slime_api.sim.fidelity [dt ...] [--episodes 200] [--seed 0]
+"""
+import argparse
+import copy
+import time
+import numpy as np
+from math import sqrt
+from typing import Dict
+from slime_api.common_values import *
+from slime_api.slimestate import VolleyballState
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.main_sim import SlimeVolleyballSim
+
+_DT = float(DT[0])
+ACTION_SECONDS = 6 * _DT  # One env step with the default tick_skip
+
+
+def random_toss(state: VolleyballState, rng: np.random.Generator) -> None:
+    """Same kind of state as HardTossMutator (ball at 7 to 24 units/s from one side), but slimes on the floor"""
+    for sid, slime in state.slimes.items():
+        side = 1 if sid == 0 else -1
+        slime.position[:] = (side * rng.uniform(0.26 + SLIME_RADIUS, 6), SLIME_CENTER_ON_FLOOR, rng.uniform(-3, 3))
+        slime.target[:] = slime.position
+    direction = rng.choice([-1, 1])
+    velocity = np.array([direction, rng.uniform(1, 4), rng.uniform(-0.5, 0.5)])
+    state.ball_velocity[:] = velocity * rng.uniform(7, 24) / np.linalg.norm(velocity)
+    state.ball_position[:] = (rng.uniform(1, 5) * -direction, 2, 0)
+
+
+def chase_ball(state: VolleyballState) -> Dict[int, np.ndarray]:
+    """Every slime runs under the ball on its own side and jumps when it's close"""
+    actions = {}
+    ball = state.ball_position
+    for sid, slime in state.slimes.items():
+        side = 1 if sid == 0 else -1
+        x = side * min(max(side * ball[0], NET_PLANE_X + SLIME_RADIUS), STAGE_RADIUS[0])
+        jump = np.linalg.norm(ball - slime.position) < 2.5
+        actions[sid] = np.array([x, 0, ball[2], jump], dtype=np.float32)
+    return actions
+
+
+def net_penetration(state: VolleyballState) -> float:
+    """How deep the ball is inside the net (rounded at the top corners by the ball radius), 0 if it isn't"""
+    x = abs(float(state.ball_position[0]))
+    y = float(state.ball_position[1])
+    net_side = BALL_RADIUS + NET_HALF_THICKNESS
+    if x >= net_side or y >= NET_HEIGHT_FLT + BALL_RADIUS:
+        return 0.0
+    if x > NET_HALF_THICKNESS and y > NET_HEIGHT_FLT:
+        return max(BALL_RADIUS - sqrt((x - NET_HALF_THICKNESS) ** 2 + (y - NET_HEIGHT_FLT) ** 2), 0.0)
+    return min(net_side - x, NET_HEIGHT_FLT + BALL_RADIUS - y)
+
+
+def slime_penetration(state: VolleyballState) -> float:
+    """How deep the ball is inside the closest slime, 0 if it isn't"""
+    depth = 0.0
+    for slime in state.slimes.values():
+        distance = float(np.linalg.norm(state.ball_position - slime.position))
+        depth = max(depth, SLIME_RADIUS + BALL_RADIUS - distance)
+    return depth
+
+
+def _play_action(sim: SlimeVolleyballSim, ticks: int, worst: np.ndarray) -> float:
+    """Plays one chase_ball action tick by tick, keeps the deepest [net, slime] overlap in worst, returns the wall time"""
+    actions = chase_ball(sim.state)
+    elapsed = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        state = sim.step_game(actions, 1)
+        elapsed += time.perf_counter() - start
+        worst[0] = max(worst[0], net_penetration(state))
+        worst[1] = max(worst[1], slime_penetration(state))
+        if state.point_scored:
+            break
+    return elapsed
+
+
+def fidelity_report(
+    dt: float,
+    continuous_collision: bool = True,
+    episodes: int = 200,
+    max_actions: int = 200,
+    horizon: int = 10,
+    seed: int = 0,
+    reference_continuous_collision: bool = False
+) -> Dict[str, float]:
+    """
+    Plays the same episodes on the reference sim (at DT, discrete unless reference_continuous_collision)
+    and on a sim at dt, returns:
+    scorer_agreement: fraction of episodes that end with the same scorer (or no point in both)
+    point_time_error: mean seconds between the two points, over episodes where both scored
+    ball_rmse: ball position error over the first horizon actions (later on the rallies just diverge)
+    net_penetration / slime_penetration: deepest the ball got into the net / a slime after a tick at dt
+    reference_net_penetration / reference_slime_penetration: same for the reference sim
+    speedup: reference wall time / wall time at dt
+    """
+    rng = np.random.default_rng(seed)
+    reference_ticks = max(1, round(ACTION_SECONDS / _DT))
+    coarse_ticks = max(1, round(ACTION_SECONDS / dt))
+
+    agreed = 0
+    time_errors = []
+    squared_error = 0.0
+    samples = 0
+    coarse_worst = np.zeros(2)
+    reference_worst = np.zeros(2)
+    reference_time = 0.0
+    coarse_time = 0.0
+
+    for _ in range(episodes):
+        state = create_base_state()
+        random_toss(state, rng)
+        reference = SlimeVolleyballSim(copy.deepcopy(state), continuous_collision=reference_continuous_collision)
+        coarse = SlimeVolleyballSim(copy.deepcopy(state), dt=dt, continuous_collision=continuous_collision)
+
+        for action in range(max_actions):
+            if not reference.state.point_scored:
+                reference_time += _play_action(reference, reference_ticks, reference_worst)
+            if not coarse.state.point_scored:
+                coarse_time += _play_action(coarse, coarse_ticks, coarse_worst)
+            if reference.state.point_scored and coarse.state.point_scored:
+                break
+            if action < horizon and not (reference.state.point_scored or coarse.state.point_scored):
+                squared_error += float(np.sum((reference.state.ball_position - coarse.state.ball_position) ** 2))
+                samples += 1
+
+        agreed += reference.state.scoring_slime == coarse.state.scoring_slime
+        if reference.state.point_scored and coarse.state.point_scored:
+            time_errors.append(abs(reference.state.steps * _DT - coarse.state.steps * dt))
+
+    return {
+        "dt": dt,
+        "continuous_collision": continuous_collision,
+        "reference_continuous_collision": reference_continuous_collision,
+        "scorer_agreement": agreed / episodes,
+        "point_time_error": float(np.mean(time_errors)) if time_errors else float("nan"),
+        "ball_rmse": sqrt(squared_error / samples) if samples else float("nan"),
+        "net_penetration": float(coarse_worst[0]),
+        "slime_penetration": float(coarse_worst[1]),
+        "reference_net_penetration": float(reference_worst[0]),
+        "reference_slime_penetration": float(reference_worst[1]),
+        "speedup": reference_time / coarse_time if coarse_time else float("nan"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m slime_api.sim.fidelity",
+                                     description="Compare coarser DTs (with and without continuous collision) against the default sim")
+    parser.add_argument("dts", type=float, nargs="*", help=f"Seconds per tick to check (default {_DT:.4f}, 2x, 3x and 6x that)")
+    parser.add_argument("--episodes", type=int, default=200, help="Tosses played per row")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    dts = args.dts or [_DT, 2 * _DT, 3 * _DT, 6 * _DT]
+    print(f"{'dt':>7} {'ccd':>5} {'ref ccd':>7} {'scorer':>7} {'point dt':>9} {'ball rmse':>10} {'net pen':>8} {'slime pen':>10} {'speedup':>8}")
+    # The discrete reference has its own overlaps (the net puts the ball back 0.2 into it from the left),
+    # so continuous collision gets compared against both
+    for dt in dts:
+        for ccd, reference_ccd in ((False, False), (True, False), (True, True)):
+            r = fidelity_report(dt, continuous_collision=ccd, episodes=args.episodes, seed=args.seed,
+                                reference_continuous_collision=reference_ccd)
+            print(f"{r['dt']:7.4f} {str(ccd):>5} {str(reference_ccd):>7} {r['scorer_agreement']:7.1%} {r['point_time_error']:9.3f} "
+                  f"{r['ball_rmse']:10.3f} {r['net_penetration']:8.3f} {r['slime_penetration']:10.3f} {r['speedup']:8.2f}")
@@ -0,0 +1,115 @@
+"""
+Optional numba backend for SlimeVolleyballSim, pick it with backend="numba" or SLIME_SIM_BACKEND=numba.
+The helpers and the tick loops are the same functions as the python backend, just compiled over f64 arrays.
+BUFFER_STEPS wraps every tick loop in a kernel that reads and writes the CompactVolleyballState buffer itself,
+so a step_game is one jitted call with no python copies on either side.
+"""
+from slime_api.sim.main_sim import make_tick_loop, make_ball_step, make_fast_forward_loop, _cooldowns, \
+    _slime_controller, _integrate_slime, _sphere_collision, _touch_ball, _integrate_ball, _bounce_ball, _hit_floor, \
+    make_swept_ball_step, _free_flight_ticks, _fast_forward, PX, VX, TX, TOUCHES, JUMP_CD, TOUCH_CD, CAN_JUMP, \
+    JUMP_REQ, BX, BVX
+from slime_api.slimestate import STATE_HEADER_SIZE, SLIME_SIZE, SLIME_POSITION, SLIME_VELOCITY, SLIME_TARGET, \
+    SLIME_TOUCHES_REMAINING, SLIME_CAN_JUMP, SLIME_JUMP_COOLDOWN, SLIME_TOUCH_COOLDOWN, BALL_POSITION, BALL_VELOCITY, \
+    POINT_SCORED, SCORING_SLIME
+
+# The position, velocity and target (ball position and velocity) slots line up in the scratch and the buffer
+assert (PX, VX, TX) == (SLIME_POSITION.start, SLIME_VELOCITY.start, SLIME_TARGET.start)
+assert (BX, BVX) == (BALL_POSITION.start, BALL_VELOCITY.start)
+
+
+def make_buffer_step(run_ticks):
+    """
+    step_game's load, tick loop and store in one function: the state comes in as a CompactVolleyballState buffer (f32),
+    the actions as [n_slimes, 4] f32 rows, slimes and ball are the f64 scratch the loop works on.
+    Returns ticks_done, the point and scorer go straight into the buffer, steps is left to the caller.
+    """
+    def step_buffer(buffer, actions, slimes, ball, ticks: int, max_speed: float, acceleration: float,
+                    jump_force: float, dt: float) -> int:
+        for k in range(6):
+            ball[k] = buffer[k]
+        for i in range(slimes.shape[0]):
+            s = slimes[i]
+            block = STATE_HEADER_SIZE + SLIME_SIZE * i
+            for k in range(6):
+                s[k] = buffer[block + k]
+            for k in range(3):
+                s[TX + k] = actions[i, k]
+            s[JUMP_REQ] = 1.0 if actions[i, 3] != 0 else 0.0
+            s[TOUCHES] = buffer[block + SLIME_TOUCHES_REMAINING]
+            s[JUMP_CD] = buffer[block + SLIME_JUMP_COOLDOWN]
+            s[TOUCH_CD] = buffer[block + SLIME_TOUCH_COOLDOWN]
+            s[CAN_JUMP] = buffer[block + SLIME_CAN_JUMP]
+
+        ticks_done, point_scored, scoring_slime = run_ticks(slimes, ball, ticks, max_speed, acceleration, jump_force, dt)
+
+        for k in range(6):
+            buffer[k] = ball[k]
+        for i in range(slimes.shape[0]):
+            s = slimes[i]
+            block = STATE_HEADER_SIZE + SLIME_SIZE * i
+            for k in range(9):
+                buffer[block + k] = s[k]
+            buffer[block + SLIME_TOUCHES_REMAINING] = s[TOUCHES]
+            buffer[block + SLIME_JUMP_COOLDOWN] = s[JUMP_CD]
+            buffer[block + SLIME_TOUCH_COOLDOWN] = s[TOUCH_CD]
+            buffer[block + SLIME_CAN_JUMP] = 1.0 if s[CAN_JUMP] else 0.0
+        buffer[POINT_SCORED] = 1.0 if point_scored else 0.0
+        buffer[SCORING_SLIME] = scoring_slime
+        return ticks_done
+
+    return step_buffer
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    _cooldowns_jit = njit(cache=True)(_cooldowns)
+    _slime_controller_jit = njit(cache=True)(_slime_controller)
+    _integrate_slime_jit = njit(cache=True)(_integrate_slime)
+    _sphere_collision_jit = njit(cache=True)(_sphere_collision)
+    _touch_ball_jit = njit(cache=True)(_touch_ball)
+    _hit_floor_jit = njit(cache=True)(_hit_floor)
+    _free_flight_ticks_jit = njit(cache=True)(_free_flight_ticks)
+    _fast_forward_jit = njit(cache=True)(_fast_forward)
+
+    run_ticks = njit(cache=True)(make_tick_loop(
+        _cooldowns_jit,
+        _slime_controller_jit,
+        _integrate_slime_jit,
+        _sphere_collision_jit,
+        _touch_ball_jit,
+        njit(cache=True)(make_ball_step(njit(cache=True)(_integrate_ball), njit(cache=True)(_bounce_ball))),
+        _hit_floor_jit,
+    ))
+    run_ticks_swept = njit(cache=True)(make_tick_loop(
+        _cooldowns_jit,
+        _slime_controller_jit,
+        _integrate_slime_jit,
+        _sphere_collision_jit,
+        _touch_ball_jit,
+        njit(cache=True)(make_swept_ball_step(_sphere_collision_jit)),
+        _hit_floor_jit,
+    ))
+    run_ticks_fast_forward = njit(cache=True)(make_fast_forward_loop(run_ticks, _free_flight_ticks_jit, _fast_forward_jit))
+    run_ticks_swept_fast_forward = njit(cache=True)(make_fast_forward_loop(run_ticks_swept, _free_flight_ticks_jit, _fast_forward_jit))
+
+    # (continuous_collision, fast_forward) -> tick loop, same as main_sim.TICK_LOOPS
+    TICK_LOOPS = {
+        (False, False): run_ticks,
+        (False, True): run_ticks_fast_forward,
+        (True, False): run_ticks_swept,
+        (True, True): run_ticks_swept_fast_forward,
+    }
+    # Same keys -> make_buffer_step of that loop
+    BUFFER_STEPS = {key: njit(cache=True)(make_buffer_step(loop)) for key, loop in TICK_LOOPS.items()}
+else:
+    run_ticks = None
+    run_ticks_swept = None
+    run_ticks_fast_forward = None
+    run_ticks_swept_fast_forward = None
+    TICK_LOOPS = None
+    BUFFER_STEPS = None
@@ -1,12 +1,742 @@
 from slime_api.common_values import *
-from slime_api.slimestate import VolleyballState, Slime
+from slime_api.slimestate import VolleyballState, Slime, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE
+from slime_api.sim.batched_sim import RolloutOutcome
+from slime_api.sim.profiling import PhaseProfiler, SIM_PHASES, SIM_EVENTS
 import numpy as np
-from typing import Dict, Optional
+import os
+import time
+import warnings
+from math import sqrt, ceil
+from typing import Dict, Optional, Union
 
 GRAVITY = np.array(GRAVITY, dtype=np.float32) # Setting it to f32
 
-# Don't import pygame unless we're rendering
-pygame = None
+
+# The tick loop runs on python floats, numpy scalars and tiny arrays allocate on every operation
+_DT = float(DT[0])
+_GRAVITY_Y = float(GRAVITY[1])
+_GROUNDED_HEIGHT = float(np.float32(SLIME_CENTER_ON_FLOOR + 0.1))
+_SLIME_CENTER_ON_FLOOR = float(SLIME_CENTER_ON_FLOOR)
+_SLIME_BLOCKER_HEIGHT = float(SLIME_BLOCKER_HEIGHT_FLT)
+_NET_PLANE_X = float(NET_PLANE_X)
+_NET_HALF_THICKNESS = float(NET_HALF_THICKNESS)
+_NET_HEIGHT = float(NET_HEIGHT_FLT)
+_STAGE_LENGTH = float(STAGE_RADIUS[0])
+_STAGE_WIDTH = float(STAGE_RADIUS[1])
+_NET_BAND_X = BALL_RADIUS + _NET_HALF_THICKNESS  # Touches get reset while the ball is this close to the net
+_MIN_DISTANCE = SLIME_RADIUS + BALL_RADIUS
+_REDUCED_MASS = 1.0 / (1.0 / SLIME_MASS + 1.0 / BALL_MASS)
+_SLIME_SHARE = BALL_MASS / (SLIME_MASS + BALL_MASS)  # How much of the overlap the slime is pushed back
+_BALL_SHARE = SLIME_MASS / (SLIME_MASS + BALL_MASS)
+_NET_TOP_Y = _NET_HEIGHT + BALL_RADIUS
+_BACK_WALL_X = _STAGE_LENGTH - BALL_RADIUS  # Where the ball center bounces
+_SIDE_WALL_Z = _STAGE_WIDTH - BALL_RADIUS
+
+# Continuous collision, see make_swept_ball_step
+_MAX_SWEPT_EVENTS = 4  # Bounces handled per tick, whatever is left of the tick after that is dropped
+_CONTACT_SLOP = 1e-6
+_NO_HIT, _HIT_FLOOR, _HIT_BACK_WALL, _HIT_SIDE_WALL, _HIT_NET_SIDE, _HIT_NET_TOP, _HIT_NET_CORNER, _HIT_SLIME = range(8)
+
+# Bits of what _bounce_ball returns, what the ball is touching or bounced off this tick
+NEAR_NET = 1  # Within the net band, touches get reset
+BOUNCED_NET_SIDE = 2
+BOUNCED_NET_TOP = 4
+BOUNCED_BACK_WALL = 8
+BOUNCED_SIDE_WALL = 16
+
+# "python" or "numba", used when SlimeVolleyballSim doesn't get a backend
+BACKEND_ENV_VAR = "SLIME_SIM_BACKEND"
+
+# Slots of the per slime scratch lists the kernel works on
+PX, PY, PZ, VX, VY, VZ, TX, TY, TZ, TOUCHES, JUMP_CD, TOUCH_CD, CAN_JUMP, JUMP_REQ = range(14)
+SLIME_SCRATCH_SIZE = 14
+# Slots of the ball scratch list
+BX, BY, BZ, BVX, BVY, BVZ = range(6)
+
+
+def _cooldowns(slimes, dt: float) -> None:
+    for s in slimes:
+        s[JUMP_CD] = max(0.0, s[JUMP_CD] - dt)
+        s[TOUCH_CD] = max(0.0, s[TOUCH_CD] - dt)
+
+
+def _slime_controller(s: list, max_speed: float, acceleration: float, jump_force: float, dt: float) -> None:
+    is_grounded = s[PY] <= _GROUNDED_HEIGHT
+    can_jump = is_grounded and s[JUMP_CD] <= 0.0
+    s[CAN_JUMP] = can_jump
+    vel_y = s[VY]
+
+    if s[JUMP_REQ] and can_jump:
+        vel_y = jump_force
+        s[JUMP_CD] = JUMP_COOLDOWN_SECONDS
+
+    dir_x = s[TX] - s[PX]
+    dir_z = s[TZ] - s[PZ]
+    dist = sqrt(dir_x * dir_x + dir_z * dir_z)
+    max_delta = acceleration * dt
+    if dist <= STOPPING_DISTANCE:
+        # The jump velocity is dropped here, like it always was
+        s[VX] *= 1 - max_delta
+        s[VZ] *= 1 - max_delta
+        return
+
+    vel_x = s[VX]
+    vel_z = s[VZ]
+    mag_sq = vel_x * vel_x + vel_z * vel_z
+    temp_max_speed = max_speed
+    if sqrt(mag_sq) > 1e-5:
+        threshold = 0.5 * mag_sq / acceleration + STOPPING_DISTANCE
+        if dist <= threshold:
+            temp_max_speed = sqrt(2 * acceleration * max(dist - STOPPING_DISTANCE, 0.0))
+
+    target_x = dir_x / dist * temp_max_speed
+    target_z = dir_z / dist * temp_max_speed
+
+    # Move towards the target velocity
+    delta_x = target_x - vel_x
+    delta_z = target_z - vel_z
+    delta_dist = sqrt(delta_x * delta_x + delta_z * delta_z)
+    if delta_dist <= max_delta or delta_dist == 0:
+        s[VX] = target_x
+        s[VZ] = target_z
+    else:
+        s[VX] = vel_x + delta_x / delta_dist * max_delta
+        s[VZ] = vel_z + delta_z / delta_dist * max_delta
+    s[VY] = vel_y
+
+
+def _integrate_slime(s: list, dt: float) -> None:
+    # Gravity & move
+    s[VY] += _GRAVITY_Y * dt
+    new_x = s[PX] + s[VX] * dt
+    new_y = s[PY] + s[VY] * dt
+    new_z = s[PZ] + s[VZ] * dt
+    # We don't want to fade through the floor, and good idea for a gamemode
+    if new_y < _SLIME_CENTER_ON_FLOOR and s[VY] < 0:
+        new_y = _SLIME_CENTER_ON_FLOOR
+        s[VY] = 0.0
+
+    # Slime can't cross
+    if new_y < _SLIME_BLOCKER_HEIGHT:
+        if s[PX] < 0 and new_x + SLIME_RADIUS > -_NET_PLANE_X:
+            new_x = 0 - _NET_HALF_THICKNESS - SLIME_RADIUS
+            s[VX] = 0.0
+        if s[PX] > 0 and new_x - SLIME_RADIUS < _NET_PLANE_X:
+            new_x = _NET_PLANE_X + SLIME_RADIUS
+            s[VX] = 0.0
+    s[PX] = new_x
+    s[PY] = new_y
+    s[PZ] = new_z
+
+
+def _sphere_collision(s: list, ball: list, min_distance: float) -> bool:
+    """
+    Resolves collision between the slime and the ball (modifies both in-place), returns True if they touched.
+    """
+    # Vector from slime to ball
+    delta_x = ball[BX] - s[PX]
+    delta_y = ball[BY] - s[PY]
+    delta_z = ball[BZ] - s[PZ]
+    distance = sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z)
+    if distance > min_distance:
+        return False
+
+    # Normalized collision normal
+    normal_x = delta_x / distance
+    normal_y = delta_y / distance
+    normal_z = delta_z / distance
+
+    # Velocity along collision normal
+    velocity_along_normal = ((ball[BVX] - s[VX]) * normal_x
+                             + (ball[BVY] - s[VY]) * normal_y
+                             + (ball[BVZ] - s[VZ]) * normal_z)
+
+    # Do not resolve if they are moving apart
+    if velocity_along_normal > 0:
+        return False
+
+    # Apply impulse
+    impulse = -(1 + BALL_RESTITUTION) * velocity_along_normal * _REDUCED_MASS
+    s[VX] -= impulse * normal_x / SLIME_MASS
+    s[VY] -= impulse * normal_y / SLIME_MASS
+    s[VZ] -= impulse * normal_z / SLIME_MASS
+    ball[BVX] += impulse * normal_x / BALL_MASS
+    ball[BVY] += impulse * normal_y / BALL_MASS
+    ball[BVZ] += impulse * normal_z / BALL_MASS
+
+    # Position correction to prevent overlap
+    overlap = min_distance - distance
+    if overlap > 0:
+        s[PX] -= _SLIME_SHARE * overlap * normal_x
+        s[PY] -= _SLIME_SHARE * overlap * normal_y
+        s[PZ] -= _SLIME_SHARE * overlap * normal_z
+        ball[BX] += _BALL_SHARE * overlap * normal_x
+        ball[BY] += _BALL_SHARE * overlap * normal_y
+        ball[BZ] += _BALL_SHARE * overlap * normal_z
+
+    return True
+
+
+def _touch_ball(s: list) -> bool:
+    """A contact counts as a touch once the touch cooldown is over, returns True if the slime had none left (point lost)"""
+    if s[TOUCH_CD] > 0:
+        return False
+    s[TOUCH_CD] = SLIME_TOUCH_COOLDOWN
+    if s[TOUCHES] > 0:
+        s[TOUCHES] -= 1
+        return False
+    return True
+
+
+def _integrate_ball(ball: list, dt: float) -> None:
+    ball[BVY] += _GRAVITY_Y * dt
+    ball[BX] += ball[BVX] * dt
+    ball[BY] += ball[BVY] * dt
+    ball[BZ] += ball[BVZ] * dt
+
+
+def _bounce_ball(ball: list, prev_x: float) -> int:
+    """
+    Bounces the ball (that just moved from prev_x) off the net and walls, returns what it hit as NEAR_NET | BOUNCED_*
+    bits (0 if it's nowhere near any of them)
+    """
+    bx = ball[BX]
+    bz = ball[BZ]
+    hit = 0
+    # Distance from net
+    bndx = abs(bx) - (BALL_RADIUS + _NET_HALF_THICKNESS)
+    bndy = ball[BY] - _NET_HEIGHT - BALL_RADIUS
+
+    if bndx < 0 and bndy < 0:
+        # We assume whichever wall it's closer to is the one it's bouncing off
+        # NB: This does not account for hitting the courner
+        if bndx >= bndy:
+            # reflect X velocity
+            ball[BVX] *= -BALL_RESTITUTION
+            # reposition in walls
+            if prev_x < 0:
+                ball[BX] = _NET_HALF_THICKNESS - BALL_RADIUS
+            else:
+                ball[BX] = _NET_HALF_THICKNESS + BALL_RADIUS
+            hit = BOUNCED_NET_SIDE
+        else:
+            # reflect Y velocity
+            ball[BVY] *= -BALL_RESTITUTION
+            # reposition in walls
+            ball[BY] = _NET_HEIGHT + BALL_RADIUS
+            hit = BOUNCED_NET_TOP
+    elif abs(bx) > _STAGE_LENGTH - BALL_RADIUS:
+        # Back wall collision
+        ball[BVX] *= -BALL_RESTITUTION
+        ball[BX] = _STAGE_LENGTH - BALL_RADIUS if bx > 0 else BALL_RADIUS - _STAGE_LENGTH
+        hit = BOUNCED_BACK_WALL
+    if abs(bz) > _STAGE_WIDTH - BALL_RADIUS:
+        # Side wall collision
+        ball[BVZ] *= -BALL_RESTITUTION
+        ball[BZ] = _STAGE_WIDTH - BALL_RADIUS if bz > 0 else BALL_RADIUS - _STAGE_WIDTH
+        hit |= BOUNCED_SIDE_WALL
+
+    if bndx <= 0:
+        hit |= NEAR_NET
+    return hit
+
+
+def _hit_floor(ball: list) -> bool:
+    """Puts the ball on the floor if it went through it, returns True if it did (point scored)"""
+    if ball[BY] <= 0:
+        ball[BY] = 0.0
+        return True
+    return False
+
+
+def make_swept_ball_step(sphere_collision):
+    """
+    Same as _integrate_ball + _bounce_ball, but sweeps the ball along its path for the tick and stops it at the time
+    of impact with whatever it hits first: the floor, a wall, the net (sides, top and the rounded corners) or a slime.
+    Every bounce, the slimes included, goes on with the rest of the tick, so nothing gets tunneled through at a big DT.
+    Only the ball is swept: slimes still move a whole tick at once and can end up inside the ball, and a coarse DT
+    plays no closer to the default sim than it does with discrete collision (see fidelity.py).
+    The step returns (what it hit as NEAR_NET | BOUNCED_* bits like _bounce_ball, the corners count as the net top,
+    a bit per slime it hit). Counting the touches is up to the tick loop.
+    """
+    def step_ball_swept(slimes, ball, dt: float):
+        bounced = 0
+        ball[BVY] += _GRAVITY_Y * dt
+        remaining = 1.0  # Of the tick
+        met = 0  # A bit per slime the ball already got to this tick, each one gets one contact per tick
+        touched = 0  # And the ones where that contact bounced it
+
+        for _ in range(_MAX_SWEPT_EVENTS):
+            # A slime can push the ball into the net or a wall (before the sweep or at a contact during it), put it
+            # back out the shortest way before sweeping on
+            x = ball[BX]
+            y = ball[BY]
+            if abs(x) < _NET_BAND_X and y < _NET_TOP_Y:
+                if abs(x) > _NET_HALF_THICKNESS and y > _NET_HEIGHT:
+                    # Rounded corner, only inside if it's within the ball radius of the edge
+                    rel_x = x - (_NET_HALF_THICKNESS if x > 0 else -_NET_HALF_THICKNESS)
+                    rel_y = y - _NET_HEIGHT
+                    distance = sqrt(rel_x * rel_x + rel_y * rel_y)
+                    if 0 < distance < BALL_RADIUS:
+                        normal_x = rel_x / distance
+                        normal_y = rel_y / distance
+                        ball[BX] += normal_x * (BALL_RADIUS - distance)
+                        ball[BY] += normal_y * (BALL_RADIUS - distance)
+                        velocity_along_normal = ball[BVX] * normal_x + ball[BVY] * normal_y
+                        if velocity_along_normal < 0:
+                            ball[BVX] -= (1 + BALL_RESTITUTION) * velocity_along_normal * normal_x
+                            ball[BVY] -= (1 + BALL_RESTITUTION) * velocity_along_normal * normal_y
+                        bounced |= BOUNCED_NET_TOP
+                elif _NET_BAND_X - abs(x) <= _NET_TOP_Y - y:
+                    ball[BX] = _NET_BAND_X if x >= 0 else -_NET_BAND_X
+                    if ball[BVX] * ball[BX] < 0:
+                        ball[BVX] *= -BALL_RESTITUTION
+                    bounced |= BOUNCED_NET_SIDE
+                else:
+                    ball[BY] = _NET_TOP_Y
+                    if ball[BVY] < 0:
+                        ball[BVY] *= -BALL_RESTITUTION
+                    bounced |= BOUNCED_NET_TOP
+            if abs(ball[BX]) > _BACK_WALL_X:
+                ball[BX] = _BACK_WALL_X if ball[BX] > 0 else -_BACK_WALL_X
+                if ball[BVX] * ball[BX] > 0:
+                    ball[BVX] *= -BALL_RESTITUTION
+                bounced |= BOUNCED_BACK_WALL
+            if abs(ball[BZ]) > _SIDE_WALL_Z:
+                ball[BZ] = _SIDE_WALL_Z if ball[BZ] > 0 else -_SIDE_WALL_Z
+                if ball[BVZ] * ball[BZ] > 0:
+                    ball[BVZ] *= -BALL_RESTITUTION
+                bounced |= BOUNCED_SIDE_WALL
+
+            x = ball[BX]
+            y = ball[BY]
+            z = ball[BZ]
+            dx = ball[BVX] * dt * remaining
+            dy = ball[BVY] * dt * remaining
+            dz = ball[BVZ] * dt * remaining
+            hit_time = 1.0  # Fraction of the path left
+            hit = _NO_HIT
+            hit_slime = 0
+            normal_x = 0.0
+            normal_y = 0.0
+
+            # Floor
+            if dy < 0 and y + dy <= 0:
+                hit_time = max(-y / dy, 0.0)
+                hit = _HIT_FLOOR
+            # Walls
+            if abs(x + dx) > _BACK_WALL_X and x * dx > 0:
+                t = max((_BACK_WALL_X - abs(x)) / abs(dx), 0.0)
+                if t < hit_time:
+                    hit_time = t
+                    hit = _HIT_BACK_WALL
+            if abs(z + dz) > _SIDE_WALL_Z and z * dz > 0:
+                t = max((_SIDE_WALL_Z - abs(z)) / abs(dz), 0.0)
+                if t < hit_time:
+                    hit_time = t
+                    hit = _HIT_SIDE_WALL
+
+            # Net sides, the net goes all the way across in z so it's a 2D cast in x/y. The slop is for a ball a slime
+            # contact just nudged onto the surface
+            if abs(x) >= _NET_BAND_X - _CONTACT_SLOP and x * dx < 0 and abs(dx) > abs(x) - _NET_BAND_X:
+                t = max((abs(x) - _NET_BAND_X) / abs(dx), 0.0)
+                if t < hit_time and y + dy * t <= _NET_HEIGHT:
+                    hit_time = t
+                    hit = _HIT_NET_SIDE
+            # Net top
+            if y >= _NET_TOP_Y - _CONTACT_SLOP and dy < 0 and y + dy < _NET_TOP_Y:
+                t = max((y - _NET_TOP_Y) / -dy, 0.0)
+                if t < hit_time and abs(x + dx * t) <= _NET_HALF_THICKNESS:
+                    hit_time = t
+                    hit = _HIT_NET_TOP
+            # Net corners, a circle of the ball radius around each top edge
+            path_sq = dx * dx + dy * dy
+            if path_sq > 0:
+                for corner_x in (-_NET_HALF_THICKNESS, _NET_HALF_THICKNESS):
+                    rel_x = x - corner_x
+                    rel_y = y - _NET_HEIGHT
+                    b = rel_x * dx + rel_y * dy
+                    c = rel_x * rel_x + rel_y * rel_y - BALL_RADIUS * BALL_RADIUS
+                    disc = b * b - path_sq * c
+                    # Moving in and already touching counts as a hit right away
+                    if b < 0 and (c <= 0 or disc >= 0):
+                        t = 0.0 if c <= 0 else (-b - sqrt(disc)) / path_sq
+                        contact_x = rel_x + dx * t
+                        contact_y = rel_y + dy * t
+                        contact = sqrt(contact_x * contact_x + contact_y * contact_y)
+                        # Only the outer quarter of the circle, the rest is covered by the sides and the top
+                        if t < hit_time and contact_x * corner_x >= 0 and contact_y >= 0 and contact > 0:
+                            hit_time = t
+                            hit = _HIT_NET_CORNER
+                            normal_x = contact_x / contact
+                            normal_y = contact_y / contact
+
+            # Slimes, they don't move during the ball's part of the tick
+            path_sq = path_sq + dz * dz
+            if path_sq > 0:
+                for i in range(len(slimes)):
+                    if met >> i & 1:
+                        continue
+                    s = slimes[i]
+                    rel_x = x - s[PX]
+                    rel_y = y - s[PY]
+                    rel_z = z - s[PZ]
+                    b = rel_x * dx + rel_y * dy + rel_z * dz
+                    c = rel_x * rel_x + rel_y * rel_y + rel_z * rel_z - _MIN_DISTANCE * _MIN_DISTANCE
+                    disc = b * b - path_sq * c
+                    if b < 0 and (c <= 0 or disc >= 0):
+                        t = 0.0 if c <= 0 else (-b - sqrt(disc)) / path_sq
+                        if t < hit_time:
+                            hit_time = t
+                            hit = _HIT_SLIME
+                            hit_slime = i
+
+            # Move up to the impact
+            new_x = x + dx * hit_time
+            ball[BX] = new_x
+            ball[BY] = y + dy * hit_time
+            ball[BZ] = z + dz * hit_time
+            if min(abs(x), abs(new_x)) <= _NET_BAND_X or x * new_x < 0:
+                bounced |= NEAR_NET
+            remaining *= 1 - hit_time
+
+            if hit == _NO_HIT:
+                break
+            if hit == _HIT_FLOOR:
+                ball[BY] = 0.0
+                break
+            if hit == _HIT_SLIME:
+                # The ball stopped right on it, the slop makes sure it still counts as touching. If they're already
+                # moving apart the ball goes on through and the slime's own collision next tick sorts it out
+                if sphere_collision(slimes[hit_slime], ball, _MIN_DISTANCE + _CONTACT_SLOP):
+                    touched |= 1 << hit_slime
+                met |= 1 << hit_slime
+                continue
+            if hit == _HIT_BACK_WALL:
+                ball[BVX] *= -BALL_RESTITUTION
+                ball[BX] = _BACK_WALL_X if new_x > 0 else -_BACK_WALL_X
+                bounced |= BOUNCED_BACK_WALL
+            elif hit == _HIT_SIDE_WALL:
+                ball[BVZ] *= -BALL_RESTITUTION
+                ball[BZ] = _SIDE_WALL_Z if ball[BZ] > 0 else -_SIDE_WALL_Z
+                bounced |= BOUNCED_SIDE_WALL
+            elif hit == _HIT_NET_SIDE:
+                ball[BVX] *= -BALL_RESTITUTION
+                ball[BX] = _NET_BAND_X if x > 0 else -_NET_BAND_X
+                bounced |= BOUNCED_NET_SIDE
+            elif hit == _HIT_NET_TOP:
+                ball[BVY] *= -BALL_RESTITUTION
+                ball[BY] = _NET_TOP_Y
+                bounced |= BOUNCED_NET_TOP
+            else:
+                # Corner, reflect along the normal
+                velocity_along_normal = ball[BVX] * normal_x + ball[BVY] * normal_y
+                if velocity_along_normal < 0:
+                    ball[BVX] -= (1 + BALL_RESTITUTION) * velocity_along_normal * normal_x
+                    ball[BVY] -= (1 + BALL_RESTITUTION) * velocity_along_normal * normal_y
+                bounced |= BOUNCED_NET_TOP
+
+        return bounced, touched
+
+    return step_ball_swept
+
+
+_step_ball_swept = make_swept_ball_step(_sphere_collision)
+
+
+def make_ball_step(integrate_ball, bounce_ball):
+    """The discrete ball part of a tick, move then bounce, returns (what it hit, no slimes) like the swept one"""
+    def step_ball(slimes, ball, dt: float):
+        prev_x = ball[BX]
+        integrate_ball(ball, dt)
+        return bounce_ball(ball, prev_x), 0
+
+    return step_ball
+
+
+def make_tick_loop(cooldowns, slime_controller, integrate_slime, sphere_collision, touch_ball, step_ball, hit_floor):
+    """
+    Builds the tick loop out of the helpers above. It works on python lists or on numpy arrays,
+    so the numba backend can compile the same loop with jitted helpers, and the profiler can time wrapped ones.
+    step_ball is make_ball_step(...) for discrete collision or make_swept_ball_step(...) for continuous collision.
+    """
+    def run_ticks(slimes, ball, ticks: int, max_speed: float, acceleration: float, jump_force: float, dt: float):
+        point_scored = False
+        scoring_slime = -1  # -1 means None
+        ticks_done = 0
+
+        for _ in range(ticks):
+            if point_scored:
+                break
+            # Reset stuff
+            scoring_slime = -1
+
+            # SLIMES
+            cooldowns(slimes, dt)
+            for s in slimes:
+                slime_controller(s, max_speed, acceleration, jump_force, dt)
+                integrate_slime(s, dt)
+
+                # Ball collision
+                if sphere_collision(s, ball, _MIN_DISTANCE) and touch_ball(s):
+                    point_scored = True
+                    scoring_slime = 1 if ball[BX] < 0 else 0
+
+            # BALL
+            hit, touched = step_ball(slimes, ball, dt)
+            if touched:
+                # Only the sweep bounces the ball off slimes
+                for i in range(len(slimes)):
+                    if touched >> i & 1 and touch_ball(slimes[i]):
+                        point_scored = True
+                        scoring_slime = 1 if ball[BX] < 0 else 0
+            if hit & NEAR_NET:
+                for s in slimes:
+                    s[TOUCHES] = 3
+
+            # Floor collision -> point scored, so we can reset
+            if hit_floor(ball):
+                point_scored = True
+                scoring_slime = 1 if ball[BX] < 0 else 0
+
+            ticks_done += 1
+
+        return ticks_done, point_scored, scoring_slime
+
+    return run_ticks
+
+
+run_ticks = make_tick_loop(_cooldowns, _slime_controller, _integrate_slime, _sphere_collision, _touch_ball,
+                           make_ball_step(_integrate_ball, _bounce_ball), _hit_floor)
+run_ticks_swept = make_tick_loop(_cooldowns, _slime_controller, _integrate_slime, _sphere_collision, _touch_ball,
+                                 _step_ball_swept, _hit_floor)
+
+
+def _free_flight_ticks(slimes, ball, acceleration: float, dt: float) -> float:
+    """
+    First tick from now where anything but free flight could happen: the ball reaching the floor, a wall,
+    the net band or a slime, or a slime that isn't settled at its target. 0 if we can't tell.
+    """
+    bx = ball[BX]
+    if abs(bx) <= _NET_BAND_X:
+        return 0
+
+    # The ball on its own
+    by = ball[BY]
+    bvy = ball[BVY]
+    a = 0.5 * _GRAVITY_Y * dt * dt
+    b = bvy * dt + a
+    disc = b * b - 4 * a * by
+    if by <= 0 or disc < 0:
+        return 0
+    first = float(ceil((-b - sqrt(disc)) / (2 * a)))  # Floor
+    # Walls, the sim bounces on the first tick past them
+    if bx * ball[BVX] > 0:
+        first = min(first, float(int((_STAGE_LENGTH - BALL_RADIUS - abs(bx)) / (abs(ball[BVX]) * dt)) + 1))
+    bvz = ball[BVZ]
+    if bvz != 0:
+        to_wall = _STAGE_WIDTH - BALL_RADIUS - (ball[BZ] if bvz > 0 else -ball[BZ])
+        first = min(first, float(int(to_wall / (abs(bvz) * dt)) + 1))
+    # The net band, where touches get reset
+    if bx * ball[BVX] < 0:
+        first = min(first, float(ceil((abs(bx) - _NET_BAND_X) / (abs(ball[BVX]) * dt))))
+
+    # Slimes have to sit on the floor braking at their target, they only drift by a geometric series
+    # (anything closer to the floor than one tick of gravity gets snapped onto it)
+    on_floor = _SLIME_CENTER_ON_FLOOR - _GRAVITY_Y * dt * dt
+    decay = abs(1 - acceleration * dt)
+    if decay >= 1:
+        return 0  # Braking doesn't settle at this DT
+    ball_speed = sqrt(ball[BVX] * ball[BVX] + bvy * bvy + bvz * bvz)
+    for s in slimes:
+        if s[JUMP_REQ] or s[PY] >= on_floor or s[VY] != 0.0:
+            return 0
+        drift = dt * sqrt(s[VX] * s[VX] + s[VZ] * s[VZ]) * decay / (1 - decay)
+        dir_x = s[TX] - s[PX]
+        dir_z = s[TZ] - s[PZ]
+        if sqrt(dir_x * dir_x + dir_z * dir_z) + drift > STOPPING_DISTANCE:
+            return 0
+        # Away from the net blocker
+        if s[PX] < 0 and s[PX] + drift + SLIME_RADIUS > -_NET_PLANE_X:
+            return 0
+        if s[PX] > 0 and s[PX] - drift - SLIME_RADIUS < _NET_PLANE_X:
+            return 0
+
+        # The ball can't move further than speed * t + g * t^2 / 2 in any direction
+        delta_x = bx - s[PX]
+        delta_y = by - s[PY]
+        delta_z = ball[BZ] - s[PZ]
+        gap = sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z) - _MIN_DISTANCE - drift
+        if gap <= 0:
+            return 0
+        reach_a = -a
+        reach_b = ball_speed * dt + reach_a
+        first = min(first, float(ceil((-reach_b + sqrt(reach_b * reach_b + 4 * reach_a * gap)) / (2 * reach_a))))
+
+    return first
+
+
+def _fast_forward(slimes, ball, ticks: int, acceleration: float, dt: float) -> None:
+    """Advances ticks of free flight in closed form, only valid for fewer ticks than _free_flight_ticks"""
+    n = ticks
+    ball[BX] += ball[BVX] * dt * n
+    ball[BY] += n * ball[BVY] * dt + _GRAVITY_Y * dt * dt * n * (n + 1) / 2
+    ball[BZ] += ball[BVZ] * dt * n
+    ball[BVY] += _GRAVITY_Y * dt * n
+
+    # Braking multiplies the velocity by f every tick, so the slime moves v * dt * (f + f^2 + ... + f^n)
+    f = 1 - acceleration * dt
+    decay = f ** n
+    travelled = dt * f * (1 - decay) / (1 - f)
+    for s in slimes:
+        s[PY] = _SLIME_CENTER_ON_FLOOR
+        s[PX] += s[VX] * travelled
+        s[PZ] += s[VZ] * travelled
+        s[VX] *= decay
+        s[VZ] *= decay
+        s[JUMP_CD] = max(0.0, s[JUMP_CD] - dt * n)
+        s[TOUCH_CD] = max(0.0, s[TOUCH_CD] - dt * n)
+        s[CAN_JUMP] = s[JUMP_CD] <= 0.0
+
+
+def make_fast_forward_loop(run_ticks, free_flight_ticks, fast_forward):
+    """Same as run_ticks, but skips over stretches of free flight in closed form"""
+    def run_ticks_fast_forward(slimes, ball, ticks: int, max_speed: float, acceleration: float, jump_force: float, dt: float):
+        point_scored = False
+        scoring_slime = -1
+        ticks_done = 0
+        while ticks_done < ticks and not point_scored:
+            skip = min(free_flight_ticks(slimes, ball, acceleration, dt) - 1, ticks - ticks_done)
+            if skip >= 1:
+                fast_forward(slimes, ball, int(skip), acceleration, dt)
+                ticks_done += int(skip)
+                scoring_slime = -1
+            else:
+                done, point_scored, scoring_slime = run_ticks(slimes, ball, 1, max_speed, acceleration, jump_force, dt)
+                ticks_done += done
+        return ticks_done, point_scored, scoring_slime
+
+    return run_ticks_fast_forward
+
+
+run_ticks_fast_forward = make_fast_forward_loop(run_ticks, _free_flight_ticks, _fast_forward)
+run_ticks_swept_fast_forward = make_fast_forward_loop(run_ticks_swept, _free_flight_ticks, _fast_forward)
+
+# (continuous_collision, fast_forward) -> tick loop
+TICK_LOOPS = {
+    (False, False): run_ticks,
+    (False, True): run_ticks_fast_forward,
+    (True, False): run_ticks_swept,
+    (True, True): run_ticks_swept_fast_forward,
+}
+
+
+def make_profiled_tick_loop(profiler: PhaseProfiler, continuous_collision: bool = False):
+    """
+    make_tick_loop with every helper wrapped to time its phase and count events into profiler. Always plain python,
+    the clock calls (~50ns each) end up in the phase times. With continuous_collision the whole sweep (net, walls and
+    the slimes the ball runs into included) is ball_integration.
+    """
+    clock = time.perf_counter_ns
+    times = [0] * len(SIM_PHASES)
+    calls = [0] * len(SIM_PHASES)
+    events = [0] * len(SIM_EVENTS)
+    cooldowns_phase, controller_phase, integration_phase, collision_phase, ball_phase, net_walls_phase, floor_phase = \
+        range(len(SIM_PHASES))
+    contacts, touches, net_side_hits, net_top_hits, back_wall_bounces, side_wall_bounces, net_band_ticks, points = \
+        range(len(SIM_EVENTS))
+
+    def count_hits(hit: int) -> None:
+        if hit:
+            events[net_band_ticks] += (hit & NEAR_NET) > 0
+            events[net_side_hits] += (hit & BOUNCED_NET_SIDE) > 0
+            events[net_top_hits] += (hit & BOUNCED_NET_TOP) > 0
+            events[back_wall_bounces] += (hit & BOUNCED_BACK_WALL) > 0
+            events[side_wall_bounces] += (hit & BOUNCED_SIDE_WALL) > 0
+
+    def cooldowns(slimes, dt):
+        start = clock()
+        _cooldowns(slimes, dt)
+        times[cooldowns_phase] += clock() - start
+        calls[cooldowns_phase] += 1
+
+    def slime_controller(s, max_speed, acceleration, jump_force, dt):
+        start = clock()
+        _slime_controller(s, max_speed, acceleration, jump_force, dt)
+        times[controller_phase] += clock() - start
+        calls[controller_phase] += 1
+
+    def integrate_slime(s, dt):
+        start = clock()
+        _integrate_slime(s, dt)
+        times[integration_phase] += clock() - start
+        calls[integration_phase] += 1
+
+    def sphere_collision(s, ball, min_distance):
+        start = clock()
+        touched = _sphere_collision(s, ball, min_distance)
+        times[collision_phase] += clock() - start
+        calls[collision_phase] += 1
+        events[contacts] += touched
+        return touched
+
+    def touch_ball(s):
+        # Part of the collision phase
+        start = clock()
+        events[touches] += s[TOUCH_CD] <= 0
+        lost = _touch_ball(s)
+        times[collision_phase] += clock() - start
+        return lost
+
+    def integrate_ball(ball, dt):
+        start = clock()
+        _integrate_ball(ball, dt)
+        times[ball_phase] += clock() - start
+        calls[ball_phase] += 1
+
+    def bounce_ball(ball, prev_x):
+        start = clock()
+        hit = _bounce_ball(ball, prev_x)
+        times[net_walls_phase] += clock() - start
+        calls[net_walls_phase] += 1
+        count_hits(hit)
+        return hit
+
+    def step_ball_swept(slimes, ball, dt):
+        start = clock()
+        hit, touched = _step_ball_swept(slimes, ball, dt)
+        times[ball_phase] += clock() - start
+        calls[ball_phase] += 1
+        count_hits(hit)
+        events[contacts] += bin(touched).count("1")
+        return hit, touched
+
+    def hit_floor(ball):
+        start = clock()
+        scored = _hit_floor(ball)
+        times[floor_phase] += clock() - start
+        calls[floor_phase] += 1
+        return scored
+
+    step_ball = step_ball_swept if continuous_collision else make_ball_step(integrate_ball, bounce_ball)
+    run_ticks_instrumented = make_tick_loop(cooldowns, slime_controller, integrate_slime, sphere_collision, touch_ball,
+                                            step_ball, hit_floor)
+
+    def run_ticks_profiled(slimes, ball, ticks: int, max_speed: float, acceleration: float, jump_force: float, dt: float):
+        result = run_ticks_instrumented(slimes, ball, ticks, max_speed, acceleration, jump_force, dt)
+        events[points] += result[1]
+        for i, phase in enumerate(SIM_PHASES):
+            if calls[i]:
+                profiler.add(phase, times[i], calls[i])
+                times[i] = 0
+                calls[i] = 0
+        for i, event in enumerate(SIM_EVENTS):
+            if events[i]:
+                profiler.count(event, events[i])
+                events[i] = 0
+        return result
+
+    return run_ticks_profiled
 
 
 class SlimeVolleyballSim:
@@ -16,17 +746,26 @@ class SlimeVolleyballSim:
         max_speed: float = 6.0,
         acceleration: float = 2.0,
         jump_force: float = 2.0,
-        render_mode: Optional[str] = None
+        render_mode: Optional[str] = None,
+        backend: Optional[str] = None,
+        fast_forward: bool = False,
+        snapshot_capacity: int = 64,
+        dt: Optional[float] = None,
+        continuous_collision: bool = False,
+        profiler: Optional[PhaseProfiler] = None
     ):
         # Make sure all of this stuff is f32, if not we crash sometimes
         for slime in initial_state.slimes.values():
             slime.position = slime.position.astype(np.float32)
             slime.velocity = slime.velocity.astype(np.float32)
+            slime.target = slime.target.astype(np.float32)
             slime.touches_remaining = float(slime.touches_remaining)
             slime.jump_cooldown = float(slime.jump_cooldown)
             slime.touch_cooldown = float(slime.touch_cooldown)
         initial_state.ball_position = initial_state.ball_position.astype(np.float32)
         initial_state.ball_velocity = initial_state.ball_velocity.astype(np.float32)
+        assert initial_state.ball_position.shape == (3,) and initial_state.ball_velocity.shape == (3,)
+        assert all(slime.position.shape == slime.velocity.shape == slime.target.shape == (3,) for slime in initial_state.slimes.values())
 
         self.state = initial_state
 
@@ -36,401 +775,307 @@ class SlimeVolleyballSim:
         self.max_speed = MAX_SPEED_RANGE[int(max_speed)]
         self.acceleration = ACCELERATION_RANGE[int(acceleration)]
         self.jump_force = JUMP_FORCE_RANGE[int(jump_force)]
+        self._max_speed = float(self.max_speed)
+        self._acceleration = float(self.acceleration)
+        self._jump_force = float(self.jump_force)
+
+        if backend is None:
+            backend = os.environ.get(BACKEND_ENV_VAR, "python")
+        if backend == "numba":
+            from slime_api.sim import jit_kernel
+            if not jit_kernel.NUMBA_AVAILABLE:
+                warnings.warn("numba is not installed, SlimeVolleyballSim is falling back to the python backend")
+                backend = "python"
+        elif backend != "python":
+            raise ValueError(f"Unknown sim backend: {backend}")
+        self.backend = backend
+
+        # Seconds per tick, a bigger one plays a different game whatever the collision, check it with fidelity.py
+        self.dt = _DT if dt is None else float(dt)
+        self.continuous_collision = continuous_collision  # Sweep the ball so it can't tunnel, see make_swept_ball_step
+        self.fast_forward = fast_forward  # Skip free flight in closed form, see _free_flight_ticks
+        tick_loops = jit_kernel.TICK_LOOPS if backend == "numba" else TICK_LOOPS
+        self._run_ticks = tick_loops[bool(continuous_collision), bool(fast_forward)]
+
+        # Opt-in timing per phase, see profiling.py. Without a profiler none of this is on the step_game path
+        self.profiler = profiler
+        if profiler is not None:
+            if backend == "numba":
+                warnings.warn("Profiling runs the plain python tick loop, the times are not the ones of this backend")
+            self._run_ticks = make_profiled_tick_loop(profiler, continuous_collision)
+            if fast_forward:
+                # Skipped stretches aren't in any phase, only in step_game
+                self._run_ticks = make_fast_forward_loop(self._run_ticks, _free_flight_ticks, _fast_forward)
+            self.step_game = self._step_game_profiled
+        elif backend == "numba":
+            # One jitted call per step_game that reads and writes the state's f32 buffer, see jit_kernel.make_buffer_step.
+            # That needs the state to be a CompactVolleyballState, which is a drop-in for VolleyballState
+            if not isinstance(self.state, CompactVolleyballState):
+                self.state = CompactVolleyballState.from_state(self.state)
+            self._step_buffer = jit_kernel.BUFFER_STEPS[bool(continuous_collision), bool(fast_forward)]
+            self._actions = np.zeros((len(initial_state.slimes), 4), dtype=np.float32)
+            self.step_game = self._step_game_buffer
+
+        # Preallocated so step_game doesn't allocate anything per tick
+        if backend == "numba":
+            self._slime_scratch = np.zeros((len(initial_state.slimes), SLIME_SCRATCH_SIZE), dtype=np.float64)
+            self._ball_scratch = np.zeros(6, dtype=np.float64)
+        else:
+            self._slime_scratch = [[0.0] * SLIME_SCRATCH_SIZE for _ in initial_state.slimes]
+            self._ball_scratch = [0.0] * 6
+
+        # Ring of flat f32 rows (CompactVolleyballState layout), allocated on the first snapshot
+        self.snapshot_capacity = snapshot_capacity
+        self._snapshots: Optional[np.ndarray] = None
+        self._snapshot_count = 0
+        self.rollout_states: Optional[np.ndarray] = None  # [M, row] final state of each rollout branch
+        self._rollout_start: Optional[np.ndarray] = None
 
         self.render_mode = render_mode
-        self.window = None
-        self.clock = None
-        self.font = None
+        self.view = None  # PygameView, made on the first render so pygame only gets imported when we draw
 
-        if render_mode is not None:
-            global pygame
-            import pygame
+        if render_mode == "numpy":
+            # rgb_array frames without pygame, see slime_api/slimeraster.py
+            from slime_api.slimeraster import NumpyRasterizer
+            self.rasterizer = NumpyRasterizer()
 
     def get_state(self) -> VolleyballState:
         return self.state # Self explanatory
 
     def set_state(self, goal_state: VolleyballState):
-        self.__init__(goal_state, float(self.max_speed_points), float(self.acceleration_points), float(self.jump_force_points))
-        # Yeah, we can use init here, and we don't work as hard lol
-
-    def step_game(self, actions: Dict[int, np.ndarray], ticks: int = 1) -> VolleyballState:
-        def move_towards(current, target, max_delta):
-            delta = target - current
-            dist = np.linalg.norm(delta)
-            if dist <= max_delta or dist == 0:
-                return target
-            return current + delta / dist * max_delta
-
-        def slime_controller(sid: int, slime: Slime):
-            act = actions.get(sid, slime.target)
-            target = act[:3].astype(np.float32)
-            slime.target = target
-            jump_req = bool(act[3])
-            is_grounded = slime.position[1] <= np.float32(SLIME_CENTER_ON_FLOOR + 0.1)
-            slime.can_jump = is_grounded and slime.jump_cooldown <= 0.0
-            vel = slime.velocity.copy()
-            pos = slime.position
-
-            if jump_req and slime.can_jump:
-                vel[1] = self.jump_force
-                slime.jump_cooldown = np.float32(JUMP_COOLDOWN_SECONDS)
-
-            dir_vec = target - pos
-            dir_vec[1] = 0.0
-            dist = np.linalg.norm(dir_vec)
-            if dist <= np.float32(STOPPING_DISTANCE):
-                lerp_factor = self.acceleration * DT
-                slime.velocity[0] *= (1 - lerp_factor)
-                slime.velocity[2] *= (1 - lerp_factor)
-                return
-
-            vel_xz = vel[[0,2]]
-            mag_sq = np.dot(vel_xz, vel_xz)
-            mag = np.sqrt(mag_sq)
-            temp_max_speed = self.max_speed
-            if mag > 1e-5:
-                threshold = 0.5 * mag_sq / self.acceleration + STOPPING_DISTANCE
-                if dist <= threshold:
-                    temp_max_speed = np.sqrt(2 * self.acceleration * max(dist - STOPPING_DISTANCE, 0))
-
-            target_vel = dir_vec[[0,2]] / dist * temp_max_speed
-            new_vel_xz = move_towards(vel_xz, target_vel, self.acceleration * DT)
-            slime.velocity[0] = new_vel_xz[0]
-            slime.velocity[2] = new_vel_xz[1]
-            slime.velocity[1] = vel[1]
-
-        def sphere_collision_mut(
-            pos1: np.ndarray,
-            vel1: np.ndarray,
-            mass1: float,
-            radius1: float,
-            pos2: np.ndarray,
-            vel2: np.ndarray,
-            mass2: float,
-            radius2: float,
-            restitution: float = 0.6
-        ) -> None:
-            """
-            Resolves collision between two 3D spheres (modifies velocities/positions in-place).
-            """
-            # Vector from sphere1 to sphere2
-            delta_pos = pos2 - pos1
-            distance = np.linalg.norm(delta_pos)
-            min_distance = radius1 + radius2
-
-            if distance > min_distance:
-                return False
-
-            # Normalized collision normal
-            collision_normal = delta_pos / distance
-
-            # Relative velocity
-            relative_vel = vel2 - vel1
-
-            # Velocity along collision normal
-            velocity_along_normal = np.dot(relative_vel, collision_normal)
-
-            # Do not resolve if spheres are moving apart
-            if velocity_along_normal > 0:
-                return False
-
-            # Impulse calculation
-            reduced_mass = 1.0 / (1.0 / mass1 + 1.0 / mass2)
-            impulse_magnitude = -(1 + restitution) * velocity_along_normal * reduced_mass
-            impulse = impulse_magnitude * collision_normal
-
-            # Apply impulse
-            vel1 -= impulse / mass1
-            vel2 += impulse / mass2
-
-            # Position correction to prevent overlap
-            overlap = min_distance - distance
-            if overlap > 0:
-                total_mass = mass1 + mass2
-                pos1 -= (mass2 / total_mass) * overlap * collision_normal
-                pos2 += (mass1 / total_mass) * overlap * collision_normal
-
-            return True
-
-        for _ in range(ticks):
-            if self.state.point_scored:
-                break
-            # Reset stuff
-            self.state.point_scored = False
-            self.state.scoring_slime = None
-
-            # SLIMES
-            for sid, slime in self.state.slimes.items():
-                slime.jump_cooldown = max(np.float32(0.0), slime.jump_cooldown - DT)
-                slime.touch_cooldown = max(np.float32(0.0), slime.touch_cooldown - DT)
-
-                slime_controller(sid, slime)
-
-                # Gravity & move
-                slime.velocity += GRAVITY * DT
-                new_pos = slime.position + slime.velocity * DT
-                # We don't want to fade through the floor, and good idea for a gamemode
-                if new_pos[1] < SLIME_CENTER_ON_FLOOR and slime.velocity[1] < 0:
-                    new_pos[1] = SLIME_CENTER_ON_FLOOR
-                    slime.velocity[1] = max(np.float32(0.0), slime.velocity[1])
-
-                # Slime can't cross
-                if new_pos[1] < SLIME_BLOCKER_HEIGHT_FLT:
-                    if slime.position[0] < 0 and new_pos[0] + SLIME_RADIUS > -NET_PLANE_X:
-                        new_pos[0] = 0 - NET_HALF_THICKNESS - SLIME_RADIUS
-                        slime.velocity[0] = 0.0
-                    if slime.position[0] > 0 and new_pos[0] - SLIME_RADIUS < NET_PLANE_X:
-                        new_pos[0] = NET_PLANE_X + SLIME_RADIUS
-                        slime.velocity[0] = 0.0
-                slime.position = new_pos
-
-                # Ball collision
-                if sphere_collision_mut(slime.position, slime.velocity, SLIME_MASS, SLIME_RADIUS, self.state.ball_position, self.state.ball_velocity, BALL_MASS, BALL_RADIUS):
-                    if slime.touch_cooldown <= 0:
-                        slime.touch_cooldown = SLIME_TOUCH_COOLDOWN
-                        if slime.touches_remaining > 0:
-                            slime.touches_remaining -= 1
-                        else:
-                            self.state.point_scored = True
-                            x = self.state.ball_position[0]
-                            scorer = 1 if x < 0 else 0
-                            self.state.scoring_slime = scorer
-
-            # BALL
-            # Net collision for ball
-            # if crossing net and below net height
-            prev_x = self.state.ball_position[0]
-            self.state.ball_velocity += GRAVITY * DT
-            self.state.ball_position += self.state.ball_velocity * DT
-            # Ball vs net
-            bx = self.state.ball_position[0]
-            by = self.state.ball_position[1]
-            bz = self.state.ball_position[2]
-            # Distance from net
-            bndx = abs(bx) - (BALL_RADIUS + NET_HALF_THICKNESS)
-            bndy = by - NET_HEIGHT_FLT - BALL_RADIUS
-
-            if bndx <= 0:
-                for sid, slime in self.state.slimes.items():
-                    slime.touches_remaining = 3
-
-            if bndx < 0 and bndy < 0:
-                # We assume whichever wall it's closer to is the one it's bouncing off
-                # NB: This does not account for hitting the courner
-                if bndx >= bndy:
-                    # reflect X velocity
-                    self.state.ball_velocity[0] *= -BALL_RESTITUTION
-                    # reposition in walls
-                    if prev_x < 0:
-                        self.state.ball_position[0] = NET_HALF_THICKNESS - BALL_RADIUS
-                    else:
-                        self.state.ball_position[0] = NET_HALF_THICKNESS + BALL_RADIUS
-                else:
-                    # reflect X velocity
-                    self.state.ball_velocity[1] *= -BALL_RESTITUTION
-                    # reposition in walls
-                    self.state.ball_position[1] = NET_HEIGHT_FLT + BALL_RADIUS
-            elif abs(bx) > STAGE_RADIUS[0] - BALL_RADIUS:
-                # Back wall collision
-                self.state.ball_velocity[0] *= -BALL_RESTITUTION
-                self.state.ball_position[0] = np.sign(bx) * (STAGE_RADIUS[0] - BALL_RADIUS)
-            if abs(bz) > STAGE_RADIUS[1] - BALL_RADIUS:
-                # Side wall collision
-                self.state.ball_velocity[2] *= -BALL_RESTITUTION
-                self.state.ball_position[2] = np.sign(bz) * (STAGE_RADIUS[1] - BALL_RADIUS)
-
-            # Floor collision -> point scored, so we can reset
-            if self.state.ball_position[1] <= 0:
-                self.state.ball_position[1] = 0
-                x = self.state.ball_position[0]
-                scorer = 1 if x < 0 else 0
-                self.state.point_scored = True
-                self.state.scoring_slime = scorer
-
-            self.state.steps += 1
+        """
+        Copies goal_state into the state we already own, so nothing gets reallocated and the stats and renderer stay.
+        Our arrays were made f32 in __init__, copyto casts whatever comes in.
+        """
+        state = self.state
+        if goal_state is state:
+            return
+        if isinstance(state, CompactVolleyballState):
+            state.load(goal_state)
+            return
 
+        for sid, goal_slime in goal_state.slimes.items():
+            slime = state.slimes[sid]
+            np.copyto(slime.position, goal_slime.position, casting="same_kind")
+            np.copyto(slime.velocity, goal_slime.velocity, casting="same_kind")
+            np.copyto(slime.target, goal_slime.target, casting="same_kind")
+            slime.touches_remaining = float(goal_slime.touches_remaining)
+            slime.can_jump = bool(goal_slime.can_jump)
+            slime.jump_cooldown = float(goal_slime.jump_cooldown)
+            slime.touch_cooldown = float(goal_slime.touch_cooldown)
+        np.copyto(state.ball_position, goal_state.ball_position, casting="same_kind")
+        np.copyto(state.ball_velocity, goal_state.ball_velocity, casting="same_kind")
+        state.point_scored = goal_state.point_scored
+        state.scoring_slime = goal_state.scoring_slime
+        state.steps = goal_state.steps
+
+    def snapshot(self) -> int:
+        """Saves the full physics state into the ring buffer, returns a handle for restore"""
+        if self._snapshots is None:
+            self._snapshots = np.zeros((self.snapshot_capacity, STATE_HEADER_SIZE + SLIME_SIZE * len(self.state.slimes)), dtype=np.float32)
+        handle = self._snapshot_count
+        row = self._snapshots[handle % self.snapshot_capacity]
+        if isinstance(self.state, CompactVolleyballState):
+            row[:] = self.state.buffer
+        else:
+            CompactVolleyballState(len(self.state.slimes), row).load(self.state)
+        self._snapshot_count += 1
+        return handle
+
+    def restore(self, handle: int) -> VolleyballState:
+        """
+        Loads a snapshot back, it stays in the ring so it can be restored again until it gets overwritten.
+        Raises ValueError for a handle that was overwritten (the ring keeps the last snapshot_capacity ones) or never given.
+        """
+        if not 0 <= handle < self._snapshot_count:
+            raise ValueError(f"No snapshot {handle}, only {self._snapshot_count} were taken")
+        if handle < self._snapshot_count - self.snapshot_capacity:
+            raise ValueError(f"Snapshot {handle} was overwritten, the ring only keeps the last {self.snapshot_capacity} "
+                             f"(the oldest one left is {self._snapshot_count - self.snapshot_capacity})")
+        row = self._snapshots[handle % self.snapshot_capacity]
+        if isinstance(self.state, CompactVolleyballState):
+            self.state.buffer[:] = row
+        else:
+            self.set_state(CompactVolleyballState(len(self.state.slimes), row))
         return self.state
 
+    def rollout(self, actions: np.ndarray, ticks_per_action: int = 1) -> RolloutOutcome:
+        """
+        What-if search: plays M candidate action sequences ([M, K, n_slimes, 4]) from the current state and puts it back
+        afterwards. Each of the K actions is held for ticks_per_action ticks, like step_game(action, ticks_per_action).
+        This is sequential, not vectorized: the branches go one after the other through this sim's own tick loop, one
+        call per tick, so dt, continuous_collision, fast_forward and the backend apply to them too and every branch ends
+        exactly where step_game would. The final states are the rows of self.rollout_states (CompactVolleyballState
+        layout). BatchedSlimeVolleyballSim.rollout plays all branches in one vectorized call, on its own f32 copy of
+        the default physics (discrete collision, default dt), so it can differ from step_game by rounding.
+        """
+        actions = np.asarray(actions, dtype=np.float32)
+        num_slimes = len(self.state.slimes)
+        if actions.ndim != 4 or actions.shape[2:] != (num_slimes, 4):
+            raise ValueError(f"Rollout actions should be [M, K, {num_slimes}, 4], got {list(actions.shape)}")
+        num_branches = len(actions)
+        row_size = STATE_HEADER_SIZE + SLIME_SIZE * num_slimes
+        if self.rollout_states is None or self.rollout_states.shape[0] != num_branches:
+            self.rollout_states = np.zeros((num_branches, row_size), dtype=np.float32)
+            self._rollout_start = np.zeros(row_size, dtype=np.float32)
+        start = CompactVolleyballState(num_slimes, self._rollout_start)
+        start.load(self.state)
+
+        point_scored = np.full(num_branches, bool(start.point_scored))
+        scoring_slime = np.full(num_branches, -1 if start.scoring_slime is None else start.scoring_slime, dtype=np.int8)
+        ticks = np.zeros(num_branches, dtype=np.int64)
+        touches = np.zeros((num_branches, num_slimes), dtype=np.int32)
+        landing_position = np.full((num_branches, 2), np.nan, dtype=np.float32)
+        slimes, ball = self._slime_scratch, self._ball_scratch
+        state = self.state
+        try:
+            for m in range(num_branches):
+                self.set_state(start)
+                for action in actions[m]:
+                    if state.point_scored:
+                        break
+                    self._load_scratch(action)
+                    # One tick per call so the touches can be counted, the scratch stays f64 across the action
+                    for _ in range(ticks_per_action):
+                        ticks_done, scored, scorer = self._run_ticks(
+                            slimes, ball, 1, self._max_speed, self._acceleration, self._jump_force, self.dt
+                        )
+                        ticks[m] += ticks_done
+                        for i, s in enumerate(slimes):
+                            # A touch this tick just set the cooldown
+                            if s[TOUCH_CD] == SLIME_TOUCH_COOLDOWN:
+                                touches[m, i] += 1
+                        if scored:
+                            state.point_scored = True
+                            state.scoring_slime = scorer
+                            point_scored[m] = True
+                            scoring_slime[m] = scorer
+                            if ball[BY] <= 0:
+                                landing_position[m] = ball[BX], ball[BZ]
+                            break
+                    self._store_scratch()
+                state.steps = start.steps + int(ticks[m])
+                CompactVolleyballState(num_slimes, self.rollout_states[m]).load(state)
+        finally:
+            self.set_state(start)
+
+        return RolloutOutcome(point_scored, scoring_slime, ticks, touches, landing_position)
+
+    def step_game(self, actions: Union[Dict[int, np.ndarray], np.ndarray], ticks: int = 1) -> VolleyballState:
+        """actions is {slime id: [x, y, z target, jump]} or an [n_slimes, 4] array (what SlimeActions(array_actions=True) gives)"""
+        state = self.state
+        if state.point_scored or ticks <= 0:
+            return state
+
+        self._load_scratch(actions)
+        ticks_done, point_scored, scoring_slime = self._run_ticks(
+            self._slime_scratch, self._ball_scratch, ticks, self._max_speed, self._acceleration, self._jump_force, self.dt
+        )
+        self._store_scratch()
+
+        state.point_scored = point_scored
+        state.scoring_slime = None if scoring_slime < 0 else scoring_slime
+        state.steps += ticks_done
+        return state
+
+    def _step_game_buffer(self, actions: Union[Dict[int, np.ndarray], np.ndarray], ticks: int = 1) -> VolleyballState:
+        # Takes the place of step_game on the numba backend, the kernel does the scratch copies too
+        state = self.state
+        if state.point_scored or ticks <= 0:
+            return state
+        ticks_done = self._step_buffer(state.buffer, self._action_rows(actions), self._slime_scratch, self._ball_scratch,
+                                       ticks, self._max_speed, self._acceleration, self._jump_force, self.dt)
+        state.steps += ticks_done
+        return state
+
+    def _action_rows(self, actions: Union[Dict[int, np.ndarray], np.ndarray]) -> np.ndarray:
+        """The actions as [n_slimes, 4] f32 rows, a slime without one keeps going to its old target without jumping"""
+        rows = self._actions
+        if isinstance(actions, np.ndarray):
+            if actions.dtype == np.float32 and actions.shape == rows.shape and actions.flags.c_contiguous:
+                return actions
+            rows[:] = actions
+            return rows
+        for i, (sid, slime) in enumerate(self.state.slimes.items()):
+            act = actions.get(sid)
+            if act is None:
+                rows[i, :3] = slime.target
+                rows[i, 3] = 0
+            else:
+                rows[i] = act
+        return rows
+
+    def _step_game_profiled(self, actions: Union[Dict[int, np.ndarray], np.ndarray], ticks: int = 1) -> VolleyballState:
+        # Takes the place of step_game when there's a profiler, the whole call (scratch copies included) is "step_game"
+        start = time.perf_counter_ns()
+        state = SlimeVolleyballSim.step_game(self, actions, ticks)
+        self.profiler.add("step_game", time.perf_counter_ns() - start)
+        return state
+
+    def _load_scratch(self, actions: Union[Dict[int, np.ndarray], np.ndarray]) -> None:
+        """Copies the state and actions into the python float lists the tick loop works on"""
+        ball = self._ball_scratch
+        ball[BX], ball[BY], ball[BZ] = self.state.ball_position.tolist()
+        ball[BVX], ball[BVY], ball[BVZ] = self.state.ball_velocity.tolist()
+        # An [n_slimes, 4] array has one row per slime, in state.slimes order
+        rows = np.asarray(actions, dtype=np.float32).tolist() if isinstance(actions, np.ndarray) else None
+        for i, ((sid, slime), s) in enumerate(zip(self.state.slimes.items(), self._slime_scratch)):
+            s[PX], s[PY], s[PZ] = slime.position.tolist()
+            s[VX], s[VY], s[VZ] = slime.velocity.tolist()
+            act = rows[i] if rows is not None else actions.get(sid)
+            if act is None:
+                # No action, keep going to the old target
+                s[TX], s[TY], s[TZ] = slime.target.tolist()
+                s[JUMP_REQ] = False
+            else:
+                s[TX], s[TY], s[TZ] = act[:3] if rows is not None else np.asarray(act[:3], dtype=np.float32).tolist()
+                s[JUMP_REQ] = bool(act[3])
+            s[TOUCHES] = float(slime.touches_remaining)
+            s[JUMP_CD] = float(slime.jump_cooldown)
+            s[TOUCH_CD] = float(slime.touch_cooldown)
+            s[CAN_JUMP] = slime.can_jump
+
+    def _store_scratch(self) -> None:
+        """Writes the scratch lists back into the state arrays"""
+        ball = self._ball_scratch
+        ball_position = self.state.ball_position
+        ball_velocity = self.state.ball_velocity
+        ball_position[0] = ball[BX]
+        ball_position[1] = ball[BY]
+        ball_position[2] = ball[BZ]
+        ball_velocity[0] = ball[BVX]
+        ball_velocity[1] = ball[BVY]
+        ball_velocity[2] = ball[BVZ]
+        for slime, s in zip(self.state.slimes.values(), self._slime_scratch):
+            position = slime.position
+            velocity = slime.velocity
+            target = slime.target
+            position[0] = s[PX]
+            position[1] = s[PY]
+            position[2] = s[PZ]
+            velocity[0] = s[VX]
+            velocity[1] = s[VY]
+            velocity[2] = s[VZ]
+            target[0] = s[TX]
+            target[1] = s[TY]
+            target[2] = s[TZ]
+            slime.touches_remaining = float(s[TOUCHES])
+            slime.jump_cooldown = float(s[JUMP_CD])
+            slime.touch_cooldown = float(s[TOUCH_CD])
+            slime.can_jump = bool(s[CAN_JUMP])
+
     def render(self):
         if self.render_mode is None:
             return
-
-        padding = 50
-
-        # Compute aspect ratios for the views based on stage dimensions
-        side_aspect = (STAGE_RADIUS[0] * 2) / (NET_HEIGHT_FLT * 8 * 0.8)  # width / height (scaled similarly to to_screen)
-        top_aspect = (STAGE_RADIUS[0] * 2) / (STAGE_RADIUS[1] * 2)      # width / height
-
-        # Target width for views (max width to fit window comfortably)
-        target_width = 700
-
-        # Compute heights preserving aspect ratios
-        side_height = int(target_width / side_aspect)
-        top_height = int(target_width / top_aspect)
-
-        # Total window height (two views stacked + padding in between and top/bottom)
-        window_width = target_width + padding * 2
-        window_height = side_height + top_height + padding * 3  # extra padding for spacing
-
-        if self.window is None and self.render_mode == "human":
-            pygame.init()
-            self.window = pygame.display.set_mode((window_width, window_height))
-            pygame.display.set_caption("Slime Volleyball - Side and Top Views")
-            self.clock = pygame.time.Clock()
-            self.font = pygame.font.SysFont("Arial", 24)
-
-        canvas = pygame.Surface((window_width, window_height)) if self.render_mode == "rgb_array" else self.window
-        canvas.fill((20, 20, 35))  # Dark blue background
-
-        # Draw view labels centered horizontally
-        label_side = self.font.render("Side View (X-Y Plane)", True, (255, 255, 255))
-        label_top = self.font.render("Top View (X-Z Plane)", True, (255, 255, 255))
-        label_side_pos = ((window_width - label_side.get_width()) // 2, padding // 2)
-        label_top_pos = ((window_width - label_top.get_width()) // 2, side_height + padding * 2)
-
-        canvas.blit(label_side, label_side_pos)
-        canvas.blit(label_top, label_top_pos)
-
-        # Draw the two views stacked vertically with padding
-        self._draw_side_view(canvas, pygame.Rect(padding, padding, target_width, side_height))
-        self._draw_top_view(canvas, pygame.Rect(padding, side_height + padding * 2, target_width, top_height))
-
-        if self.render_mode == "human":
-            pygame.event.pump()
-            self.window.blit(canvas, (0, 0))
-            pygame.display.update()
-            self.clock.tick(60)
-        elif self.render_mode == "rgb_array":
-            return np.transpose(
-                np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2)
-            )
-
-    def _draw_side_view(self, surface, rect):
-        # Draw court outline
-        pygame.draw.rect(surface, (30, 30, 50), rect)
-        pygame.draw.rect(surface, (200, 200, 200), rect, 2)
-
-        # Convert game coords to screen coords
-        def to_screen(x, y):
-            screen_x = rect.left + (x + STAGE_RADIUS[0]) / (STAGE_RADIUS[0] * 2) * rect.width
-            screen_y = rect.bottom - y / (NET_HEIGHT_FLT*3) * rect.height * 0.8
-            return (int(screen_x), int(screen_y))
-
-        # Draw floor
-        floor_y = to_screen(-STAGE_RADIUS[0], 0)[1]
-        pygame.draw.line(
-            surface, (80, 180, 80),
-            (rect.left, floor_y),
-            (rect.right, floor_y),
-            3
-        )
-
-        # Draw net
-        net_top = to_screen(0, NET_HEIGHT_FLT)
-        net_bottom = to_screen(0, 0)
-        pygame.draw.line(surface, (220, 20, 60), net_bottom, net_top, 4)
-
-        # Draw center line
-        pygame.draw.line(
-            surface, (100, 100, 150),
-            to_screen(0, 0),
-            to_screen(0, NET_HEIGHT_FLT*2.5),
-            1
-        )
-
-        # Draw slimes
-        for sid, slime in self.state.slimes.items():
-            pos = to_screen(slime.position[0], slime.position[1])
-            radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.5)
-            color = (0, 150, 255) if sid == 0 else (50, 255, 100)
-            pygame.draw.circle(surface, color, pos, radius)
-            pygame.draw.circle(surface, (255, 255, 255), pos, radius, 2)
-
-            # Draw jump status
-            if slime.jump_cooldown > 0:
-                jump_pos = (pos[0], pos[1] - radius - 10)
-                pygame.draw.circle(surface, (255, 215, 0), jump_pos, 5)
-
-            # Draw movement target
-            target_radius = radius / 5
-            target_pos = to_screen(slime.target[0], slime.target[1])
-            pygame.draw.circle(surface, color, target_pos, target_radius)
-
-        # Draw ball
-        ball_pos = to_screen(
-            self.state.ball_position[0],
-            self.state.ball_position[1]
-        )
-        ball_radius = int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 2)
-        pygame.draw.circle(surface, (255, 255, 255), ball_pos, ball_radius)
-        pygame.draw.circle(surface, (200, 30, 30), ball_pos, ball_radius, 2)
-
-    def _draw_top_view(self, surface, rect):
-        # Draw court outline
-        pygame.draw.rect(surface, (30, 30, 50), rect)
-        pygame.draw.rect(surface, (200, 200, 200), rect, 2)
-
-        # Convert game coords to screen coords
-        def to_screen(x, z):
-            screen_x = rect.left + (x + STAGE_RADIUS[0]) / (STAGE_RADIUS[0] * 2) * rect.width
-            screen_z = rect.bottom - (z + STAGE_RADIUS[1]) / (STAGE_RADIUS[1] * 2) * rect.height
-            return (int(screen_x), int(screen_z))
-
-        # Draw net
-        net_left = to_screen(-NET_HALF_THICKNESS, -STAGE_RADIUS[1])
-        net_right = to_screen(NET_HALF_THICKNESS, STAGE_RADIUS[1])
-        pygame.draw.rect(
-            surface, (220, 20, 60),
-            (net_left[0], rect.top, net_right[0]-net_left[0], rect.height)
-        )
-
-        # Draw center line
-        center_top = to_screen(0, -STAGE_RADIUS[1])
-        center_bottom = to_screen(0, STAGE_RADIUS[1])
-        pygame.draw.line(
-            surface, (100, 100, 150), center_top, center_bottom, 1
-        )
-
-        # Draw slimes
-        for sid, slime in self.state.slimes.items():
-            pos = to_screen(slime.position[0], slime.position[2])
-            radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.2)
-            color = (0, 150, 255) if sid == 0 else (50, 255, 100)
-            pygame.draw.circle(surface, color, pos, radius)
-            pygame.draw.circle(surface, (255, 255, 255), pos, radius, 2)
-
-            # Draw movement direction
-            if np.linalg.norm(slime.velocity) > 0.1:
-                end_pos = (
-                    pos[0] + int(slime.velocity[0] * 10),
-                    pos[1] - int(slime.velocity[2] * 10)
-                )
-                pygame.draw.line(surface, (255, 255, 0), pos, end_pos, 2)
-
-            # Draw movement target
-            target_radius = SLIME_RADIUS / 3
-            target_pos = to_screen(slime.target[0], slime.target[2])
-            pygame.draw.circle(surface, color, target_pos, target_radius)
-
-        # Draw ball
-        ball_pos = to_screen(
-            self.state.ball_position[0],
-            self.state.ball_position[2]
-        )
-        ball_radius = int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.5)
-        pygame.draw.circle(surface, (255, 255, 255), ball_pos, ball_radius)
-        pygame.draw.circle(surface, (200, 30, 30), ball_pos, ball_radius, 2)
-
-        # Draw velocity vector
-        if np.linalg.norm(self.state.ball_velocity) > 0.1:
-            end_pos = (
-                ball_pos[0] + int(self.state.ball_velocity[0] * 8),
-                ball_pos[1] - int(self.state.ball_velocity[2] * 8)
-            )
-            pygame.draw.line(surface, (255, 100, 100), ball_pos, end_pos, 3)
+        if self.render_mode == "numpy":
+            return self.rasterizer.render(self.state).copy()
+        if self.view is None:
+            # Same drawing as SlimeRenderer, static parts cached
+            from slime_api.slimepygame import PygameView
+            self.view = PygameView(self.render_mode)
+        return self.view.draw(self.state)
 
     def close(self):
-        if self.window is not None:
-            pygame.display.quit()
-            pygame.quit()
-            self.window = None
+        if self.view is not None:
+            self.view.close()
+            self.view = None
@@ -0,0 +1,120 @@
+"""
+Opt-in timing per phase for the sim and the env components. Pass a PhaseProfiler to SlimeVolleyballSim
+(or IndieDevEngine, or slime_api.sim.profiling.instrument_env for the whole env) and read report() / summary() after a while.
+Nothing gets timed without one, the sim picks its instrumented loop once in __init__.
+"""
+import time
+from typing import Dict
+
+# Phases of a sim tick, in order
+SIM_PHASES = ("cooldowns", "slime_controller", "slime_integration", "slime_ball_collision",
+              "ball_integration", "net_walls", "floor_scoring")
+# Things the instrumented tick loop counts
+SIM_EVENTS = ("contacts", "touches", "net_side_hits", "net_top_hits", "back_wall_bounces",
+              "side_wall_bounces", "net_band_ticks", "points")
+
+
+class PhaseProfiler:
+    """Accumulates nanoseconds and calls per phase, and counts per event"""
+    def __init__(self):
+        self.times: Dict[str, int] = {}  # ns
+        self.calls: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+
+    def add(self, phase: str, ns: int, calls: int = 1) -> None:
+        self.times[phase] = self.times.get(phase, 0) + ns
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    def timer(self, phase: str) -> "PhaseTimer":
+        """with profiler.timer("phase"): ..."""
+        return PhaseTimer(self, phase)
+
+    def count(self, event: str, n: int = 1) -> None:
+        self.events[event] = self.events.get(event, 0) + n
+
+    def reset(self) -> None:
+        self.times.clear()
+        self.calls.clear()
+        self.events.clear()
+
+    def report(self) -> Dict[str, Dict]:
+        """{"phases": {phase: {"total_ms", "calls", "mean_us"}}, "events": {event: count}}"""
+        phases = {}
+        for phase, ns in self.times.items():
+            calls = self.calls[phase]
+            phases[phase] = {
+                "total_ms": ns / 1e6,
+                "calls": calls,
+                "mean_us": ns / calls / 1e3 if calls else 0.0,
+            }
+        return {"phases": phases, "events": dict(self.events)}
+
+    def summary(self) -> str:
+        """The report as a table, slowest phase first (phases nest, env_step includes obs and so on)"""
+        lines = [f"{'phase':<26} {'total ms':>10} {'calls':>10} {'mean us':>9}"]
+        for phase, ns in sorted(self.times.items(), key=lambda item: -item[1]):
+            calls = self.calls[phase]
+            lines.append(f"{phase:<26} {ns / 1e6:10.2f} {calls:10d} {ns / max(calls, 1) / 1e3:9.3f}")
+        if self.events:
+            lines.append("")
+            lines.extend(f"{event:<26} {n:10d}" for event, n in self.events.items())
+        return "\n".join(lines)
+
+
+class PhaseTimer:
+    """Times a with block into a phase, see PhaseProfiler.timer"""
+    __slots__ = ("profiler", "phase", "start")
+
+    def __init__(self, profiler: PhaseProfiler, phase: str):
+        self.profiler = profiler
+        self.phase = phase
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.phase, time.perf_counter_ns() - self.start)
+        return False
+
+
+def _timed(profiler: PhaseProfiler, phase: str, fn):
+    def timed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        result = fn(*args, **kwargs)
+        profiler.add(phase, time.perf_counter_ns() - start)
+        return result
+    return timed
+
+
+def instrument_env(env, profiler: PhaseProfiler):
+    """
+    Times every component of an RLGym env into profiler: env_step / env_reset as a whole, then actions, engine_step,
+    obs, reward (and reward/<name> for each part of a CombinedReward or WeightedReward), terminated, truncated and mutator.
+    The methods get wrapped on the instances, so only this env pays for it. For the phases inside the sim
+    build the env with IndieDevEngine(profiler=profiler).
+    """
+    wrap = [
+        (env, "step", "env_step"),
+        (env, "reset", "env_reset"),
+        (env.action_parser, "parse_actions", "actions"),
+        (env.transition_engine, "step", "engine_step"),
+        (env.obs_builder, "build_obs", "obs"),
+        (env.reward_fn, "get_rewards", "reward"),
+        (env.state_mutator, "apply", "mutator"),
+    ]
+    for reward_fn in getattr(env.reward_fn, "reward_fns", ()):
+        wrap.append((reward_fn, "get_rewards", f"reward/{type(reward_fn).__name__}"))
+    for term in getattr(env.reward_fn, "terms", ()):
+        # compute_state is the one RLGym's get_rewards runs, compute is the batched one
+        wrap.append((term, "compute", f"reward/{type(term).__name__}"))
+        wrap.append((term, "compute_state", f"reward/{type(term).__name__}"))
+    if env.termination_cond is not None:
+        wrap.append((env.termination_cond, "is_done", "terminated"))
+    if env.truncation_cond is not None:
+        wrap.append((env.truncation_cond, "is_done", "truncated"))
+
+    for component, method, phase in wrap:
+        setattr(component, method, _timed(profiler, phase, getattr(component, method)))
+    return env
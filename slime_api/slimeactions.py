@@ -1,10 +1,35 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
 from slime_api.slimestate import Slime, VolleyballState
 from rlgym.api import TransitionEngine, StateMutator, ObsBuilder, ActionParser, RewardFunction, DoneCondition
 
+
+def action_multiplier(started_on_right: np.ndarray) -> np.ndarray:
+    """[..., 4] multiplier for [..., n_agents] started_on_right: targets scaled to [-10, 10], X and Z mirrored on the right"""
+    multiplier = np.ones(np.shape(started_on_right) + (4,), dtype=np.float32)
+    multiplier[..., :3] = 10.0
+    sign = np.where(started_on_right, -1.0, 1.0)
+    multiplier[..., 0] *= sign
+    multiplier[..., 2] *= sign
+    return multiplier
+
+
+_UNMIRRORED = action_multiplier(np.array(False))
+
+
 class SlimeActions(ActionParser[int, np.ndarray, np.ndarray, VolleyballState, int]):
-    """Defines the action space and parsing with fixed side inversion"""
+    """
+    Defines the action space and parsing with fixed side inversion.
+    Actions get scaled and mirrored with one multiply into a buffer that's reused, so the parsed actions (and
+    shared_info['actions']) are views the next parse overwrites. With array_actions the engine gets that
+    [n_agents, 4] buffer itself instead of a dict, which the sim reads as is. parse_actions also takes an [n_agents, 4]
+    array (rows in agents order), and parse_actions_batch does [n_envs, n_agents, 4] for a vectorized env.
+    """
+    def __init__(self, array_actions: bool = False):
+        self.array_actions = array_actions
+        self._batch_multiplier: Optional[np.ndarray] = None
+        self._batch_buffer: Optional[np.ndarray] = None
+
     def get_action_space(self, agent: int) -> int:
         # 3D target + jump flag
         return 4, 'continuous'
@@ -15,20 +40,59 @@ class SlimeActions(ActionParser[int, np.ndarray, np.ndarray, VolleyballState, in
             agent: (initial_state.slimes[agent].position[0] > 0)
             for agent in agents
         }
+        self._agents = list(agents)
+        self._index = {agent: i for i, agent in enumerate(agents)}
+        self._multiplier = action_multiplier(np.array([self.started_on_right[agent] for agent in agents]))
+        self._buffer = np.zeros((len(agents), 4), dtype=np.float32)
 
-    def parse_actions(self, actions: Dict[int, np.ndarray], state: VolleyballState, shared_info: Dict[str, Any]) -> Dict[int, np.ndarray]:
-        real_actions: Dict[int, np.ndarray] = {}
-        for agent_id, action in actions.items():
-            proc = action.astype(np.float32)
-            # Scale X, Y, Z targets to [-10, 10]
-            proc[:3] *= 10.0
-
-            # Mirror horizontal axes if started on right
-            if self.started_on_right.get(agent_id, False):
-                proc[0] *= -1.0
-                proc[2] *= -1.0
-
-            real_actions[agent_id] = proc
-
+    def parse_actions(self, actions: Union[Dict[int, np.ndarray], np.ndarray], state: VolleyballState,
+                      shared_info: Dict[str, Any]) -> Union[Dict[int, np.ndarray], np.ndarray]:
+        buffer = self._buffer
+        # Scale X, Y, Z targets to [-10, 10], mirror horizontal axes if started on right
+        if isinstance(actions, np.ndarray):
+            buffer[:] = actions
+            buffer *= self._multiplier
+            if self.array_actions:
+                real_actions = buffer
+            else:
+                real_actions = {agent_id: buffer[i] for i, agent_id in enumerate(self._agents)}
+        else:
+            real_actions = {}
+            index = self._index
+            rows = []
+            for agent_id, action in actions.items():
+                i = index.get(agent_id)
+                if i is None:
+                    # Not an agent we were reset with, scaled but not mirrored (and not in the array_actions buffer)
+                    real_actions[agent_id] = np.asarray(action, dtype=np.float32) * _UNMIRRORED
+                    continue
+                buffer[i] = action
+                rows.append(i)
+                real_actions[agent_id] = buffer[i]
+            if len(rows) == len(buffer):
+                buffer *= self._multiplier
+            else:
+                # Only the rows we got, an agent without an action keeps its last row as it was
+                for i in rows:
+                    buffer[i] *= self._multiplier[i]
+            if self.array_actions:
+                real_actions = buffer
         shared_info['actions'] = real_actions
         return real_actions
+
+    def reset_batch(self, started_on_right: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """started_on_right is [n_envs, n_agents], with mask only those envs get updated (the ones that just reset)"""
+        if mask is None or self._batch_multiplier is None:
+            self._batch_multiplier = action_multiplier(started_on_right)
+            self._batch_buffer = np.zeros(self._batch_multiplier.shape, dtype=np.float32)
+        else:
+            self._batch_multiplier[mask] = action_multiplier(started_on_right[mask])
+
+    def parse_actions_batch(self, actions: np.ndarray, shared_info: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """[n_envs, n_agents, 4] policy actions -> sim actions, ready for BatchedSlimeVolleyballSim.step_game"""
+        buffer = self._batch_buffer
+        buffer[:] = actions
+        buffer *= self._batch_multiplier
+        if shared_info is not None:
+            shared_info['actions'] = buffer
+        return buffer
@@ -0,0 +1,197 @@
+"""
+Rendering off the env-step path. render() only copies the state (one CompactVolleyballState row) into a bounded ring,
+a display process (or thread) drains it at its own frame rate, interpolates between snapshots and draws the newest
+ones. The ring never blocks: the producer overwrites the oldest slot, and a reader that falls behind skips ahead.
+
+Every slot has a sequence number (odd while it's being written), the reader copies a slot and only keeps the copy if
+the number didn't change, so nothing needs a lock. The ring lives in shared memory in process mode.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from rlgym.api import Renderer
+from slime_api.slimestate import VolleyballState, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE, \
+    SLIME_POSITION, SLIME_VELOCITY, BALL_POSITION, BALL_VELOCITY, STEPS
+
+_WRITTEN = 0  # Header: snapshots written so far
+_STOP = 1  # Header: set to ask the reader to quit
+_READ = 2  # Header: how far the reader got, for producers that would rather drop new snapshots than overwrite unread ones
+_MARK = 3  # Header: free for the producer, EpisodeRecorder puts how many episodes are over there
+_HEADER = 4
+_HISTORY = 8  # Snapshots the display keeps for interpolation
+_MAX_DRAIN = 4  # Newest snapshots read per frame, older unread ones are dropped
+
+
+def _lerp_mask(num_slimes: int) -> np.ndarray:
+    """Which values of a row get interpolated, the rest (touches, flags, cooldowns, steps) come from the newer one"""
+    mask = np.zeros(STATE_HEADER_SIZE + SLIME_SIZE * num_slimes, dtype=bool)
+    mask[BALL_POSITION] = True
+    mask[BALL_VELOCITY] = True
+    for sid in range(num_slimes):
+        block = STATE_HEADER_SIZE + SLIME_SIZE * sid
+        mask[block + SLIME_POSITION.start:block + SLIME_POSITION.stop] = True
+        mask[block + SLIME_VELOCITY.start:block + SLIME_VELOCITY.stop] = True
+    return mask
+
+
+class SnapshotRing:
+    """capacity state rows with a time and sequence number each, in one buffer (shared memory or a plain bytearray)"""
+    def __init__(self, capacity: int, num_slimes: int, buffer=None):
+        self.capacity = capacity
+        self.num_slimes = num_slimes
+        self.row_size = STATE_HEADER_SIZE + SLIME_SIZE * num_slimes
+        if buffer is None:
+            buffer = bytearray(self.nbytes(capacity, num_slimes))
+        ints = _HEADER + capacity
+        self.header = np.frombuffer(buffer, dtype=np.int64, count=_HEADER)
+        self.seq = np.frombuffer(buffer, dtype=np.int64, count=capacity, offset=8 * _HEADER)
+        self.times = np.frombuffer(buffer, dtype=np.float64, count=capacity, offset=8 * ints)
+        self.rows = np.frombuffer(buffer, dtype=np.float32, count=capacity * self.row_size,
+                                  offset=8 * (ints + capacity)).reshape(capacity, self.row_size)
+        self._slots = [CompactVolleyballState(num_slimes, row) for row in self.rows]
+
+    @staticmethod
+    def nbytes(capacity: int, num_slimes: int) -> int:
+        return 8 * (_HEADER + 2 * capacity) + 4 * capacity * (STATE_HEADER_SIZE + SLIME_SIZE * num_slimes)
+
+    def push(self, state: VolleyballState, stamp: Optional[float] = None) -> None:
+        """Writes state into the next slot, overwriting the oldest one, never waits. stamp defaults to the time"""
+        written = int(self.header[_WRITTEN])
+        slot = written % self.capacity
+        self.seq[slot] += 1  # Odd, being written
+        self._slots[slot].load(state)
+        self.times[slot] = time.monotonic() if stamp is None else stamp
+        self.seq[slot] += 1
+        self.header[_WRITTEN] = written + 1
+
+    def read_new(self, read: int, limit: int = _MAX_DRAIN) -> Tuple[int, List[Tuple[float, np.ndarray]]]:
+        """Snapshots written since read (at most limit, the newest ones), as (time, row copy), and the new read count"""
+        written = int(self.header[_WRITTEN])
+        start = max(read, written - min(limit, self.capacity - 1))
+        snapshots = []
+        for index in range(start, written):
+            slot = index % self.capacity
+            seq = self.seq[slot]
+            row = self.rows[slot].copy()
+            stamp = float(self.times[slot])
+            if seq % 2 == 0 and self.seq[slot] == seq:  # Not overwritten while we copied it
+                snapshots.append((stamp, row))
+        return written, snapshots
+
+
+def _interpolate(history: List[Tuple[float, np.ndarray]], at: float, mask: np.ndarray) -> np.ndarray:
+    """The state at time at, between the two snapshots around it (the newest one if at is past it)"""
+    if at >= history[-1][0]:
+        return history[-1][1]
+    if at <= history[0][0]:
+        return history[0][1]
+    for older, newer in zip(history[:-1], history[1:]):
+        if newer[0] >= at:
+            break
+    if newer[1][STEPS] < older[1][STEPS]:
+        return newer[1]  # Across a reset, nothing to blend
+    alpha = (at - older[0]) / max(newer[0] - older[0], 1e-9)
+    return np.where(mask, older[1] + (newer[1] - older[1]) * alpha, newer[1])
+
+
+def _display_loop(ring: SnapshotRing, fps: int) -> None:
+    """Drains the ring and draws at fps until told to stop or the window gets closed"""
+    from slime_api.slimepygame import PygameView
+    import pygame
+    view = PygameView("human", fps=None)
+    clock = pygame.time.Clock()
+    mask = _lerp_mask(ring.num_slimes)
+    state = CompactVolleyballState(ring.num_slimes)
+    history: List[Tuple[float, np.ndarray]] = []
+    interval = 1 / fps  # Estimated time between snapshots, we draw that far in the past so there's a newer one to blend to
+    read = 0
+    try:
+        while not ring.header[_STOP]:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            read, snapshots = ring.read_new(read)
+            for snapshot in snapshots:
+                if history:
+                    interval = 0.9 * interval + 0.1 * min(max(snapshot[0] - history[-1][0], 0.0), 1.0)
+                history.append(snapshot)
+            del history[:-_HISTORY]
+            if history:
+                state.buffer[:] = _interpolate(history, time.monotonic() - interval, mask)
+                view.draw(state)
+            clock.tick(fps)
+    finally:
+        view.close()
+
+
+def _run_on_shared_memory(name: str, capacity: int, num_slimes: int, loop: Callable, args: tuple) -> None:
+    from multiprocessing import shared_memory
+    import traceback
+    memory = shared_memory.SharedMemory(name=name)
+    ring = SnapshotRing(capacity, num_slimes, memory.buf)
+    try:
+        loop(ring, *args)
+    except BaseException as e:
+        traceback.clear_frames(e.__traceback__)  # The frames of loop hold views into the memory too
+        raise
+    finally:
+        del ring  # Drop the views before closing the memory under them, like RingWorker.stop
+        memory.close()
+
+
+class RingWorker:
+    """
+    A SnapshotRing and loop(ring, *args) draining it, in a process with the ring in shared memory, or a thread if
+    use_process is False or this process is a daemon (those can't have children). loop should return once
+    ring.header[_STOP] is set.
+    """
+    def __init__(self, capacity: int, num_slimes: int, loop: Callable, args: tuple = (), use_process: bool = True):
+        # Imported here, the shared memory resource tracker isn't free and most envs never render
+        import multiprocessing
+        from multiprocessing import shared_memory
+        self._memory = None
+        if use_process and not multiprocessing.current_process().daemon:
+            self._memory = shared_memory.SharedMemory(create=True, size=SnapshotRing.nbytes(capacity, num_slimes))
+            self.ring = SnapshotRing(capacity, num_slimes, self._memory.buf)
+            self.ring.header[:] = 0
+            self.ring.seq[:] = 0
+            self.worker = multiprocessing.get_context("spawn").Process(
+                target=_run_on_shared_memory, args=(self._memory.name, capacity, num_slimes, loop, args), daemon=True)
+        else:
+            self.ring = SnapshotRing(capacity, num_slimes)
+            self.worker = threading.Thread(target=loop, args=(self.ring,) + tuple(args), daemon=True)
+        self.worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.ring.header[_STOP] = 1
+        self.worker.join(timeout)
+        if self._memory is not None:
+            self.ring = None  # Drop the views before closing the memory under them
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+
+class AsyncSlimeRenderer(Renderer[VolleyballState]):
+    """
+    Live view that doesn't slow the env down: render() pushes a snapshot and returns, a separate process (a thread if
+    this process is a daemon, those can't have children, or with use_process=False) draws at fps.
+    """
+    def __init__(self, fps: int = 60, capacity: int = 64, use_process: bool = True):
+        self.fps = fps
+        self.capacity = capacity
+        self.use_process = use_process
+        self.ring: Optional[SnapshotRing] = None
+        self._worker: Optional[RingWorker] = None
+
+    def render(self, state: VolleyballState, shared_info: Dict[str, Any]) -> Any:
+        if self.ring is None:
+            self._worker = RingWorker(self.capacity, len(state.slimes), _display_loop, (self.fps,), self.use_process)
+            self.ring = self._worker.ring
+        self.ring.push(state)
+
+    def close(self):
+        if self._worker is not None:
+            self.ring = None
+            self._worker.stop(timeout=2)
+            self._worker = None
@@ -0,0 +1,196 @@
+"""
+Reset-state bank: states pregenerated by the mutators, stored as CompactVolleyballState rows (one .npy per sub-bank),
+so a reset is one row copy instead of a round of sampling. Saved banks get memory-mapped read-only, so every worker
+process shares the same pages.
+
+python -m slime_api.slimebank bank_dir --size 1000000 --seed 0
+"""
+import argparse
+import os
+import threading
+import numpy as np
+from typing import Any, Callable, Dict, Optional
+from slime_api.slimestate import VolleyballState, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE
+from slime_api.slimemutator import BatchedMutator, DropMutator, TossMutator, HardTossMutator
+from rlgym.api import StateMutator
+
+# Same mixture as IndieDevMutator
+INDIEDEV_WEIGHTS = {"drop": 0.2, "toss": 0.5, "hard_toss": 0.3}
+
+
+class StateBank:
+    """Named sub-banks of states, each one an [n, row] f32 array in the CompactVolleyballState layout"""
+    def __init__(self, sub_banks: Dict[str, np.ndarray]):
+        assert sub_banks and all(rows.dtype == np.float32 and rows.ndim == 2 for rows in sub_banks.values())
+        self.sub_banks = sub_banks
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.sub_banks.values())
+
+    @staticmethod
+    def generate(mutators: Dict[str, BatchedMutator], sizes: Dict[str, int]) -> "StateBank":
+        return StateBank({name: mutator.sample(sizes[name]) for name, mutator in mutators.items()})
+
+    def save(self, directory: str) -> None:
+        """One <name>.npy per sub-bank, each written to a temp file and renamed, so readers never see half a bank"""
+        os.makedirs(directory, exist_ok=True)
+        for name, rows in self.sub_banks.items():
+            path = os.path.join(directory, f"{name}.npy")
+            tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, rows)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(directory: str, mmap: bool = True) -> "StateBank":
+        """Loads every .npy in directory, memory-mapped read-only unless mmap is False"""
+        sub_banks = {}
+        for file in sorted(os.listdir(directory)):
+            if file.endswith(".npy") and not file.startswith("."):
+                sub_banks[file[:-4]] = np.load(os.path.join(directory, file), mmap_mode="r" if mmap else None)
+        return StateBank(sub_banks)
+
+
+def indiedev_bank(size: int, seed=None) -> StateBank:
+    """A bank of the IndieDevMutator states, every sub-bank gets its weight's share of size"""
+    seeds = np.random.SeedSequence(seed).spawn(3)
+    mutators = {"drop": DropMutator(seeds[0]), "toss": TossMutator(seeds[1]), "hard_toss": HardTossMutator(seeds[2])}
+    return StateBank.generate(mutators, {name: max(1, int(size * weight)) for name, weight in INDIEDEV_WEIGHTS.items()})
+
+
+class BankMutator(StateMutator[VolleyballState]):
+    """
+    Resets to the next row of a shuffled schedule over the bank, so apply is one row copy and no sampling.
+    The schedule covers epoch_size resets (the bank size by default), picks the sub-banks by weight and goes through
+    each sub-bank in a fresh permutation. It's redrawn when it runs out, one vectorized draw per epoch.
+    The rows get gathered CHUNK_SIZE at a time, so a plain VolleyballState is written from python floats.
+
+    regenerate (like lambda: indiedev_bank(1_000_000), or lambda: StateBank.load(directory) to pick up a bank that
+    another process rewrote) runs in a background thread, the new bank takes over at the next epoch.
+    The whole state gets overwritten, this is meant to be the only reset mutator.
+    """
+    CHUNK_SIZE = 256
+
+    def __init__(
+        self,
+        bank: StateBank,
+        weights: Optional[Dict[str, float]] = None,
+        seed=None,
+        epoch_size: Optional[int] = None,
+        regenerate: Optional[Callable[[], StateBank]] = None
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.weights = weights
+        self.epoch_size = epoch_size
+        self.regenerate = regenerate
+        self.epochs = 0
+        self._next_bank: Optional[StateBank] = None
+        self._worker: Optional[threading.Thread] = None
+        self._chunk_values: list = []
+        self._chunk_next = 0
+        self._use_bank(bank)
+        self._new_epoch()
+
+    def _use_bank(self, bank: StateBank) -> None:
+        self.bank = bank
+        self._names = list(bank.sub_banks)
+        # Plain ndarray views, indexing a memmap goes through its python __array_finalize__ on every row
+        self._arrays = [np.asarray(bank.sub_banks[name]) for name in self._names]
+        self._slime_blocks = range(STATE_HEADER_SIZE, self._arrays[0].shape[1], SLIME_SIZE)
+        weights = np.array([1.0 if self.weights is None else self.weights.get(name, 0.0) for name in self._names])
+        self._probs = weights / weights.sum()
+
+    def _new_epoch(self) -> None:
+        if self._next_bank is not None:
+            self._use_bank(self._next_bank)
+            self._next_bank = None
+        if self.regenerate is not None and (self._worker is None or not self._worker.is_alive()):
+            self._worker = threading.Thread(target=self._regenerate, daemon=True)
+            self._worker.start()
+
+        size = self.epoch_size or len(self.bank)
+        sources = self.rng.choice(len(self._arrays), size=size, p=self._probs)
+        rows = np.empty(size, dtype=np.int64)
+        for idx, array in enumerate(self._arrays):
+            picked = np.flatnonzero(sources == idx)
+            # A permutation of the sub-bank, repeated if the epoch wants more rows than it has
+            rows[picked] = np.resize(self.rng.permutation(len(array)), len(picked))
+        self._sources = sources
+        self._rows = rows
+        self._next = 0
+        self.epochs += 1
+
+    def _regenerate(self) -> None:
+        self._next_bank = self.regenerate()
+
+    def _next_chunk(self) -> None:
+        """Gathers the next CHUNK_SIZE rows of the schedule, and the same rows as python floats for _store"""
+        if self._next >= len(self._rows):
+            self._new_epoch()
+        stop = min(self._next + self.CHUNK_SIZE, len(self._rows))
+        sources = self._sources[self._next:stop]
+        rows = self._rows[self._next:stop]
+        chunk = np.empty((stop - self._next, self._arrays[0].shape[1]), dtype=np.float32)
+        for idx, array in enumerate(self._arrays):
+            picked = sources == idx
+            chunk[picked] = array[rows[picked]]
+        self._chunk = chunk
+        self._chunk_values = chunk.tolist()
+        self._chunk_next = 0
+        self._next = stop
+
+    def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        i = self._chunk_next
+        if i >= len(self._chunk_values):
+            self._next_chunk()
+            i = 0
+        self._chunk_next = i + 1
+
+        if isinstance(state, CompactVolleyballState):
+            state.buffer[:] = self._chunk[i]
+            return
+        self._store(self._chunk_values[i], state)
+
+    def _store(self, values: list, state: VolleyballState) -> None:
+        """
+        Same as CompactVolleyballState.store, but from the row as python floats, element by element:
+        a 3 float slice assignment or a property setter per field costs more than the rest of the reset
+        """
+        for block, slime in zip(self._slime_blocks, state.slimes.values()):
+            px, py, pz, vx, vy, vz, tx, ty, tz, touches_remaining, can_jump, jump_cooldown, touch_cooldown = \
+                values[block:block + SLIME_SIZE]
+            position, velocity, target = slime.position, slime.velocity, slime.target
+            position[0] = px
+            position[1] = py
+            position[2] = pz
+            velocity[0] = vx
+            velocity[1] = vy
+            velocity[2] = vz
+            target[0] = tx
+            target[1] = ty
+            target[2] = tz
+            slime.touches_remaining = touches_remaining
+            slime.can_jump = can_jump != 0
+            slime.jump_cooldown = jump_cooldown
+            slime.touch_cooldown = touch_cooldown
+        bx, by, bz, bvx, bvy, bvz, point_scored, scoring_slime, steps = values[:STATE_HEADER_SIZE]
+        position, velocity = state.ball_position, state.ball_velocity
+        position[0] = bx
+        position[1] = by
+        position[2] = bz
+        velocity[0] = bvx
+        velocity[1] = bvy
+        velocity[2] = bvz
+        state.point_scored = point_scored != 0
+        state.scoring_slime = None if scoring_slime < 0 else int(scoring_slime)
+        state.steps = int(steps)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m slime_api.slimebank", description="Build an IndieDevMutator state bank")
+    parser.add_argument("directory")
+    parser.add_argument("--size", type=int, default=1_000_000, help="States over all the sub-banks")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    bank = indiedev_bank(args.size, args.seed)
+    bank.save(args.directory)
+    print(f"Saved {len(bank)} states ({', '.join(f'{name}: {len(rows)}' for name, rows in bank.sub_banks.items())}) to {args.directory}")
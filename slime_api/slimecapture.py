@@ -0,0 +1,183 @@
+"""
+Episode recording in the background. EpisodeRecorder is a renderer that takes every stride-th render call of every
+every-th episode. render() only copies the state into a SnapshotRing (a few us, drawing a frame costs more than an env
+step), a writer process (a thread in daemon processes) drains it, draws the frames with NumpyRasterizer into a
+preallocated uint8 frame ring of chunk_frames frames and saves every full chunk and every finished episode. If the
+writer falls behind and the ring is full, new frames get dropped (counted in dropped, see stats()) instead of waiting.
+
+An episode starts whenever shared_info["episode"] changes (IndieDevEngine counts its set_state calls there) or after
+reset() was called, for engines that don't count them. steps isn't used, a reset can keep it where it was.
+
+recorder = EpisodeRecorder("recordings", stride=4, every=10)
+RLGym(..., renderer=recorder)
+
+format "npy" saves every chunk as episode_<n>_<part>.npy ([frames, H, W, 3] uint8), "mp4" one episode_<n>.mp4 per
+episode (needs imageio with ffmpeg). n counts recorded episodes. Files get written as <name>.part and only show up
+under their final name once they're complete, so a metrics logger can pick them up from directory (or use
+on_saved(path, n), which gets called in the writer, so it has to be picklable in process mode).
+"""
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+from rlgym.api import Renderer
+from slime_api.slimestate import VolleyballState, CompactVolleyballState
+from slime_api.slimeraster import NumpyRasterizer
+from slime_api.slimeasyncrenderer import RingWorker, SnapshotRing, _WRITTEN, _STOP, _READ, _MARK
+
+_PARTIAL = ".part"  # Added to the final name while a file gets written, so nothing named *.npy or *.mp4 is unfinished
+
+
+class _EpisodeWriter:
+    """The writer side, drawing and saving in the order the frames come in"""
+    def __init__(self, directory: str, view_width: int, chunk_frames: int, format: str, fps: int,
+                 on_saved: Optional[Callable[[str, int], Any]]):
+        self.directory = directory
+        self.format = format
+        self.fps = fps
+        self.on_saved = on_saved
+        self.rasterizer = NumpyRasterizer(view_width)
+        self.frames = np.empty((chunk_frames, self.rasterizer.height, self.rasterizer.width, 3), dtype=np.uint8)
+        self.episode = -1
+        self.count = 0
+        self.part = 0
+        self.video = None
+
+    def add(self, state: CompactVolleyballState) -> None:
+        self.rasterizer.render(state, out=self.frames[self.count])
+        self.count += 1
+        if self.count == len(self.frames):
+            self.flush(last=False)
+
+    def flush(self, last: bool) -> None:
+        """Saves the frames so far, last closes the episode"""
+        name = os.path.join(self.directory, f"episode_{self.episode:06d}")
+        frames = self.frames[:self.count]
+        if self.format == "npy":
+            if self.count:
+                path = f"{name}_{self.part:03d}.npy"
+                with open(path + _PARTIAL, "wb") as f:
+                    np.save(f, frames)
+                self._finish(path)
+        else:
+            if self.video is None:
+                import imageio
+                # The name doesn't end in .mp4 until it's done, so imageio and ffmpeg both get told the format
+                self.video = imageio.get_writer(name + ".mp4" + _PARTIAL, format="FFMPEG", fps=self.fps,
+                                                macro_block_size=1, output_params=["-f", "mp4"])
+            for frame in frames:
+                self.video.append_data(frame)
+            if last:
+                self.video.close()
+                self.video = None
+                self._finish(name + ".mp4")
+        self.count = 0
+        self.part = 0 if last else self.part + 1
+
+    def _finish(self, path: str) -> None:
+        os.replace(path + _PARTIAL, path)
+        if self.on_saved is not None:
+            self.on_saved(path, self.episode)
+
+
+def _write_loop(ring: SnapshotRing, *writer_args) -> None:
+    """Drains every snapshot, every one is stamped with its episode and an episode ends where the stamp changes"""
+    writer = _EpisodeWriter(*writer_args)
+    state = CompactVolleyballState(ring.num_slimes)
+    read = 0
+    episode = -1.0  # Stamp of the open episode, -1 when there's none
+    while True:
+        stop = ring.header[_STOP]
+        over = ring.header[_MARK]  # Read before the rows, so every frame of the episodes it ends is in them
+        read, snapshots = ring.read_new(read, ring.capacity)
+        for stamp, row in snapshots:
+            if stamp != episode:
+                if episode >= 0:
+                    writer.flush(last=True)
+                writer.episode += 1
+                episode = stamp
+            state.buffer[:] = row
+            writer.add(state)
+        ring.header[_READ] = read
+        # Close the episode once it's over, not when the next recorded one starts
+        if episode >= 0 and (stop or episode < over):
+            writer.flush(last=True)
+            episode = -1.0
+        if stop:
+            break
+        if not snapshots:
+            time.sleep(0.01)
+
+
+class EpisodeRecorder(Renderer[VolleyballState]):
+    """Records episodes to directory, an episode ends when shared_info["episode"] changes or reset() gets called"""
+    def __init__(self, directory: str, stride: int = 4, every: int = 10, view_width: int = 160,
+                 chunk_frames: int = 64, capacity: int = 1024, format: str = "npy", fps: int = 15,
+                 on_saved: Optional[Callable[[str, int], Any]] = None, use_process: bool = True):
+        if format not in ("npy", "mp4"):
+            raise ValueError(f"Unknown format {format}, use npy or mp4")
+        if format == "mp4":
+            import imageio  # Fails here instead of in the writer
+        os.makedirs(directory, exist_ok=True)
+        self.stride = stride
+        self.every = every
+        self.capacity = capacity
+        self.use_process = use_process
+        self._writer_args = (directory, view_width, chunk_frames, format, fps, on_saved)
+        self.ring: Optional[SnapshotRing] = None
+        self._worker: Optional[RingWorker] = None
+
+        self.episode = -1
+        self.frames = 0  # Frames handed to the writer
+        self.dropped = 0  # Frames the ring had no room for
+        self._env_episode = None  # shared_info["episode"] of the last render
+        self._reset = True  # The next render starts an episode
+        self._recording = False
+        self._tick = 0
+
+    def reset(self) -> None:
+        """Starts a new episode with the next render, for engines that don't count episodes in shared_info"""
+        self._reset = True
+
+    def stats(self) -> Dict[str, int]:
+        """{"episodes", "frames", "dropped"}, episodes seen so far and frames recorded and dropped"""
+        return {"episodes": self.episode + 1, "frames": self.frames, "dropped": self.dropped}
+
+    def render(self, state: VolleyballState, shared_info: Dict[str, Any]) -> Any:
+        env_episode = shared_info.get("episode", self._env_episode)
+        if self._reset or env_episode != self._env_episode:
+            self._end_episode()
+            self.episode += 1
+            self._recording = self.episode % self.every == 0
+            self._tick = 0
+            self._reset = False
+        self._env_episode = env_episode
+        if not self._recording:
+            return
+        tick = self._tick
+        self._tick += 1
+        if tick % self.stride:
+            return
+
+        if self.ring is None:
+            self._worker = RingWorker(self.capacity, len(state.slimes), _write_loop, self._writer_args,
+                                      self.use_process)
+            self.ring = self._worker.ring
+        header = self.ring.header
+        if header[_WRITTEN] - header[_READ] >= self.capacity - 1:
+            self.dropped += 1
+            return
+        self.ring.push(state, self.episode)
+        self.frames += 1
+
+    def _end_episode(self) -> None:
+        if self._recording and self.ring is not None:
+            self.ring.header[_MARK] = self.episode + 1
+        self._recording = False
+
+    def close(self):
+        """Saves what's left and waits for the writer"""
+        if self._worker is not None:
+            self.ring = None
+            self._worker.stop()
+            self._worker = None
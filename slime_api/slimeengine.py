@@ -4,9 +4,10 @@ from dataclasses import dataclass
 from rlgym.api import TransitionEngine, StateMutator, ObsBuilder, ActionParser, RewardFunction, DoneCondition
 
 
-from slime_api.slimestate import Slime, VolleyballState
+from slime_api.slimestate import Slime, VolleyballState, CompactVolleyballState
 
 from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.profiling import PhaseProfiler
 
 
 
@@ -15,10 +16,15 @@ from slime_api.sim.main_sim import SlimeVolleyballSim
 class IndieDevEngine(TransitionEngine[int, VolleyballState, int]):
     """Handles the core game logic"""
     # def __init__(self, port: int = 5000):
-    def __init__(self):
+    def __init__(self, compact_state: bool = False, tick_skip: int = 6, dt: Optional[float] = None, continuous_collision: bool = False,
+                 profiler: Optional[PhaseProfiler] = None):
+        self.tick_skip = tick_skip  # Sim ticks per env step, the actions are repeated for all of them
+        self.compact_state = compact_state  # Use CompactVolleyballState, one f32 buffer per state
         self._slimes = {}  # These will contain THE slimes from THE SIM
-        self._arena = SlimeVolleyballSim(self.create_base_state())
+        # A bigger dt wants a smaller tick_skip to keep the same env step length, see SlimeVolleyballSim
+        self._arena = SlimeVolleyballSim(self.create_base_state(), dt=dt, continuous_collision=continuous_collision, profiler=profiler)
         self._state = self._arena.get_state()
+        self._episodes = 0  # set_state calls so far, put in shared_info["episode"]
 
     @property
     def agents(self) -> List[int]:
@@ -46,20 +52,34 @@ class IndieDevEngine(TransitionEngine[int, VolleyballState, int]):
         self._config = value
 
     def set_state(self, desired_state: VolleyballState, shared_info: Dict[str, Any]) -> VolleyballState:
-        self._state = desired_state
-        self._arena.set_state(self._state)
+        # The sim copies it into its own state, that's the one we hand out from now on
+        self._arena.set_state(desired_state)
+        self._state = self._arena.get_state()
+        # A new episode, renderers like EpisodeRecorder tell them apart by this (steps can start where the last one did)
+        self._episodes += 1
+        shared_info["episode"] = self._episodes
 
         return self._state
 
     def step(self, actions: Dict[int, int], shared_info: Dict[str, Any]) -> VolleyballState:
-        self._state = self._arena.step_game(actions, 6)
-        self._state.steps += 6
+        # step_game runs all the ticks in one loop and counts them in state.steps
+        self._state = self._arena.step_game(actions, self.tick_skip)
         #print(f"Engine step with actions: {actions}")
         #print(f"Engine step with state: {self._state}")
         return self._state
 
+    def snapshot(self) -> int:
+        """Saves the current state in the sim's snapshot ring, see SlimeVolleyballSim.snapshot"""
+        return self._arena.snapshot()
+
+    def restore(self, handle: int) -> VolleyballState:
+        self._state = self._arena.restore(handle)
+        return self._state
+
     def create_base_state(self) -> VolleyballState:
         # Create a minimal state for the mutator to modify
+        if self.compact_state:
+            return CompactVolleyballState()
         return VolleyballState({0: Slime(np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), 3, False, 0, 0),
                                 1: Slime(np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32), 3, False, 0, 0)},
                                 np.zeros(3, dtype=np.float32),
@@ -69,8 +89,8 @@ class IndieDevEngine(TransitionEngine[int, VolleyballState, int]):
 
     def reset(self, initial_state: Optional[VolleyballState] = None) -> None:
         """Reset the engine with an optional initial state"""
-        self._state = initial_state if initial_state is not None else self.create_base_state()
-        self._arena.set_state(self._state)
+        self._arena.set_state(initial_state if initial_state is not None else self.create_base_state())
+        self._state = self._arena.get_state()
         #print(f"Engine reset with state: {self._state}")
 
     def close(self) -> None:
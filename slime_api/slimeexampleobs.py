@@ -1,13 +1,51 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import numpy as np
-from slime_api.slimestate import Slime, VolleyballState
+from slime_api.slimestate import Slime, VolleyballState, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE
 from rlgym.api import ObsBuilder
 
+BALL_OBS_SIZE = 6
+SLIME_OBS_SIZE = 8
+
+# Where each obs value comes from in a CompactVolleyballState buffer
+# Ball: position, velocity
+BALL_OBS_INDICES = np.array([0, 1, 2, 3, 4, 5])
+# Slime: X, Z position and velocity, Y velocity, Y position, touches remaining, can_jump (offsets in the slime block)
+SLIME_OBS_INDICES = np.array([0, 2, 3, 5, 4, 1, 9, 10])
+# Multiplied by the side sign (X and Z get mirrored), and the scale for the rest (touches get normalized)
+BALL_OBS_MIRRORED = np.array([True, False, True, True, False, True])
+SLIME_OBS_MIRRORED = np.array([True, True, True, True, False, False, False, False])
+SLIME_OBS_SCALE = np.array([1, 1, 1, 1, 1, 1, 1 / 3, 1], dtype=np.float32)
+
+
+class _BatchScratch:
+    """What build_obs_batch needs besides out, made once per (n_arenas, n)"""
+    def __init__(self, n_arenas: int, n: int, obs_dim: int):
+        # Row i: the slimes agent i sees, itself first, then the others
+        self.order = np.array([[i] + [j for j in range(n) if j != i] for i in range(n)])
+        self.slimes = np.empty((n_arenas, n, SLIME_OBS_SIZE), dtype=np.float32)
+        self.ordered = np.empty((n_arenas, n, n, SLIME_OBS_SIZE), dtype=np.float32)
+        self.started_on_right = np.empty((n_arenas, n), dtype=bool)
+        self.signs = np.empty((n_arenas, n), dtype=np.float32)
+        self.multiplier = np.empty((n_arenas, n, obs_dim), dtype=np.float32)
+
+
 class IndieDevDefaultObs(ObsBuilder[int, np.ndarray, VolleyballState, np.ndarray]):
-    """Converts state into agent observations with fixed side inversion"""
+    """
+    Converts state into agent observations with fixed side inversion.
+    Every agent sees the ball, then itself, then the other agents: 6 + 8 per slime values.
+    The values are gathered into one [n_agents, obs_dim] scratch buffer and scaled/mirrored with one multiply into a
+    new array, the obs of every agent are rows of it (they stay valid after the next build_obs).
+    """
+    def __init__(self, num_slimes: int = 2):
+        self.num_slimes = num_slimes
+        self.obs_dim = BALL_OBS_SIZE + SLIME_OBS_SIZE * num_slimes
+        self._mirrored = np.concatenate([BALL_OBS_MIRRORED, np.tile(SLIME_OBS_MIRRORED, num_slimes)])
+        self._scale = np.concatenate([np.ones(BALL_OBS_SIZE, dtype=np.float32), np.tile(SLIME_OBS_SCALE, num_slimes)])
+        self._mirrored_f32 = self._mirrored.astype(np.float32)
+        self._batch_scratch: Dict[tuple, _BatchScratch] = {}  # (n_arenas, n) -> buffers build_obs_batch reuses
+
     def get_obs_space(self, agent: int) -> np.ndarray:
-        # Adaptable observation size
-        return 'real', -1
+        return 'real', self.obs_dim
 
     def reset(self, agents: List[int], initial_state: VolleyballState, shared_info: Dict[str, Any]) -> None:
         # Determine starting side for each agent
@@ -16,60 +54,83 @@ class IndieDevDefaultObs(ObsBuilder[int, np.ndarray, VolleyballState, np.ndarray
             for agent in agents
         }
         self._state = initial_state
+        n = len(agents)
+        assert n == self.num_slimes, f"IndieDevDefaultObs was built for {self.num_slimes} slimes, got {n} agents"
 
-    def build_obs(self, agents: List[int], state: VolleyballState, shared_info: Dict[str, Any]) -> Dict[int, np.ndarray]:
-        observations = {}
-        for host_agent in agents:
-            # Use fixed flag instead of dynamic position
-            invert = self.started_on_right[host_agent]
-            obs = np.array([], dtype=np.float32)
+        signs = np.where([self.started_on_right[agent] for agent in agents], -1, 1)
+        # Row i: multiplier for every obs value of agent i, sign where mirrored, scale everywhere
+        self._multiplier = np.where(self._mirrored, signs[:, None], 1).astype(np.float32) * self._scale
+        # Row i: the slimes agent i sees, itself first, then the others in agents order
+        self._order = np.array([[i] + [j for j in range(n) if j != i] for i in range(n)])
+        # The agent index of every slime, and where its values sit in a compact buffer
+        self._agents = list(agents)
+        self._compact_indices = np.array([STATE_HEADER_SIZE + SLIME_SIZE * agent + SLIME_OBS_INDICES for agent in agents])
 
-            # Ball position and velocity
-            if invert:
-                ball_pos_x = -state.ball_position[0]
-                ball_pos_z = -state.ball_position[2]
-                ball_vel_x = -state.ball_velocity[0]
-                ball_vel_z = -state.ball_velocity[2]
-            else:
-                ball_pos_x = state.ball_position[0]
-                ball_pos_z = state.ball_position[2]
-                ball_vel_x = state.ball_velocity[0]
-                ball_vel_z = state.ball_velocity[2]
+        self._buffer = np.zeros((n, self.obs_dim), dtype=np.float32)
+        self._ball_view = self._buffer[:, :BALL_OBS_SIZE]
+        self._slime_view = self._buffer[:, BALL_OBS_SIZE:].reshape(n, n, SLIME_OBS_SIZE)
+        self._ball = np.zeros(BALL_OBS_SIZE, dtype=np.float32)
+        self._slimes = np.zeros((n, SLIME_OBS_SIZE), dtype=np.float32)
 
-            obs = np.append(obs, [ball_pos_x,
-                                  state.ball_position[1],
-                                  ball_pos_z,
-                                  ball_vel_x,
-                                  state.ball_velocity[1],
-                                  ball_vel_z])
-
-            # Self observation
-            obs = np.append(obs, self._build_obs_for_agent(host_agent, state, invert))
-
-            # Other agent(s)
-            for agent in agents:
-                if agent == host_agent:
-                    continue
-                obs = np.append(obs, self._build_obs_for_agent(agent, state, invert))
-
-            observations[host_agent] = obs
-        return observations
+    def build_obs(self, agents: List[int], state: VolleyballState, shared_info: Dict[str, Any]) -> Dict[int, np.ndarray]:
+        ball, slimes = self._ball, self._slimes
+        if isinstance(state, CompactVolleyballState):
+            np.take(state.buffer, BALL_OBS_INDICES, out=ball)
+            np.take(state.buffer, self._compact_indices, out=slimes)
+        else:
+            ball[:3] = state.ball_position
+            ball[3:] = state.ball_velocity
+            for i, agent in enumerate(self._agents):
+                slime = state.slimes[agent]
+                row = slimes[i]
+                row[0] = slime.position[0]
+                row[1] = slime.position[2]
+                row[2] = slime.velocity[0]
+                row[3] = slime.velocity[2]
+                row[4] = slime.velocity[1]
+                row[5] = slime.position[1]
+                row[6] = slime.touches_remaining
+                row[7] = slime.can_jump
 
-    def _build_obs_for_agent(self, agent: int, state: VolleyballState, invert: bool) -> np.ndarray:
-        data = []
-        pos = state.slimes[agent].position
-        vel = state.slimes[agent].velocity
+        self._ball_view[:] = ball
+        self._slime_view[:] = slimes[self._order]
+        # A new array every call, rollout buffers keep the obs around
+        obs = self._buffer * self._multiplier
+        return {agent: obs[i] for i, agent in enumerate(self._agents)}
 
-        # X, Z position and velocity
-        if invert:
-            data.extend([-pos[0], -pos[2], -vel[0], -vel[2]])
-        else:
-            data.extend([pos[0], pos[2], vel[0], vel[2]])
+    def build_obs_batch(self, sim, started_on_right: Optional[np.ndarray] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Obs for every arena of a BatchedSlimeVolleyballSim (or anything with its arrays), [num_arenas, num_slimes, obs_dim]
+        with agent i being slime i. started_on_right is [num_arenas, num_slimes], the current sides if None.
+        Pass out to reuse a buffer.
+        """
+        n_arenas, n = sim.slime_position.shape[:2]
+        if out is None:
+            out = np.empty((n_arenas, n, self.obs_dim), dtype=np.float32)
+        scratch = self._batch_scratch.get((n_arenas, n))
+        if scratch is None:
+            scratch = self._batch_scratch[(n_arenas, n)] = _BatchScratch(n_arenas, n, self.obs_dim)
+        if started_on_right is None:
+            started_on_right = np.greater(sim.slime_position[:, :, 0], 0, out=scratch.started_on_right)
 
-        # Y velocity, Y position, normalized touches, can_jump
-        data.append(vel[1])
-        data.append(pos[1])
-        data.append(state.slimes[agent].touches_remaining / 3)
-        data.append(float(state.slimes[agent].can_jump))
+        slimes = scratch.slimes
+        slimes[:, :, 0:2] = sim.slime_position[:, :, ::2]
+        slimes[:, :, 2:4] = sim.slime_velocity[:, :, ::2]
+        slimes[:, :, 4] = sim.slime_velocity[:, :, 1]
+        slimes[:, :, 5] = sim.slime_position[:, :, 1]
+        slimes[:, :, 6] = sim.touches_remaining
+        slimes[:, :, 7] = sim.can_jump
 
-        return np.array(data, dtype=np.float32)
+        out[:, :, :3] = sim.ball_position[:, None]
+        out[:, :, 3:BALL_OBS_SIZE] = sim.ball_velocity[:, None]
+        np.take(slimes, scratch.order, axis=1, out=scratch.ordered, mode="clip")  # "raise" buffers out
+        out[:, :, BALL_OBS_SIZE:] = scratch.ordered.reshape(n_arenas, n, -1)
+        # 1 + mirrored * (sign - 1), sign - 1 being -2 on the right and 0 on the left
+        multiplier = scratch.multiplier
+        np.copyto(scratch.signs, started_on_right)
+        scratch.signs *= -2
+        np.multiply(scratch.signs[..., None], self._mirrored_f32, out=multiplier)
+        multiplier += 1
+        multiplier *= self._scale
+        out *= multiplier
+        return out
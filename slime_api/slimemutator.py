@@ -1,129 +1,167 @@
-from typing import Dict, Any, Sequence, Tuple
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, Sequence, Tuple
 import numpy as np
-from slime_api.slimestate import VolleyballState
+from slime_api.slimestate import VolleyballState, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE, \
+    SLIME_POSITION, BALL_POSITION, BALL_VELOCITY
 from rlgym.api import StateMutator
 
 from slime_api.common_values import *
 
 
+def _slime_block(sid: int) -> int:
+    # Where slime sid starts in a CompactVolleyballState row
+    return STATE_HEADER_SIZE + SLIME_SIZE * sid
+
+
+class BatchedMutator(StateMutator[VolleyballState], ABC):
+    """
+    Base for mutators that draw their states in batches from their own generator. sample(n) returns n states as
+    rows of the CompactVolleyballState layout in one vectorized draw, apply just writes the next row of a cached batch.
+    """
+    BALL_VELOCITY_AXES = slice(0, 3)  # The ball velocity components apply writes, the rest stay as they were
+
+    def __init__(self, seed=None, batch_size: int = 256, num_slimes: int = 2):
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.num_slimes = num_slimes
+        self._batch: Optional[np.ndarray] = None
+        self._next = 0
+
+    def base_rows(self, n: int) -> np.ndarray:
+        """n copies of a fresh state (what IndieDevEngine.create_base_state gives), to fill in"""
+        return np.tile(CompactVolleyballState(self.num_slimes).buffer, (n, 1))
+
+    @abstractmethod
+    def sample(self, n: int) -> np.ndarray:
+        """n new states as rows of the CompactVolleyballState layout, drawn from self.rng"""
+
+    def write(self, row: np.ndarray, state: VolleyballState) -> None:
+        """Writes the parts of a sampled row this mutator sets into state, the same fields the old apply set"""
+        for i, slime in enumerate(state.slimes.values()):
+            block = _slime_block(i)
+            slime.position[:] = row[block + SLIME_POSITION.start:block + SLIME_POSITION.stop]
+            slime.touches_remaining = 3
+        state.ball_position[:] = row[BALL_POSITION]
+        state.ball_velocity[self.BALL_VELOCITY_AXES] = row[BALL_VELOCITY][self.BALL_VELOCITY_AXES]
+
+    def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        if self._batch is None or self._next >= len(self._batch):
+            self._batch = self.sample(self.batch_size)
+            self._next = 0
+        self.write(self._batch[self._next], state)
+        self._next += 1
+
+
 class WeightedMutator(StateMutator[VolleyballState]):
     """Controls environment reset and state modifications"""
-    def __init__(self, mutators: Sequence[StateMutator], weights: Sequence[float]):
+    def __init__(self, mutators: Sequence[StateMutator], weights: Sequence[float], seed=None, batch_size: int = 256):
         assert len(mutators) == len(weights)
         self.mutators = mutators
         weights = np.array(weights)
         self.probs = weights / weights.sum()
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self._choices: Optional[np.ndarray] = None
+        self._rows: Optional[np.ndarray] = None
+        self._next = 0
 
     @staticmethod
-    def from_zipped(*mutator_weights: Tuple[StateMutator, float]):
+    def from_zipped(*mutator_weights: Tuple[StateMutator, float], seed=None, batch_size: int = 256):
+        """WeightedMutator.from_zipped((DropMutator(), 0.2), (TossMutator(), 0.8), seed=0), seed only picks the mutator"""
         mutators, weights = zip(*mutator_weights)
-        return WeightedMutator(mutators, weights)
+        return WeightedMutator(mutators, weights, seed, batch_size)
+
+    def sample_with_choices(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        n states and which mutator made each one. Mutators that can't sample (not BatchedMutator) leave NaN rows,
+        apply falls back to their own apply for those.
+        """
+        choices = self.rng.choice(len(self.mutators), size=n, p=self.probs)
+        rows = None
+        for idx, mutator in enumerate(self.mutators):
+            picked = np.flatnonzero(choices == idx)
+            if not isinstance(mutator, BatchedMutator):
+                continue
+            if rows is None:
+                rows = np.full((n, mutator.base_rows(1).shape[1]), np.nan, dtype=np.float32)
+            if len(picked):
+                rows[picked] = mutator.sample(len(picked))
+        return rows, choices
+
+    def sample(self, n: int) -> np.ndarray:
+        """n states drawn from the mixture, as CompactVolleyballState rows"""
+        if not all(isinstance(mutator, BatchedMutator) for mutator in self.mutators):
+            raise TypeError("Every mutator of the mixture has to be a BatchedMutator to sample from it")
+        return self.sample_with_choices(n)[0]
 
     def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
-        idx = np.random.choice(len(self.mutators), p=self.probs)
-        mutator = self.mutators[idx]
-        mutator.apply(state, shared_info)
+        if self._choices is None or self._next >= len(self._choices):
+            self._rows, self._choices = self.sample_with_choices(self.batch_size)
+            self._next = 0
+        mutator = self.mutators[self._choices[self._next]]
+        if isinstance(mutator, BatchedMutator):
+            mutator.write(self._rows[self._next], state)
+        else:
+            mutator.apply(state, shared_info)
+        self._next += 1
 
 class IndieDevMutator(WeightedMutator):
-    def __init__(self):
-        super().__init__([DropMutator(), TossMutator(), HardTossMutator()], [0.2, 0.5, 0.3])
-
-class DropMutator(StateMutator[VolleyballState]):
-    def __init__(self):
-        pass
-
-    def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
-        # Random agent and target positions
-        is_first_slime = True
-        for slime_id in state.slimes:
-            slime = state.slimes[slime_id]
-            if is_first_slime:
-                # Normal slime, X value must be positive, and Y will be 1
-                slime.position[0] = np.random.uniform(0.26, 6)
-                slime.position[1] = 1
-                slime.position[2] = np.random.uniform(-3, 3)
-                slime.touches_remaining = 3
-            else:
-                # just the same, excpet X
-                slime.position[0] = np.random.uniform(-6, -0.26)
-                slime.position[1] = 1
-                slime.position[2] = np.random.uniform(-3, 3)
-                slime.touches_remaining = 3
-
-            is_first_slime = not is_first_slime
-
-        state.ball_position[0] = np.random.uniform(-3, 3)
-        state.ball_position[1] = np.random.uniform(2, 4)
-        state.ball_position[2] = np.random.uniform(-1, 1)
+    def __init__(self, seed=None, batch_size: int = 256):
+        # One independent stream per mutator, all from the same seed
+        seeds = np.random.SeedSequence(seed).spawn(4)
+        super().__init__([DropMutator(seeds[0], batch_size), TossMutator(seeds[1], batch_size), HardTossMutator(seeds[2], batch_size)],
+                         [0.2, 0.5, 0.3], seeds[3], batch_size)
+
+class DropMutator(BatchedMutator):
+    BALL_VELOCITY_AXES = slice(1, 3)  # X velocity is left alone
+
+    def sample(self, n: int) -> np.ndarray:
+        rng = self.rng
+        rows = self.base_rows(n)
+        # Random agent and target positions, first slime on the positive X side, the next one on the other and so on
+        for i in range(self.num_slimes):
+            block = _slime_block(i)
+            # Normal slime, X value must be positive, and Y will be 1
+            rows[:, block] = rng.uniform(0.26, 6, n) if i % 2 == 0 else rng.uniform(-6, -0.26, n)
+            rows[:, block + 1] = 1
+            rows[:, block + 2] = rng.uniform(-3, 3, n)
 
         # X should be -5 to -4, and 4 to 5
-        if np.random.uniform(0, 1) < 0.5:
-            state.ball_position[0] = np.random.uniform(-5, -4)
-        else:
-            state.ball_position[0] = np.random.uniform(4, 5)
-        state.ball_velocity[1] = np.random.uniform(-1, 3)
-        state.ball_velocity[2] = np.random.uniform(-2, 2)
-
-class TossMutator(StateMutator[VolleyballState]):
-    def __init__(self):
-        pass
-
-    def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        rows[:, BALL_POSITION] = np.column_stack([
+            np.where(rng.uniform(0, 1, n) < 0.5, rng.uniform(-5, -4, n), rng.uniform(4, 5, n)),
+            rng.uniform(2, 4, n),
+            rng.uniform(-1, 1, n),
+        ])
+        rows[:, BALL_VELOCITY.start + 1] = rng.uniform(-1, 3, n)
+        rows[:, BALL_VELOCITY.start + 2] = rng.uniform(-2, 2, n)
+        return rows
+
+class TossMutator(BatchedMutator):
+    def sample(self, n: int) -> np.ndarray:
         # Follows the game's true toss function
-        is_first_slime = True
-        for slime_id in state.slimes:
-            slime = state.slimes[slime_id]
-            if is_first_slime:
-                slime.position[0] = 3
-                slime.position[1] = 0
-                slime.position[2] = 0
-                slime.touches_remaining = 3
-            else:
-                slime.position[0] = -3
-                slime.position[1] = 0
-                slime.position[2] = 0
-                slime.touches_remaining = 3
-
-            is_first_slime = not is_first_slime
-
-        state.ball_position[0] = 0
-        state.ball_position[1] = 3
-        state.ball_position[2] = 0
-
-        state.ball_velocity[0] = np.random.choice([-1, 1])
-        state.ball_velocity[1] = 1
-        state.ball_velocity[2] = np.random.uniform(-0.5, 0.5)
-        state.ball_velocity = state.ball_velocity * 7 / np.linalg.norm(state.ball_velocity)
-
-class HardTossMutator(StateMutator[VolleyballState]):
-    def __init__(self):
-        pass
-
-    def apply(self, state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        rng = self.rng
+        rows = self.base_rows(n)
+        for i in range(self.num_slimes):
+            rows[:, _slime_block(i)] = 3 if i % 2 == 0 else -3
+
+        rows[:, BALL_POSITION.start + 1] = 3
+        velocity = np.column_stack([rng.choice([-1, 1], n), np.ones(n), rng.uniform(-0.5, 0.5, n)])
+        rows[:, BALL_VELOCITY] = velocity * 7 / np.linalg.norm(velocity, axis=1, keepdims=True)
+        return rows
+
+class HardTossMutator(BatchedMutator):
+    def sample(self, n: int) -> np.ndarray:
         # Tosses the ball from the other side of the net
-        is_first_slime = True
-        for slime_id in state.slimes:
-            slime = state.slimes[slime_id]
-            if is_first_slime:
-                slime.position[0] = np.random.uniform(0.26, 6)
-                slime.position[1] = 1
-                slime.position[2] = np.random.uniform(-3, 3)
-                slime.touches_remaining = 3
-            else:
-                slime.position[0] = np.random.uniform(-6, -0.26)
-                slime.position[1] = 1
-                slime.position[2] = np.random.uniform(-3, 3)
-                slime.touches_remaining = 3
-
-            is_first_slime = not is_first_slime
-
-        state.ball_velocity[0] = np.random.choice([-1, 1])
-        state.ball_velocity[1] = np.random.uniform(1, 4)
-        state.ball_velocity[2] = np.random.uniform(-0.5, 0.5)
-
-        state.ball_position[0] = np.random.uniform(1, 5) * -state.ball_velocity[0]
-        state.ball_position[1] = 2
-        state.ball_position[2] = 0
-
-        state.ball_velocity = state.ball_velocity * np.random.uniform(7, 24) / np.linalg.norm(state.ball_velocity)
-
+        rng = self.rng
+        rows = self.base_rows(n)
+        for i in range(self.num_slimes):
+            block = _slime_block(i)
+            rows[:, block] = rng.uniform(0.26, 6, n) if i % 2 == 0 else rng.uniform(-6, -0.26, n)
+            rows[:, block + 1] = 1
+            rows[:, block + 2] = rng.uniform(-3, 3, n)
+
+        velocity = np.column_stack([rng.choice([-1, 1], n), rng.uniform(1, 4, n), rng.uniform(-0.5, 0.5, n)])
+        rows[:, BALL_POSITION.start] = rng.uniform(1, 5, n) * -velocity[:, 0]
+        rows[:, BALL_POSITION.start + 1] = 2
+        rows[:, BALL_VELOCITY] = velocity * (rng.uniform(7, 24, n) / np.linalg.norm(velocity, axis=1))[:, None]
+        return rows
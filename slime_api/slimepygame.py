@@ -0,0 +1,179 @@
+"""
+The pygame drawing shared by SlimeRenderer and SlimeVolleyballSim.render. The layout, the labels and everything that
+never moves (court, floor, net, center lines) get drawn once into a background surface, a frame is that background
+blitted plus the slimes and the ball on top.
+"""
+from typing import Optional
+import numpy as np
+import pygame
+from slime_api.slimestate import VolleyballState
+from slime_api.common_values import *
+
+
+class PygameView:
+    """Side view over top view. render_mode "human" draws into a window, "rgb_array" returns the frame"""
+    def __init__(self, render_mode: str, fps: Optional[int] = 60):
+        self.render_mode = render_mode
+        self.fps = fps  # Human mode waits to stay under this, None to draw as fast as possible
+        self.padding = 50
+
+        # Compute aspect ratios for the views based on stage dimensions
+        self.side_aspect = (STAGE_RADIUS[0] * 2) / (NET_HEIGHT_FLT * 8 * 0.8)  # width / height (scaled similarly to to_screen)
+        self.top_aspect = (STAGE_RADIUS[0] * 2) / (STAGE_RADIUS[1] * 2)      # width / height
+
+        # Target width for views (max width to fit window comfortably)
+        self.target_width = 700
+
+        # Compute heights preserving aspect ratios
+        self.side_height = int(self.target_width / self.side_aspect)
+        self.top_height = int(self.target_width / self.top_aspect)
+
+        # Total window height (two views stacked + padding in between and top/bottom)
+        self.window_width = self.target_width + self.padding * 2
+        self.window_height = self.side_height + self.top_height + self.padding * 3  # extra padding for spacing
+
+        self.side_rect = pygame.Rect(self.padding, self.padding, self.target_width, self.side_height)
+        self.top_rect = pygame.Rect(self.padding, self.side_height + self.padding * 2, self.target_width, self.top_height)
+
+        if render_mode == "human":
+            pygame.init()
+            self.canvas = pygame.display.set_mode((self.window_width, self.window_height))
+            pygame.display.set_caption("Slime Volleyball - Side and Top Views")
+            self.clock = pygame.time.Clock()
+        else:
+            pygame.font.init()
+            self.canvas = pygame.Surface((self.window_width, self.window_height))
+            self.clock = None
+        self.font = pygame.font.SysFont("Arial", 24)
+        self.background = self._draw_background()
+
+    def _draw_background(self) -> pygame.Surface:
+        background = pygame.Surface((self.window_width, self.window_height))
+        background.fill((20, 20, 35))  # Dark blue background
+
+        # Draw view labels centered horizontally
+        label_side = self.font.render("Side View (X-Y Plane)", True, (255, 255, 255))
+        label_top = self.font.render("Top View (X-Z Plane)", True, (255, 255, 255))
+        background.blit(label_side, ((self.window_width - label_side.get_width()) // 2, self.padding // 2))
+        background.blit(label_top, ((self.window_width - label_top.get_width()) // 2, self.side_height + self.padding * 2))
+
+        # Side view: court outline, floor, net, center line
+        rect = self.side_rect
+        pygame.draw.rect(background, (30, 30, 50), rect)
+        pygame.draw.rect(background, (200, 200, 200), rect, 2)
+        floor_y = self._side(-STAGE_RADIUS[0], 0)[1]
+        pygame.draw.line(background, (80, 180, 80), (rect.left, floor_y), (rect.right, floor_y), 3)
+        pygame.draw.line(background, (220, 20, 60), self._side(0, 0), self._side(0, NET_HEIGHT_FLT), 4)
+        pygame.draw.line(background, (100, 100, 150), self._side(0, 0), self._side(0, NET_HEIGHT_FLT*2.5), 1)
+
+        # Top view: court outline, net, center line
+        rect = self.top_rect
+        pygame.draw.rect(background, (30, 30, 50), rect)
+        pygame.draw.rect(background, (200, 200, 200), rect, 2)
+        net_left = self._top(-NET_HALF_THICKNESS, -STAGE_RADIUS[1])
+        net_right = self._top(NET_HALF_THICKNESS, STAGE_RADIUS[1])
+        pygame.draw.rect(background, (220, 20, 60), (net_left[0], rect.top, net_right[0]-net_left[0], rect.height))
+        pygame.draw.line(background, (100, 100, 150), self._top(0, -STAGE_RADIUS[1]), self._top(0, STAGE_RADIUS[1]), 1)
+        return background
+
+    # Convert game coords to screen coords
+    def _side(self, x, y):
+        rect = self.side_rect
+        screen_x = rect.left + (x + STAGE_RADIUS[0]) / (STAGE_RADIUS[0] * 2) * rect.width
+        screen_y = rect.bottom - y / (NET_HEIGHT_FLT*3) * rect.height * 0.8
+        return (int(screen_x), int(screen_y))
+
+    def _top(self, x, z):
+        rect = self.top_rect
+        screen_x = rect.left + (x + STAGE_RADIUS[0]) / (STAGE_RADIUS[0] * 2) * rect.width
+        screen_z = rect.bottom - (z + STAGE_RADIUS[1]) / (STAGE_RADIUS[1] * 2) * rect.height
+        return (int(screen_x), int(screen_z))
+
+    def draw(self, state: VolleyballState) -> Optional[np.ndarray]:
+        """Draws state, returns the [height, width, 3] frame in rgb_array mode"""
+        canvas = self.canvas
+        canvas.blit(self.background, (0, 0))
+        # The side view used to get covered by the top view background, keep it out of there
+        canvas.set_clip(pygame.Rect(0, 0, self.window_width, self.top_rect.top))
+        self._draw_side_view(canvas, state)
+        canvas.set_clip(None)
+        self._draw_top_view(canvas, state)
+
+        if self.render_mode == "human":
+            pygame.event.pump()
+            pygame.display.update()
+            if self.fps:
+                self.clock.tick(self.fps)
+        elif self.render_mode == "rgb_array":
+            # Already row major, no transpose copy like with surfarray
+            return np.frombuffer(pygame.image.tobytes(canvas, "RGB"), dtype=np.uint8).reshape(self.window_height, self.window_width, 3)
+
+    def _draw_side_view(self, surface, state: VolleyballState):
+        rect = self.side_rect
+
+        # Draw slimes
+        for sid, slime in state.slimes.items():
+            pos = self._side(slime.position[0], slime.position[1])
+            radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.5)
+            color = (0, 150, 255) if sid == 0 else (50, 255, 100)
+            pygame.draw.circle(surface, color, pos, radius)
+            pygame.draw.circle(surface, (255, 255, 255), pos, radius, 2)
+
+            # Draw jump status
+            if slime.jump_cooldown > 0:
+                jump_pos = (pos[0], pos[1] - radius - 10)
+                pygame.draw.circle(surface, (255, 215, 0), jump_pos, 5)
+
+            # Draw movement target
+            target_radius = radius / 5
+            target_pos = self._side(slime.target[0], slime.target[1])
+            pygame.draw.circle(surface, color, target_pos, target_radius)
+
+        # Draw ball
+        ball_pos = self._side(state.ball_position[0], state.ball_position[1])
+        ball_radius = int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 2)
+        pygame.draw.circle(surface, (255, 255, 255), ball_pos, ball_radius)
+        pygame.draw.circle(surface, (200, 30, 30), ball_pos, ball_radius, 2)
+
+    def _draw_top_view(self, surface, state: VolleyballState):
+        rect = self.top_rect
+
+        # Draw slimes
+        for sid, slime in state.slimes.items():
+            pos = self._top(slime.position[0], slime.position[2])
+            radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.2)
+            color = (0, 150, 255) if sid == 0 else (50, 255, 100)
+            pygame.draw.circle(surface, color, pos, radius)
+            pygame.draw.circle(surface, (255, 255, 255), pos, radius, 2)
+
+            # Draw movement direction
+            if np.linalg.norm(slime.velocity) > 0.1:
+                end_pos = (
+                    pos[0] + int(slime.velocity[0] * 10),
+                    pos[1] - int(slime.velocity[2] * 10)
+                )
+                pygame.draw.line(surface, (255, 255, 0), pos, end_pos, 2)
+
+            # Draw movement target
+            target_radius = SLIME_RADIUS / 3
+            target_pos = self._top(slime.target[0], slime.target[2])
+            pygame.draw.circle(surface, color, target_pos, target_radius)
+
+        # Draw ball
+        ball_pos = self._top(state.ball_position[0], state.ball_position[2])
+        ball_radius = int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * rect.width * 1.5)
+        pygame.draw.circle(surface, (255, 255, 255), ball_pos, ball_radius)
+        pygame.draw.circle(surface, (200, 30, 30), ball_pos, ball_radius, 2)
+
+        # Draw velocity vector
+        if np.linalg.norm(state.ball_velocity) > 0.1:
+            end_pos = (
+                ball_pos[0] + int(state.ball_velocity[0] * 8),
+                ball_pos[1] - int(state.ball_velocity[2] * 8)
+            )
+            pygame.draw.line(surface, (255, 100, 100), ball_pos, end_pos, 3)
+
+    def close(self):
+        if self.render_mode == "human":
+            pygame.display.quit()
+            pygame.quit()
@@ -0,0 +1,239 @@
+"""
+Headless renderer: the side and top views of SlimeRenderer drawn with numpy straight into a preallocated uint8
+[height, width, 3] frame, no pygame, no window and no fonts (so no view labels). The static parts (court, floor, net,
+center lines) are drawn once, every frame starts as a copy of them. Small frames are the point, 160 wide is the default.
+
+raster = NumpyRasterizer(160)
+frame = raster.render(state)                  # [H, W, 3] uint8, reused by the next call
+grid = raster.render_batch(states, cols=4)    # Many envs tiled into one frame
+grid = raster.render_sim(batched_sim)         # Every arena of a BatchedSlimeVolleyballSim
+"""
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from slime_api.slimestate import VolleyballState
+from slime_api.common_values import *
+
+# Same colors as the pygame renderers
+BACKGROUND = (20, 20, 35)
+COURT = (30, 30, 50)
+OUTLINE = (200, 200, 200)
+FLOOR = (80, 180, 80)
+NET = (220, 20, 60)
+CENTER_LINE = (100, 100, 150)
+SLIME_COLORS = ((0, 150, 255), (50, 255, 100))
+WHITE = (255, 255, 255)
+JUMP = (255, 215, 0)
+BALL_OUTLINE = (200, 30, 30)
+SLIME_VELOCITY = (255, 255, 0)
+BALL_VELOCITY_COLOR = (255, 100, 100)
+
+REFERENCE_WIDTH = 700  # View width of the pygame renderers, sizes in pixels below are scaled from it
+
+
+def _fill_rect(frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, color) -> None:
+    frame[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] = color
+
+
+def _rect_outline(frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, color, width: int) -> None:
+    _fill_rect(frame, x0, y0, x1, y0 + width, color)
+    _fill_rect(frame, x0, y1 - width, x1, y1, color)
+    _fill_rect(frame, x0, y0, x0 + width, y1, color)
+    _fill_rect(frame, x1 - width, y0, x1, y1, color)
+
+
+_DISCS = {}  # (r, width) -> [2r + 1, 2r + 1] bool mask, the sizes repeat every frame
+
+
+def _disc(r: int, width: int) -> np.ndarray:
+    mask = _DISCS.get((r, width))
+    if mask is None:
+        ys, xs = np.ogrid[-r:r + 1, -r:r + 1]
+        d2 = xs * xs + ys * ys
+        mask = d2 <= r * r
+        if width:
+            mask &= d2 > (r - width) * (r - width)
+        _DISCS[(r, width)] = mask
+    return mask
+
+
+def _circle(frame: np.ndarray, cx: int, cy: int, r: int, color, width: int = 0) -> None:
+    """Filled disc, or a ring width pixels thick"""
+    h, w = frame.shape[:2]
+    x0, x1 = max(cx - r, 0), min(cx + r + 1, w)
+    y0, y1 = max(cy - r, 0), min(cy + r + 1, h)
+    if x0 >= x1 or y0 >= y1:
+        return
+    mask = _disc(r, width)[y0 - cy + r:y1 - cy + r, x0 - cx + r:x1 - cx + r]
+    frame[y0:y1, x0:x1][mask] = color
+
+
+def _line(frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, color, width: int = 1) -> None:
+    h, w = frame.shape[:2]
+    n = max(abs(x1 - x0), abs(y1 - y0)) + 1
+    xs = np.rint(np.linspace(x0, x1, n)).astype(np.intp)
+    ys = np.rint(np.linspace(y0, y1, n)).astype(np.intp)
+    # Thickness goes across the line, like pygame does it
+    offsets = np.arange(width) - width // 2
+    if abs(x1 - x0) >= abs(y1 - y0):
+        xs, ys = np.broadcast_to(xs, (width, n)), ys + offsets[:, None]
+    else:
+        xs, ys = xs + offsets[:, None], np.broadcast_to(ys, (width, n))
+    keep = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+    frame[ys[keep], xs[keep]] = color
+
+
+class NumpyRasterizer:
+    """Side view over top view, the same layout and colors as SlimeRenderer, view_width pixels wide"""
+    def __init__(self, view_width: int = 160):
+        scale = view_width / REFERENCE_WIDTH
+        self.scale = scale
+        self.padding = max(1, round(50 * scale))
+        self.view_width = view_width
+        side_aspect = (STAGE_RADIUS[0] * 2) / (NET_HEIGHT_FLT * 8 * 0.8)
+        top_aspect = (STAGE_RADIUS[0] * 2) / (STAGE_RADIUS[1] * 2)
+        self.side_height = int(view_width / side_aspect)
+        self.top_height = int(view_width / top_aspect)
+        self.width = view_width + self.padding * 2
+        self.height = self.side_height + self.top_height + self.padding * 3
+        # (left, top) of each view
+        self.side_origin = (self.padding, self.padding)
+        self.top_origin = (self.padding, self.side_height + self.padding * 2)
+
+        # The mappings of the pygame renderers, as plain floats
+        stage_x, stage_z = float(STAGE_RADIUS[0]), float(STAGE_RADIUS[1])
+        self._x_scale = view_width / (stage_x * 2)
+        self._x0 = self.padding + stage_x * self._x_scale
+        self._side_y_scale = self.side_height * 0.8 / (float(NET_HEIGHT_FLT) * 3)
+        self._side_y0 = self.padding + self.side_height
+        self._top_z_scale = self.top_height / (stage_z * 2)
+        self._top_z0 = self.top_origin[1] + self.top_height - stage_z * self._top_z_scale
+
+        self.line_width = max(1, round(2 * scale))
+        self.background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._draw_background(self.background)
+        self.frame = np.empty_like(self.background)
+        self._grid: Optional[np.ndarray] = None
+
+    # Game coords to pixels
+    def _side(self, x: float, y: float) -> Tuple[int, int]:
+        return int(self._x0 + x * self._x_scale), int(self._side_y0 - y * self._side_y_scale)
+
+    def _top(self, x: float, z: float) -> Tuple[int, int]:
+        return int(self._x0 + x * self._x_scale), int(self._top_z0 - z * self._top_z_scale)
+
+    def _px(self, pixels: float) -> int:
+        return max(1, round(pixels * self.scale))
+
+    def _draw_background(self, frame: np.ndarray) -> None:
+        frame[:] = BACKGROUND
+        lw = self.line_width
+        for (left, top), height in ((self.side_origin, self.side_height), (self.top_origin, self.top_height)):
+            _fill_rect(frame, left, top, left + self.view_width, top + height, COURT)
+            _rect_outline(frame, left, top, left + self.view_width, top + height, OUTLINE, lw)
+
+        # Side view: floor, net, center line
+        left, _ = self.side_origin
+        floor_y = self._side(-STAGE_RADIUS[0], 0)[1]
+        _line(frame, left, floor_y, left + self.view_width, floor_y, FLOOR, self._px(3))
+        _line(frame, *self._side(0, 0), *self._side(0, NET_HEIGHT_FLT), NET, self._px(4))
+        _line(frame, *self._side(0, 0), *self._side(0, NET_HEIGHT_FLT * 2.5), CENTER_LINE, 1)
+
+        # Top view: net, center line
+        left, top = self.top_origin
+        net_left = self._top(-NET_HALF_THICKNESS, 0)[0]
+        net_right = self._top(NET_HALF_THICKNESS, 0)[0]
+        _fill_rect(frame, net_left, top, max(net_right, net_left + 1), top + self.top_height, NET)
+        _line(frame, *self._top(0, -STAGE_RADIUS[1]), *self._top(0, STAGE_RADIUS[1]), CENTER_LINE, 1)
+
+    def _draw(self, frame: np.ndarray, ball_position, ball_velocity, slime_position, slime_velocity, slime_target,
+              jump_cooldown) -> None:
+        """Everything that moves, arrays as python lists ([3] for the ball, [n_slimes][3] for the slimes)"""
+        lw = self.line_width
+        side_radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * self.view_width * 1.5)
+        top_radius = int(SLIME_RADIUS / (STAGE_RADIUS[0] * 2) * self.view_width * 1.2)
+        for sid, (position, velocity, target) in enumerate(zip(slime_position, slime_velocity, slime_target)):
+            color = SLIME_COLORS[0] if sid == 0 else SLIME_COLORS[1]
+
+            # Side view, body, jump status and target
+            x, y = self._side(position[0], position[1])
+            _circle(frame, x, y, side_radius, color)
+            _circle(frame, x, y, side_radius, WHITE, lw)
+            if jump_cooldown[sid] > 0:
+                _circle(frame, x, y - side_radius - self._px(10), self._px(5), JUMP)
+            _circle(frame, *self._side(target[0], target[1]), max(1, side_radius // 5), color)
+
+            # Top view, body, movement direction and target
+            x, y = self._top(position[0], position[2])
+            _circle(frame, x, y, top_radius, color)
+            _circle(frame, x, y, top_radius, WHITE, lw)
+            if velocity[0] ** 2 + velocity[1] ** 2 + velocity[2] ** 2 > 0.01:
+                _line(frame, x, y, x + int(velocity[0] * 10 * self.scale), y - int(velocity[2] * 10 * self.scale),
+                      SLIME_VELOCITY, lw)
+            _circle(frame, *self._top(target[0], target[2]), max(1, top_radius // 5), color)
+
+        # Ball, side then top with its velocity
+        radius = max(1, int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * self.view_width * 2))
+        x, y = self._side(ball_position[0], ball_position[1])
+        _circle(frame, x, y, radius, WHITE)
+        _circle(frame, x, y, radius, BALL_OUTLINE, lw)
+
+        radius = max(1, int(BALL_RADIUS / (STAGE_RADIUS[0] * 2) * self.view_width * 1.5))
+        x, y = self._top(ball_position[0], ball_position[2])
+        _circle(frame, x, y, radius, WHITE)
+        _circle(frame, x, y, radius, BALL_OUTLINE, lw)
+        if ball_velocity[0] ** 2 + ball_velocity[1] ** 2 + ball_velocity[2] ** 2 > 0.01:
+            _line(frame, x, y, x + int(ball_velocity[0] * 8 * self.scale), y - int(ball_velocity[2] * 8 * self.scale),
+                  BALL_VELOCITY_COLOR, self._px(3))
+
+    def _draw_state(self, frame: np.ndarray, state: VolleyballState) -> None:
+        slimes = list(state.slimes.values())
+        self._draw(frame, state.ball_position.tolist(), state.ball_velocity.tolist(),
+                   [slime.position.tolist() for slime in slimes], [slime.velocity.tolist() for slime in slimes],
+                   [slime.target.tolist() for slime in slimes], [slime.jump_cooldown for slime in slimes])
+
+    def render(self, state: VolleyballState, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """[height, width, 3] uint8 frame of state, drawn into out or our own frame (reused, copy it to keep it)"""
+        frame = self.frame if out is None else out
+        frame[:] = self.background
+        self._draw_state(frame, state)
+        return frame
+
+    def _tiles(self, n: int, cols: Optional[int], out: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """The tiled frame for n envs and a [rows, H, cols, W, 3] view of it, background already in"""
+        cols = cols or int(np.ceil(np.sqrt(n)))
+        rows = int(np.ceil(n / cols))
+        shape = (rows * self.height, cols * self.width, 3)
+        if out is None:
+            if self._grid is None or self._grid.shape != shape:
+                self._grid = np.empty(shape, dtype=np.uint8)
+            out = self._grid
+        grid = out.reshape(rows, self.height, cols, self.width, 3)
+        grid[:] = self.background[None, :, None]
+        return out, grid
+
+    def render_batch(self, states: Sequence[VolleyballState], cols: Optional[int] = None,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """All states tiled row by row into one frame, cols per row (about square if None), empty tiles stay blank"""
+        out, grid = self._tiles(len(states), cols, out)
+        cols = grid.shape[2]
+        for i, state in enumerate(states):
+            self._draw_state(grid[i // cols, :, i % cols], state)
+        return out
+
+    def render_sim(self, sim, indices: Optional[Sequence[int]] = None, cols: Optional[int] = None,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Arenas of a BatchedSlimeVolleyballSim (all of them if indices is None) tiled like render_batch"""
+        indices = range(sim.num_arenas) if indices is None else indices
+        out, grid = self._tiles(len(indices), cols, out)
+        cols = grid.shape[2]
+        # One tolist per array instead of one per arena
+        ball_position = sim.ball_position[indices].tolist()
+        ball_velocity = sim.ball_velocity[indices].tolist()
+        slime_position = sim.slime_position[indices].tolist()
+        slime_velocity = sim.slime_velocity[indices].tolist()
+        slime_target = sim.slime_target[indices].tolist()
+        jump_cooldown = sim.jump_cooldown[indices].tolist()
+        for i in range(len(indices)):
+            self._draw(grid[i // cols, :, i % cols], ball_position[i], ball_velocity[i], slime_position[i],
+                       slime_velocity[i], slime_target[i], jump_cooldown[i])
+        return out
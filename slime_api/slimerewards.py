@@ -0,0 +1,241 @@
+"""
+Array-native rewards. A RewardTerm turns a RewardArrays (the parts of the state rewards look at, as arrays) into one
+reward per agent in a single vectorized expression, for one env ([n_agents]) or a batch ([n_envs, n_agents]).
+For one env, numpy costs more than it saves on two agents, so every term also has compute_state, the same reward in
+plain python straight from the state, and that's what the RLGym path (get_rewards) runs.
+WeightedReward combines terms with one dot product and is a normal RLGym RewardFunction, so it drops in for
+CombinedReward. The value of every term from the last call stays around for logging (last_terms, breakdown()).
+"""
+from abc import ABC, abstractmethod
+from math import sqrt
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from rlgym.api import RewardFunction
+from slime_api.slimestate import VolleyballState, CompactVolleyballState, STATE_HEADER_SIZE, SLIME_SIZE, \
+    SLIME_POSITION, SLIME_TOUCHES_REMAINING, BALL_POSITION
+
+
+class RewardArrays:
+    """
+    What the terms get. With one env: ball_position [3], slime_position [n_agents, 3], touches_remaining [n_agents],
+    point_scored and scoring_slime (-1 for None) as 0-d arrays. With a batch every one gets a leading n_envs axis.
+    agent_ids [n_agents] is the slime id of each agent. The single env ones also keep the RLGym arguments, for DictTerm.
+    """
+    def __init__(self, agents: Sequence[int]):
+        n = len(agents)
+        self.agents = list(agents)
+        self.agent_ids = np.array(agents)
+        self.ball_position = np.zeros(3, dtype=np.float32)
+        self.slime_position = np.zeros((n, 3), dtype=np.float32)
+        self.touches_remaining = np.zeros(n, dtype=np.float32)
+        self.point_scored = np.zeros((), dtype=bool)
+        self.scoring_slime = np.full((), -1, dtype=np.int64)
+        self.state: Optional[VolleyballState] = None
+        self.is_terminated: Optional[Dict[int, bool]] = None
+        self.is_truncated: Optional[Dict[int, bool]] = None
+        self.shared_info: Optional[Dict[str, Any]] = None
+        # Where the slime values sit in a compact buffer
+        blocks = STATE_HEADER_SIZE + SLIME_SIZE * self.agent_ids
+        self._compact_position = blocks[:, None] + np.arange(SLIME_POSITION.start, SLIME_POSITION.stop)
+        self._compact_touches = blocks + SLIME_TOUCHES_REMAINING
+
+    def load(self, state: VolleyballState, is_terminated=None, is_truncated=None, shared_info=None) -> "RewardArrays":
+        """Copies state into our arrays (they are reused, nothing gets allocated)"""
+        if isinstance(state, CompactVolleyballState):
+            buffer = state.buffer
+            self.ball_position[:] = buffer[BALL_POSITION]
+            np.take(buffer, self._compact_position, out=self.slime_position)
+            np.take(buffer, self._compact_touches, out=self.touches_remaining)
+        else:
+            self.ball_position[:] = state.ball_position
+            for i, agent in enumerate(self.agents):
+                slime = state.slimes[agent]
+                self.slime_position[i] = slime.position
+                self.touches_remaining[i] = slime.touches_remaining
+        self.point_scored[()] = state.point_scored
+        self.scoring_slime[()] = -1 if state.scoring_slime is None else state.scoring_slime
+        self.state = state
+        self.is_terminated = is_terminated
+        self.is_truncated = is_truncated
+        self.shared_info = shared_info
+        return self
+
+    @staticmethod
+    def from_batched_sim(sim) -> "RewardArrays":
+        """Views of the arrays of a BatchedSlimeVolleyballSim (agent i is slime i), no copies"""
+        arrays = RewardArrays(range(sim.slime_position.shape[1]))
+        arrays.ball_position = sim.ball_position
+        arrays.slime_position = sim.slime_position
+        arrays.touches_remaining = sim.touches_remaining
+        arrays.point_scored = sim.point_scored
+        arrays.scoring_slime = sim.scoring_slime
+        return arrays
+
+
+class RewardTerm(ABC):
+    """One reward, computed for every agent (and every env) at once"""
+    def reset(self, agents: List[int], initial_state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        """[n_agents], or [n_envs, n_agents] for batched arrays"""
+
+    def compute_state(self, agents: List[int], state: VolleyballState, is_terminated: Dict[int, bool],
+                      is_truncated: Dict[int, bool], shared_info: Dict[str, Any]) -> Sequence[float]:
+        """
+        The reward of every agent for one env, same values as compute. This default goes through a new RewardArrays,
+        override it in plain python to make the RLGym path fast.
+        """
+        return self.compute(RewardArrays(agents).load(state, is_terminated, is_truncated, shared_info)).tolist()
+
+
+class PointTerm(RewardTerm):
+    """1 if the agent scored, -1 if somebody else did, 0 otherwise (martico_rewards.PointRward)"""
+    def __init__(self):
+        self._agent_ids: Optional[np.ndarray] = None
+        self._table: Optional[np.ndarray] = None
+
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        if self._agent_ids is not arrays.agent_ids:
+            # [point_scored, scoring_slime + 1] -> rewards of every agent, so a step is one lookup
+            ids = arrays.agent_ids
+            self._table = np.zeros((2, ids.max() + 2, len(ids)))
+            self._table[1] = -1
+            self._table[1, ids + 1, np.arange(len(ids))] = 1
+            self._agent_ids = ids
+        return self._table[arrays.point_scored.astype(np.intp), arrays.scoring_slime + 1]
+
+    def compute_state(self, agents, state, is_terminated, is_truncated, shared_info) -> List[float]:
+        if not state.point_scored:
+            return [0.0] * len(agents)
+        scoring_slime = state.scoring_slime
+        return [1.0 if agent == scoring_slime else -1.0 for agent in agents]
+
+
+class TouchesTerm(RewardTerm):
+    """A third for every touch left, -1 if there are none (martico_rewards.TouchesReward)"""
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        touches = arrays.touches_remaining
+        return np.where(touches <= 0, -1.0, 0.333334 * touches)
+
+    def compute_state(self, agents, state, is_terminated, is_truncated, shared_info) -> List[float]:
+        rewards = []
+        for agent in agents:
+            touches = state.slimes[agent].touches_remaining
+            rewards.append(-1.0 if touches <= 0 else 0.333334 * touches)
+        return rewards
+
+
+class BallDistanceTerm(RewardTerm):
+    """Minus the slime to ball distance over 10 (martico_rewards.BallDistanceReward)"""
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        offset = arrays.slime_position - arrays.ball_position[..., None, :]
+        return np.sqrt(np.einsum("...i,...i->...", offset, offset)) / -10
+
+    def compute_state(self, agents, state, is_terminated, is_truncated, shared_info) -> List[float]:
+        bx, by, bz = state.ball_position.tolist()
+        rewards = []
+        for agent in agents:
+            x, y, z = state.slimes[agent].position.tolist()
+            rewards.append(sqrt((x - bx) ** 2 + (y - by) ** 2 + (z - bz) ** 2) / -10)
+        return rewards
+
+
+class DictTerm(RewardTerm):
+    """Any dict RLGym RewardFunction as a term, for mixing old rewards in (single env only, it runs its own loops)"""
+    def __init__(self, reward_fn: RewardFunction):
+        self.reward_fn = reward_fn
+
+    def reset(self, agents: List[int], initial_state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        self.reward_fn.reset(agents, initial_state, shared_info)
+
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        assert arrays.state is not None, "DictTerm needs a single env RewardArrays"
+        rewards = self.reward_fn.get_rewards(arrays.agents, arrays.state, arrays.is_terminated, arrays.is_truncated,
+                                             arrays.shared_info)
+        return np.array([rewards[agent] for agent in arrays.agents], dtype=np.float64)
+
+    def compute_state(self, agents, state, is_terminated, is_truncated, shared_info) -> List[float]:
+        rewards = self.reward_fn.get_rewards(agents, state, is_terminated, is_truncated, shared_info)
+        return [rewards[agent] for agent in agents]
+
+
+class WeightedReward(RewardFunction[int, VolleyballState, float]):
+    """
+    Weighted sum of RewardTerms, same arguments as CombinedReward: WeightedReward((PointTerm(), 50), (TouchesTerm(), 0.2)).
+    Every term goes into a row of last_terms [n_terms, n_agents], the total is weights @ last_terms.
+    get_rewards (one env) sums the terms' compute_state in python, last_terms and last_total only become arrays
+    when something reads them.
+    """
+    def __init__(self, *terms_and_weights: Union[RewardTerm, Tuple[RewardTerm, float]]):
+        terms, weights = [], []
+        for value in terms_and_weights:
+            term, weight = value if isinstance(value, tuple) else (value, 1.0)
+            terms.append(term)
+            weights.append(weight)
+        self.terms = tuple(terms)
+        self.weights = np.array(weights, dtype=np.float64)
+        self._weights = [float(weight) for weight in weights]
+        self.names = tuple(type(term).__name__ for term in self.terms)
+        self._last_terms: Optional[np.ndarray] = None
+        self._last_total: Optional[np.ndarray] = None
+        self._last_rows: Optional[List[Sequence[float]]] = None  # From get_rewards, not turned into arrays yet
+        self._last_totals: Optional[List[float]] = None
+
+    @property
+    def last_terms(self) -> Optional[np.ndarray]:
+        if self._last_rows is not None:
+            self._last_terms = np.array(self._last_rows, dtype=np.float64)
+            self._last_rows = None
+        return self._last_terms
+
+    @property
+    def last_total(self) -> Optional[np.ndarray]:
+        if self._last_totals is not None:
+            self._last_total = np.array(self._last_totals, dtype=np.float64)
+            self._last_totals = None
+        return self._last_total
+
+    def reset(self, agents: List[int], initial_state: VolleyballState, shared_info: Dict[str, Any]) -> None:
+        for term in self.terms:
+            term.reset(agents, initial_state, shared_info)
+
+    def compute(self, arrays: RewardArrays) -> np.ndarray:
+        """Total reward for already loaded arrays, [n_agents] or [n_envs, n_agents]"""
+        shape = (len(self.terms),) + arrays.slime_position.shape[:-1]
+        terms = self.last_terms
+        if terms is None or terms.shape != shape:
+            terms = np.empty(shape)
+        for i, term in enumerate(self.terms):
+            terms[i] = term.compute(arrays)
+        self._last_terms = terms
+        if terms.ndim == 2:
+            self._last_total = self.weights @ terms
+        else:
+            self._last_total = (self.weights @ terms.reshape(len(self.terms), -1)).reshape(shape[1:])
+        self._last_totals = None
+        return self._last_total
+
+    def compute_batch(self, sim) -> np.ndarray:
+        """Rewards of every arena of a BatchedSlimeVolleyballSim, [num_arenas, num_slimes]"""
+        return self.compute(RewardArrays.from_batched_sim(sim))
+
+    def get_rewards(self, agents: List[int], state: VolleyballState, is_terminated: Dict[int, bool],
+                    is_truncated: Dict[int, bool], shared_info: Dict[str, Any]) -> Dict[int, float]:
+        rows = [term.compute_state(agents, state, is_terminated, is_truncated, shared_info) for term in self.terms]
+        totals = [0.0] * len(agents)
+        for weight, row in zip(self._weights, rows):
+            for i, value in enumerate(row):
+                totals[i] += weight * value
+        self._last_rows = rows
+        self._last_totals = totals
+        return dict(zip(agents, totals))
+
+    def breakdown(self, weighted: bool = False) -> Dict[str, np.ndarray]:
+        """Term name -> its value in the last call (times its weight if weighted), nothing gets recomputed"""
+        last_terms = self.last_terms
+        if last_terms is None:
+            return {}
+        terms = last_terms * self.weights.reshape((-1,) + (1,) * (last_terms.ndim - 1)) if weighted else last_terms
+        return dict(zip(self.names, terms))
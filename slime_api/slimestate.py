@@ -26,3 +26,222 @@ class VolleyballState:
     def __repr__(self):
         return f"VolleyballState(slimes={self.slimes}, ball_position={self.ball_position}, ball_velocity={self.ball_velocity})"
 
+
+
+# Compact layout: every float of a state lives in one f32 buffer, so copying, pickling or sending a state is one memcpy
+SLIME_POSITION = slice(0, 3)
+SLIME_VELOCITY = slice(3, 6)
+SLIME_TARGET = slice(6, 9)
+SLIME_TOUCHES_REMAINING = 9
+SLIME_CAN_JUMP = 10
+SLIME_JUMP_COOLDOWN = 11
+SLIME_TOUCH_COOLDOWN = 12
+SLIME_SIZE = 13
+
+BALL_POSITION = slice(0, 3)
+BALL_VELOCITY = slice(3, 6)
+POINT_SCORED = 6
+SCORING_SLIME = 7  # -1 means None
+STEPS = 8  # f32 holds every integer up to 2**24 exactly, see STEPS_LIMIT
+STATE_HEADER_SIZE = 9
+STEPS_LIMIT = 2 ** 24  # About 88 hours of ticks at the default DT
+
+
+def _as_scalar(value):
+    # The sim sometimes hands us size 1 arrays (DT is one), numpy won't put those in a single element
+    return value.item() if isinstance(value, np.ndarray) else value
+
+
+class CompactSlime:
+    """Same attributes as Slime, but they are views into the buffer of the CompactVolleyballState that owns it"""
+    __slots__ = ("_data", "_position", "_velocity", "_target")
+
+    def __init__(self, data: np.ndarray):
+        self._data = data
+        self._position = data[SLIME_POSITION]
+        self._velocity = data[SLIME_VELOCITY]
+        self._target = data[SLIME_TARGET]
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._position
+
+    @position.setter
+    def position(self, value: np.ndarray):
+        self._position[:] = value
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, value: np.ndarray):
+        self._velocity[:] = value
+
+    @property
+    def target(self) -> np.ndarray:
+        return self._target
+
+    @target.setter
+    def target(self, value: np.ndarray):
+        self._target[:] = value
+
+    @property
+    def touches_remaining(self) -> float:
+        return float(self._data[SLIME_TOUCHES_REMAINING])
+
+    @touches_remaining.setter
+    def touches_remaining(self, value: float):
+        self._data[SLIME_TOUCHES_REMAINING] = _as_scalar(value)
+
+    @property
+    def can_jump(self) -> bool:
+        return bool(self._data[SLIME_CAN_JUMP])
+
+    @can_jump.setter
+    def can_jump(self, value: bool):
+        self._data[SLIME_CAN_JUMP] = bool(_as_scalar(value))
+
+    @property
+    def jump_cooldown(self) -> float:
+        return float(self._data[SLIME_JUMP_COOLDOWN])
+
+    @jump_cooldown.setter
+    def jump_cooldown(self, value: float):
+        self._data[SLIME_JUMP_COOLDOWN] = _as_scalar(value)
+
+    @property
+    def touch_cooldown(self) -> float:
+        return float(self._data[SLIME_TOUCH_COOLDOWN])
+
+    @touch_cooldown.setter
+    def touch_cooldown(self, value: float):
+        self._data[SLIME_TOUCH_COOLDOWN] = _as_scalar(value)
+
+    def __repr__(self):
+        return (f"CompactSlime(position={self.position}, velocity={self.velocity}, target={self.target}, "
+                f"touches_remaining={self.touches_remaining}, can_jump={self.can_jump}, "
+                f"jump_cooldown={self.jump_cooldown}, touch_cooldown={self.touch_cooldown})")
+
+
+class CompactVolleyballState:
+    """
+    Drop-in for VolleyballState, backed by one preallocated f32 buffer (header, then one block per slime).
+    state.slimes[i].position etc. work as before, so obs builders, rewards and mutators don't need to change.
+    """
+    __slots__ = ("buffer", "slimes", "_ball_position", "_ball_velocity")
+
+    def __init__(self, num_slimes: int = 2, buffer: Optional[np.ndarray] = None):
+        if buffer is None:
+            buffer = np.zeros(STATE_HEADER_SIZE + SLIME_SIZE * num_slimes, dtype=np.float32)
+            buffer[SCORING_SLIME] = -1
+            for sid in range(num_slimes):
+                buffer[STATE_HEADER_SIZE + SLIME_SIZE * sid + SLIME_TOUCHES_REMAINING] = 3
+        assert buffer.dtype == np.float32 and buffer.shape == (STATE_HEADER_SIZE + SLIME_SIZE * num_slimes,)
+        self.buffer = buffer
+        self._ball_position = buffer[BALL_POSITION]
+        self._ball_velocity = buffer[BALL_VELOCITY]
+        self.slimes: Dict[int, CompactSlime] = {
+            sid: CompactSlime(buffer[STATE_HEADER_SIZE + SLIME_SIZE * sid:STATE_HEADER_SIZE + SLIME_SIZE * (sid + 1)])
+            for sid in range(num_slimes)
+        }
+
+    @staticmethod
+    def from_state(state: VolleyballState) -> "CompactVolleyballState":
+        compact = CompactVolleyballState(len(state.slimes))
+        compact.load(state)
+        return compact
+
+    def load(self, state: VolleyballState) -> None:
+        """Copies any state (compact or not) into our buffer"""
+        if isinstance(state, CompactVolleyballState):
+            self.buffer[:] = state.buffer
+            return
+        for sid, slime in state.slimes.items():
+            mine = self.slimes[sid]
+            mine.position = slime.position
+            mine.velocity = slime.velocity
+            mine.target = slime.target
+            mine.touches_remaining = slime.touches_remaining
+            mine.can_jump = slime.can_jump
+            mine.jump_cooldown = slime.jump_cooldown
+            mine.touch_cooldown = slime.touch_cooldown
+        self.ball_position = state.ball_position
+        self.ball_velocity = state.ball_velocity
+        self.point_scored = state.point_scored
+        self.scoring_slime = state.scoring_slime
+        self.steps = state.steps
+
+    def store(self, state: VolleyballState) -> None:
+        """The other way around from load, copies our buffer into any state (its arrays are written in place)"""
+        if isinstance(state, CompactVolleyballState):
+            state.buffer[:] = self.buffer
+            return
+        for sid, slime in state.slimes.items():
+            mine = self.slimes[sid]
+            slime.position[:] = mine.position
+            slime.velocity[:] = mine.velocity
+            slime.target[:] = mine.target
+            slime.touches_remaining = mine.touches_remaining
+            slime.can_jump = mine.can_jump
+            slime.jump_cooldown = mine.jump_cooldown
+            slime.touch_cooldown = mine.touch_cooldown
+        state.ball_position[:] = self.ball_position
+        state.ball_velocity[:] = self.ball_velocity
+        state.point_scored = self.point_scored
+        state.scoring_slime = self.scoring_slime
+        state.steps = self.steps
+
+    def copy(self) -> "CompactVolleyballState":
+        return CompactVolleyballState(len(self.slimes), self.buffer.copy())
+
+    def __reduce__(self):
+        # One array to pickle, the slime views get rebuilt on the other side
+        return CompactVolleyballState, (len(self.slimes), self.buffer)
+
+    @property
+    def ball_position(self) -> np.ndarray:
+        return self._ball_position
+
+    @ball_position.setter
+    def ball_position(self, value: np.ndarray):
+        self._ball_position[:] = value
+
+    @property
+    def ball_velocity(self) -> np.ndarray:
+        return self._ball_velocity
+
+    @ball_velocity.setter
+    def ball_velocity(self, value: np.ndarray):
+        self._ball_velocity[:] = value
+
+    @property
+    def point_scored(self) -> bool:
+        return bool(self.buffer[POINT_SCORED])
+
+    @point_scored.setter
+    def point_scored(self, value: bool):
+        self.buffer[POINT_SCORED] = bool(_as_scalar(value))
+
+    @property
+    def scoring_slime(self) -> Optional[int]:
+        scorer = int(self.buffer[SCORING_SLIME])
+        return None if scorer < 0 else scorer
+
+    @scoring_slime.setter
+    def scoring_slime(self, value: Optional[int]):
+        self.buffer[SCORING_SLIME] = -1 if value is None else _as_scalar(value)
+
+    @property
+    def steps(self) -> int:
+        return int(self.buffer[STEPS])
+
+    @steps.setter
+    def steps(self, value: int):
+        value = _as_scalar(value)
+        if value >= STEPS_LIMIT:
+            raise ValueError(f"CompactVolleyballState can't hold {value} steps exactly, the limit is {STEPS_LIMIT}")
+        self.buffer[STEPS] = value
+
+    def __repr__(self):
+        return f"CompactVolleyballState(slimes={self.slimes}, ball_position={self.ball_position}, ball_velocity={self.ball_velocity})"
@@ -0,0 +1,181 @@
+"""
+Analytic ball trajectory prediction, vectorized over any number of balls (positions/velocities are [..., 3]).
+Everything follows the sim's integration (v += g * DT, then p += v * DT) and reports the tick where the sim
+would notice the event, so the answers match forward simulating the ball alone. Times are in seconds.
+Slimes are not taken into account.
+"""
+import numpy as np
+from typing import Tuple
+from slime_api.common_values import *
+
+_DT = float(DT[0])
+_G = float(GRAVITY[1])
+BACK_WALL_X = float(STAGE_RADIUS[0] - BALL_RADIUS)  # Where the ball center bounces
+SIDE_WALL_Z = float(STAGE_RADIUS[1] - BALL_RADIUS)
+NET_SIDE_X = float(BALL_RADIUS + NET_HALF_THICKNESS)
+NET_TOP_Y = float(NET_HEIGHT_FLT + BALL_RADIUS)
+
+
+def _height_after(y: np.ndarray, vy: np.ndarray, ticks: np.ndarray) -> np.ndarray:
+    # After n ticks: y + n * vy * DT + g * DT^2 * n * (n + 1) / 2
+    return y + ticks * vy * _DT + _G * _DT * _DT * ticks * (ticks + 1) / 2
+
+
+def _height_roots(y: np.ndarray, vy: np.ndarray, height) -> Tuple[np.ndarray, np.ndarray]:
+    """Ticks (as floats) where the ball goes up / comes down through height, NaN if it never reaches it"""
+    a = 0.5 * _G * _DT * _DT
+    b = vy * _DT + a
+    c = y - height
+    disc = b * b - 4 * a * c
+    with np.errstate(invalid="ignore"):
+        root = np.sqrt(disc)
+    # a is negative, so -b - root is the later one
+    return (-b + root) / (2 * a), (-b - root) / (2 * a)
+
+
+def _ticks_to_floor(y: np.ndarray, vy: np.ndarray, height=0.0) -> np.ndarray:
+    """First tick where the ball is at or under height on the way down, NaN if never"""
+    _, down = _height_roots(y, vy, height)
+    ticks = np.maximum(np.ceil(down), 0)
+    return np.where(y <= height, 0, ticks)
+
+
+def _ticks_past(x: np.ndarray, vx: np.ndarray, limit) -> np.ndarray:
+    """First tick where a coordinate moving in a straight line is past +-limit, inf if it's moving away"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = (np.where(vx > 0, limit, -limit) - x) / (vx * _DT)
+        ticks = np.floor(crossing) + 1
+    return np.where((vx != 0) & (crossing >= 0), ticks, np.inf)
+
+
+def _ticks_to_net(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray) -> np.ndarray:
+    """First tick (at least 1) where the ball is inside the net box (|x| < NET_SIDE_X and y < NET_TOP_Y), inf if never"""
+    # Ticks where |x| < NET_SIDE_X is the open interval (lo, hi)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (-NET_SIDE_X - x) / (vx * _DT)
+        b = (NET_SIDE_X - x) / (vx * _DT)
+    still = vx == 0
+    lo = np.where(still, np.where(np.abs(x) < NET_SIDE_X, -np.inf, np.inf), np.minimum(a, b))
+    hi = np.where(still, np.inf, np.maximum(a, b))
+    enter = np.maximum(np.floor(lo) + 1, 1)
+
+    # Either it's already under the top when it gets there, or it comes down on it later
+    safe_enter = np.where(np.isfinite(enter), enter, 0)
+    below_at_enter = np.isfinite(enter) & (enter < hi) & (_height_after(y, vy, safe_enter) < NET_TOP_Y)
+    _, down = _height_roots(y, vy, NET_TOP_Y)
+    comes_down = np.maximum(np.floor(np.nan_to_num(down, nan=-1.0)) + 1, enter)
+    later = np.isfinite(comes_down) & (comes_down < hi)
+
+    return np.where(below_at_enter, enter, np.where(later, comes_down, np.inf))
+
+
+def time_to_height(position: np.ndarray, velocity: np.ndarray, height: float) -> np.ndarray:
+    """Seconds until the ball comes down to height (first tick at or under it), NaN if it never does"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    return (_ticks_to_floor(position[..., 1], velocity[..., 1], height) * _DT).astype(np.float32)
+
+
+def position_at(position: np.ndarray, velocity: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """Where the ball is after time seconds of free flight (no walls, no net)"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    ticks = np.asarray(time, dtype=np.float64) / _DT
+    result = position + velocity * (ticks * _DT)[..., None]
+    result[..., 1] = _height_after(position[..., 1], velocity[..., 1], ticks)
+    return result.astype(np.float32)
+
+
+def landing(position: np.ndarray, velocity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Seconds until the ball hits the floor and where ([..., 2] x/z), ignoring walls and the net"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    ticks = _ticks_to_floor(position[..., 1], velocity[..., 1])
+    landing_xz = position[..., ::2] + velocity[..., ::2] * (ticks * _DT)[..., None]
+    return (ticks * _DT).astype(np.float32), landing_xz.astype(np.float32)
+
+
+def time_to_side_wall(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    """Seconds until the next side wall (z) bounce, inf if it's not moving towards one"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    return (_ticks_past(position[..., 2], velocity[..., 2], SIDE_WALL_Z) * _DT).astype(np.float32)
+
+
+def time_to_back_wall(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    """Seconds until the next back wall (x) bounce, inf if it's not moving towards one"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    return (_ticks_past(position[..., 0], velocity[..., 0], BACK_WALL_X) * _DT).astype(np.float32)
+
+
+def time_to_net(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    """Seconds until the ball hits the side or the top of the net, inf if it clears it or never gets there"""
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    ticks = _ticks_to_net(position[..., 0], position[..., 1], velocity[..., 0], velocity[..., 1])
+    return (ticks * _DT).astype(np.float32)
+
+
+def predict_landing(position: np.ndarray, velocity: np.ndarray, max_bounces: int = 8) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Seconds until the ball hits the floor, where ([..., 2] x/z) and on which side (+1 / -1, x > 0 is +1),
+    following up to max_bounces wall and net bounces (after that the ball flies free). A ball rolling along the net top
+    bounces on it every tick, so that's where max_bounces runs out.
+    """
+    position = np.array(position, dtype=np.float64)
+    velocity = np.array(velocity, dtype=np.float64)
+    elapsed = np.zeros(position.shape[:-1], dtype=np.float64)
+    landed = np.zeros(position.shape[:-1], dtype=bool)
+
+    for _ in range(max_bounces):
+        x, y, z = position[..., 0], position[..., 1], position[..., 2]
+        vx, vy, vz = velocity[..., 0], velocity[..., 1], velocity[..., 2]
+        floor_ticks = np.nan_to_num(_ticks_to_floor(y, vy), nan=np.inf)
+        back_ticks = _ticks_past(x, vx, BACK_WALL_X)
+        side_ticks = _ticks_past(z, vz, SIDE_WALL_Z)
+        net_ticks = _ticks_to_net(x, y, vx, vy)
+        ticks = np.minimum(np.minimum(back_ticks, side_ticks), net_ticks)
+        bounces = ~landed & (ticks <= floor_ticks)
+        if not bounces.any():
+            break
+
+        # Advance the bouncing balls to that tick and handle it the way the sim does, walls first, then the floor
+        n = np.where(bounces, ticks, 0)
+        new_x = x + vx * _DT * n
+        new_y = _height_after(y, vy, n)
+        new_z = z + vz * _DT * n
+        new_vx = vx.copy()
+        new_vy = vy + _G * _DT * n
+        new_vz = vz.copy()
+
+        hit_net = bounces & (net_ticks == ticks)
+        net_side = hit_net & (np.abs(new_x) - NET_SIDE_X >= new_y - NET_TOP_Y)
+        net_top = hit_net & ~net_side
+        new_vx = np.where(net_side, new_vx * -BALL_RESTITUTION, new_vx)
+        # Same spot the sim puts it back at, depending on where it was the tick before
+        prev_x = x + vx * _DT * (n - 1)
+        new_x = np.where(net_side, np.where(prev_x < 0, NET_HALF_THICKNESS - BALL_RADIUS, NET_HALF_THICKNESS + BALL_RADIUS), new_x)
+        new_vy = np.where(net_top, new_vy * -BALL_RESTITUTION, new_vy)
+        new_y = np.where(net_top, NET_TOP_Y, new_y)
+
+        hit_back = bounces & ~hit_net & (back_ticks == ticks)
+        new_vx = np.where(hit_back, new_vx * -BALL_RESTITUTION, new_vx)
+        new_x = np.where(hit_back, np.sign(new_x) * BACK_WALL_X, new_x)
+
+        hit_side = bounces & (side_ticks == ticks)
+        new_vz = np.where(hit_side, new_vz * -BALL_RESTITUTION, new_vz)
+        new_z = np.where(hit_side, np.sign(new_z) * SIDE_WALL_Z, new_z)
+
+        landed |= bounces & (new_y <= 0)
+        new_y = np.where(bounces & (new_y <= 0), 0, new_y)
+
+        position = np.where(bounces[..., None], np.stack([new_x, new_y, new_z], -1), position)
+        velocity = np.where(bounces[..., None], np.stack([new_vx, new_vy, new_vz], -1), velocity)
+        elapsed += n
+
+    # Whatever didn't land on a bounce tick flies free to the floor
+    floor_ticks = np.where(landed, 0, _ticks_to_floor(position[..., 1], velocity[..., 1]))
+    landing_xz = position[..., ::2] + velocity[..., ::2] * (floor_ticks * _DT)[..., None]
+    side = np.where(landing_xz[..., 0] > 0, 1, -1)
+    return ((elapsed + floor_ticks) * _DT).astype(np.float32), landing_xz.astype(np.float32), side
@@ -6,7 +6,7 @@ from rlgym.api import TransitionEngine, StateMutator, ObsBuilder, ActionParser,
 class IndieDevTruncatedCondition(DoneCondition[int, VolleyballState]):
     """Determines when episodes are cut short (timeout)"""
     def __init__(self, max_steps: int = 100):
-        self.max_steps = max_steps
+        self.max_steps = max_steps  # In sim ticks, so env steps * tick_skip
         
     def reset(self, agents: List[int], initial_state: VolleyballState, shared_info: Dict[str, Any]) -> None:
         pass
@@ -0,0 +1,122 @@
+"""
+Which env worker this is, and what it costs. A launcher that knows the index passes it (worker_index(index), or
+SLIME_WORKER_INDEX in the worker's environment). rlgym_ppo calls the env factory with no arguments in every worker, so
+without either worker_index() works it out from the process: workers are numbered in the order the learner started
+them, and the main process is -1 so an env it builds for itself never counts as worker 0. worker_stats() is the RSS and
+the time since the process started, print it at the end of the factory to see what every worker paid to get there.
+
+python -m slime_api.slimeworker --workers 8 --renderer human --policy all   # Every worker makes a pygame renderer
+python -m slime_api.slimeworker --workers 8 --renderer human                # Only worker 0 does
+"""
+import os
+import time
+from typing import Dict, Optional
+
+WORKER_ENV_VAR = "SLIME_WORKER_INDEX"
+
+
+def worker_index(index: Optional[int] = None) -> int:
+    """
+    index if it's given, then SLIME_WORKER_INDEX if it's set. Only without either: -1 in the main process, otherwise
+    n - 1 for the n-th process its parent started. multiprocessing counts every Process a parent starts, so that only
+    matches the worker number if the launcher started its workers first and in order (rlgym_ppo does).
+    """
+    if index is not None:
+        return index
+    value = os.environ.get(WORKER_ENV_VAR)
+    if value is not None:
+        return int(value)
+    import multiprocessing
+    identity = multiprocessing.current_process()._identity  # () in the main process, (..., n) in a child
+    return identity[-1] - 1 if identity else -1
+
+
+def process_rss() -> Optional[int]:
+    """Resident memory in bytes (peak RSS where there's no /proc), None if we can't tell"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, KB elsewhere
+    except ImportError:
+        return None
+
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started, None if we can't tell"""
+    try:
+        with open("/proc/self/stat") as f:
+            # The name can have spaces, the fields after it don't, starttime is field 22 (in clock ticks since boot)
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def worker_stats(index: Optional[int] = None) -> Dict[str, Optional[float]]:
+    """{"worker", "pid", "rss_mb", "uptime_s"}, index as in worker_index"""
+    rss = process_rss()
+    return {
+        "worker": worker_index(index),
+        "pid": os.getpid(),
+        "rss_mb": rss / 2 ** 20 if rss is not None else None,
+        "uptime_s": process_uptime(),
+    }
+
+
+def format_worker_stats(stats: Dict[str, Optional[float]], label: str = "ready") -> str:
+    rss = f"{stats['rss_mb']:.1f} MB RSS" if stats["rss_mb"] is not None else "RSS unknown"
+    uptime = f"{stats['uptime_s']:.2f} s after start" if stats["uptime_s"] is not None else "start time unknown"
+    return f"worker {stats['worker']} (pid {stats['pid']}): {label} {uptime}, {rss}"
+
+
+def _bench_worker(index: int, renderer: str, policy: str, results) -> None:
+    from slime_api.bench import build_weighted_pipeline
+    from slime_api.slimerenderer import SlimeRenderer, NullRenderer, renderer_for_worker
+    from slime_api.slimeasyncrenderer import AsyncSlimeRenderer
+
+    def make():
+        if renderer == "async":
+            return AsyncSlimeRenderer()
+        return SlimeRenderer(renderer) if renderer != "none" else NullRenderer()
+
+    env = build_weighted_pipeline()
+    env.renderer = make() if policy == "all" else renderer_for_worker(make, index=index)
+    env.reset()
+    env.render()
+    results.put(worker_stats(index))
+    time.sleep(0.5)  # Let the others finish before anyone tears down (and frees memory)
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m slime_api.slimeworker",
+                                     description="Start env workers like rlgym_ppo does and report their RSS and startup time")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--renderer", choices=["human", "rgb_array", "numpy", "async", "none"], default="human")
+    parser.add_argument("--policy", choices=["all", "worker0"], default="worker0", help="Which workers make the renderer")
+    args = parser.parse_args()
+
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [context.Process(target=_bench_worker, args=(index, args.renderer, args.policy, results))
+               for index in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    stats = sorted((results.get() for _ in workers), key=lambda s: s["worker"])
+    for worker in workers:
+        worker.join()
+    for s in stats:
+        print(format_worker_stats(s, "env built and rendered once"))
+    known = [s["rss_mb"] for s in stats if s["rss_mb"] is not None]
+    if known:
+        print(f"total {sum(known):.1f} MB RSS over {len(stats)} workers")
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from slime_api.slimeactions import SlimeActions
+from slime_api.sim.batched_sim import create_base_state
+
+AGENTS = [0, 1]
+
+
+def baseline_parse(started_on_right, actions):
+    """The parser before the shared buffer, one array per agent"""
+    real_actions = {}
+    for agent_id, action in actions.items():
+        proc = action.astype(np.float32)
+        proc[:3] *= 10.0
+        if started_on_right.get(agent_id, False):
+            proc[0] *= -1.0
+            proc[2] *= -1.0
+        real_actions[agent_id] = proc
+    return real_actions
+
+
+def reset(parser, rng):
+    state = create_base_state()
+    for slime in state.slimes.values():
+        slime.position[0] = rng.choice([-3, 3])
+    parser.reset(AGENTS, state, {})
+    return {agent: bool(state.slimes[agent].position[0] > 0) for agent in AGENTS}
+
+
+def test_matches_the_baseline_parser():
+    rng = np.random.default_rng(0)
+    parser = SlimeActions()
+    for _ in range(200):
+        started_on_right = reset(parser, rng)
+        actions = {agent: rng.uniform(-1, 1, 4).astype(rng.choice([np.float32, np.float64])) for agent in AGENTS}
+        if rng.random() < 0.3:
+            del actions[int(rng.integers(0, 2))]
+        expected = baseline_parse(started_on_right, actions)
+        shared_info = {}
+        parsed = parser.parse_actions(actions, None, shared_info)
+        assert parsed.keys() == expected.keys() and shared_info["actions"] is parsed
+        for agent in expected:
+            assert parsed[agent].dtype == np.float32 and np.array_equal(parsed[agent], expected[agent])
+
+        # The [n_agents, 4] form, and the buffer the sim gets with array_actions
+        rows = np.stack([rng.uniform(-1, 1, 4) for _ in AGENTS])
+        expected = baseline_parse(started_on_right, dict(zip(AGENTS, rows)))
+        parsed = parser.parse_actions(rows, None, {})
+        assert all(np.array_equal(parsed[agent], expected[agent]) for agent in AGENTS)
+
+
+def test_array_actions_with_missing_agents():
+    rng = np.random.default_rng(1)
+    parser = SlimeActions(array_actions=True)
+    started_on_right = reset(parser, rng)
+    first = {agent: rng.uniform(-1, 1, 4) for agent in AGENTS}
+    parser.parse_actions(first, None, {})
+    second = {1: rng.uniform(-1, 1, 4)}
+    rows = parser.parse_actions(second, None, {})
+    # Agent 0 keeps its last parsed action, it doesn't get scaled again
+    assert np.array_equal(rows[0], baseline_parse(started_on_right, first)[0])
+    assert np.array_equal(rows[1], baseline_parse(started_on_right, second)[1])
+
+
+def test_unknown_agents_are_scaled_but_not_mirrored():
+    rng = np.random.default_rng(2)
+    parser = SlimeActions()
+    started_on_right = reset(parser, rng)
+    actions = {0: rng.uniform(-1, 1, 4), 7: rng.uniform(-1, 1, 4)}
+    parsed = parser.parse_actions(actions, None, {})
+    expected = baseline_parse(started_on_right, actions)
+    assert parsed.keys() == expected.keys()
+    assert all(np.array_equal(parsed[agent], expected[agent]) for agent in actions)
+
+
+def test_parsed_actions_are_reused():
+    # The parsed arrays are views of one buffer, the next parse overwrites them
+    rng = np.random.default_rng(3)
+    parser = SlimeActions()
+    reset(parser, rng)
+    first = parser.parse_actions({0: np.ones(4), 1: np.ones(4)}, None, {})
+    kept = {agent: action.copy() for agent, action in first.items()}
+    parser.parse_actions({0: np.zeros(4), 1: np.zeros(4)}, None, {})
+    assert not np.array_equal(first[0], kept[0]) and np.array_equal(first[0], np.zeros(4))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,82 @@
+import tracemalloc
+import numpy as np
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.slimestate import VolleyballState, Slime
+
+# step_game has some fixed cost per call (reading the state and actions), but nothing per tick
+PER_CALL_BUDGET = 512  # In bytes
+TICKS = 500
+
+
+def make_sim() -> SlimeVolleyballSim:
+    state = VolleyballState(
+        {0: Slime(
+            np.array([3, 0, 0], dtype=np.float32),
+            np.zeros(3, dtype=np.float32),
+            np.zeros(3, dtype=np.float32),
+            3, False, 0, 0
+        ), 1: Slime(
+            np.array([-3, 0, 0], dtype=np.float32),
+            np.zeros(3, dtype=np.float32),
+            np.zeros(3, dtype=np.float32),
+            3, False, 0, 0
+        )},
+        np.array([2, 2000, 0], dtype=np.float32),  # High enough that nobody scores during the test
+        np.zeros(3, dtype=np.float32),
+        False,
+        None
+    )
+    return SlimeVolleyballSim(state, 6, 4, 2)
+
+
+def measure(sim: SlimeVolleyballSim, actions, ticks: int):
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    sim.step_game(actions, ticks)
+    after, peak = tracemalloc.get_traced_memory()
+    return after - before, peak - before
+
+
+def test_step_game_does_not_allocate_per_tick():
+    sim = make_sim()
+    # Running to a target, jumping, and standing still at the target all take different paths
+    actions = {0: np.array([1, 0, 2, 1], dtype=np.float32), 1: np.array([-4, 0, -1, 1], dtype=np.float32)}
+    sim.step_game(actions, 5)  # Warm up
+
+    tracemalloc.start()
+    try:
+        measure(sim, actions, 1)
+        grown_one, peak_one = measure(sim, actions, 1)
+        grown_many, peak_many = measure(sim, actions, TICKS)
+    finally:
+        tracemalloc.stop()
+
+    assert not sim.state.point_scored
+    assert peak_many < PER_CALL_BUDGET, f"step_game allocated {peak_many} bytes over {TICKS} ticks"
+    assert peak_many - peak_one < 64, f"peak grew from {peak_one} to {peak_many} bytes with more ticks"
+    assert grown_many - grown_one < 64, f"step_game kept {grown_many} bytes after {TICKS} ticks"
+
+
+def test_build_obs_batch_does_not_allocate_per_arena():
+    from slime_api.sim.batched_sim import BatchedSlimeVolleyballSim
+    from slime_api.slimeexampleobs import IndieDevDefaultObs
+    arenas = 1024
+    sim = BatchedSlimeVolleyballSim(arenas)
+    obs = IndieDevDefaultObs()
+    out = np.empty((arenas, 2, obs.obs_dim), dtype=np.float32)
+    obs.build_obs_batch(sim, out=out)  # Makes the scratch buffers
+
+    tracemalloc.start()
+    try:
+        obs.build_obs_batch(sim, out=out)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # numpy's ufunc buffers are a fixed size, a temporary per arena would be at least as big as out
+    assert peak < out.nbytes // 2, f"build_obs_batch peaked at {peak} bytes for {out.nbytes} bytes of obs"
+
+
+if __name__ == "__main__":
+    test_step_game_does_not_allocate_per_tick()
+    test_build_obs_batch_does_not_allocate_per_arena()
+    print("OK")
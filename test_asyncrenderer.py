@@ -0,0 +1,48 @@
+import os
+import time
+import numpy as np
+import pytest
+from slime_api.slimeasyncrenderer import AsyncSlimeRenderer, RingWorker, _STOP
+from slime_api.sim.batched_sim import create_base_state
+
+STATES = 2000
+
+
+def _failing_loop(ring) -> None:
+    rows = ring.rows  # A view into the shared memory that the traceback keeps alive
+    while not ring.header[_STOP]:
+        time.sleep(0.01)
+    raise RuntimeError(f"loop failed with {len(rows)} rows")
+
+
+def test_process_close_after_rendering(capfd):
+    pytest.importorskip("pygame")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # The display process inherits it
+    renderer = AsyncSlimeRenderer(use_process=True)
+    state = create_base_state()
+    for step in range(STATES):
+        state.ball_position[0] = np.sin(step / 50)
+        state.steps = step
+        renderer.render(state, {})
+    worker = renderer._worker.worker
+    renderer.close()
+    worker.join(10)
+
+    err = capfd.readouterr().err
+    assert worker.exitcode == 0, err
+    assert "BufferError" not in err and "Exception ignored" not in err, err
+
+
+def test_process_loop_error_is_not_hidden(capfd):
+    worker = RingWorker(8, 2, _failing_loop)
+    time.sleep(0.5)
+    worker.stop(10)
+
+    err = capfd.readouterr().err
+    assert worker.worker.exitcode == 1
+    assert "loop failed with 8 rows" in err, err
+    assert "BufferError" not in err, err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,60 @@
+import copy
+import numpy as np
+import pytest
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss, chase_ball
+from slime_api.slimestate import CompactVolleyballState
+
+pytest.importorskip("numba")
+
+CONFIGS = [
+    dict(),
+    dict(fast_forward=True),
+    dict(continuous_collision=True),
+    dict(continuous_collision=True, fast_forward=True, dt=0.038),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda config: ",".join(config) or "default")
+def test_python_and_numba_play_the_same_game(config):
+    rng = np.random.default_rng(0)
+    for episode in range(20):
+        state = create_base_state()
+        random_toss(state, rng)
+        # The numba backend keeps its state compact (f32 cooldowns between calls), so the python one gets one too
+        python = SlimeVolleyballSim(CompactVolleyballState.from_state(state), backend="python", **config)
+        numba = SlimeVolleyballSim(copy.deepcopy(state), backend="numba", **config)
+        while not python.state.point_scored and python.state.steps < 2000:
+            actions = chase_ball(python.state)
+            if episode % 3 == 1:
+                # The [n_slimes, 4] array form
+                actions = np.stack([actions[0], actions[1]])
+            elif episode % 3 == 2 and rng.random() < 0.3:
+                del actions[1]  # No action, slime 1 keeps going to its old target
+            ticks = int(rng.integers(1, 13))
+            python.step_game(actions, ticks)
+            numba.step_game(actions, ticks)
+            assert np.array_equal(python.state.buffer, numba.state.buffer), f"episode {episode} step {python.state.steps}"
+        assert numba.state.point_scored == python.state.point_scored
+        assert numba.state.scoring_slime == python.state.scoring_slime
+
+
+def test_numba_state_is_a_drop_in():
+    state = create_base_state()
+    state.ball_position[:] = [3, 4, 0]
+    sim = SlimeVolleyballSim(state, backend="numba")
+    assert isinstance(sim.state, CompactVolleyballState)
+    sim.step_game({0: np.array([2, 0, 1, 1], dtype=np.float64)}, 6)
+    assert sim.state.steps == 6 and isinstance(sim.state.steps, int)
+    assert np.allclose(sim.state.slimes[0].target, [2, 0, 1])
+    assert sim.state.scoring_slime is None
+
+    other = create_base_state()
+    other.ball_position[:] = [-3, 4, 0]
+    sim.set_state(other)
+    assert np.array_equal(sim.state.ball_position, other.ball_position) and sim.state.steps == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,51 @@
+import timeit
+import numpy as np
+from slime_api.slimebank import BankMutator, StateBank, indiedev_bank, INDIEDEV_WEIGHTS
+from slime_api.slimemutator import IndieDevMutator
+from slime_api.slimestate import CompactVolleyballState, POINT_SCORED, SCORING_SLIME, STEPS, STATE_HEADER_SIZE, \
+    SLIME_SIZE, SLIME_CAN_JUMP
+from slime_api.sim.batched_sim import create_base_state
+
+
+def test_plain_state_gets_the_whole_row(tmp_path):
+    bank = indiedev_bank(1000, seed=0)
+    rows = bank.sub_banks["toss"]
+    rng = np.random.default_rng(0)
+    rows[:, :] = rng.uniform(-5, 5, rows.shape)  # Every field, not just what the mutators set
+    rows[:, POINT_SCORED] = rng.integers(0, 2, len(rows))
+    rows[:, SCORING_SLIME] = rng.integers(-1, 2, len(rows))  # -1 is None
+    rows[:, STEPS] = rng.integers(0, 10_000, len(rows))
+    for sid in range(2):
+        rows[:, STATE_HEADER_SIZE + SLIME_SIZE * sid + SLIME_CAN_JUMP] = rng.integers(0, 2, len(rows))
+    bank.save(str(tmp_path))
+    compact = BankMutator(StateBank.load(str(tmp_path)), seed=1)
+    plain = BankMutator(StateBank.load(str(tmp_path)), seed=1)
+    for _ in range(2 * BankMutator.CHUNK_SIZE + 10):
+        expected = CompactVolleyballState()
+        compact.apply(expected, {})
+        state = create_base_state()
+        plain.apply(state, {})
+        assert np.array_equal(CompactVolleyballState.from_state(state).buffer, expected.buffer)
+        assert isinstance(state.steps, int) and isinstance(state.slimes[0].can_jump, bool)
+
+
+def test_bank_reset_is_not_slower_than_the_mutator():
+    mutator = IndieDevMutator(seed=0)
+    bank = BankMutator(indiedev_bank(10_000, seed=0), INDIEDEV_WEIGHTS, seed=0)
+    state = create_base_state()
+    # Interleaved, so the noise of a shared machine hits both the same
+    ratios = []
+    for _ in range(30):
+        mutator_time = timeit.timeit(lambda: mutator.apply(state, {}), number=2000)
+        bank_time = timeit.timeit(lambda: bank.apply(state, {}), number=2000)
+        ratios.append(bank_time / mutator_time)
+    assert np.median(ratios) <= 1.0, f"bank resets take {np.median(ratios):.2f}x the mutator's"
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as directory:
+        test_plain_state_gets_the_whole_row(pathlib.Path(directory))
+    test_bank_reset_is_not_slower_than_the_mutator()
+    print("OK")
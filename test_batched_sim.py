@@ -0,0 +1,53 @@
+import numpy as np
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import BatchedSlimeVolleyballSim, create_base_state
+from slime_api.sim.fidelity import random_toss, chase_ball
+from slime_api.slimestate import CompactVolleyballState, POINT_SCORED, SCORING_SLIME, STEPS
+
+ARENAS = 64
+ENV_STEPS = 150
+TICK_SKIP = 6
+FLAGS = [POINT_SCORED, SCORING_SLIME, STEPS]
+
+
+def test_batched_sim_plays_like_the_scalar_sim():
+    rng = np.random.default_rng(0)
+    sims = []
+    for _ in range(ARENAS):
+        state = create_base_state()
+        random_toss(state, rng)
+        sims.append(SlimeVolleyballSim(state, backend="python"))
+    batched = BatchedSlimeVolleyballSim(ARENAS, auto_reset=False)
+    points = 0
+    for _ in range(ENV_STEPS):
+        actions = np.zeros((ARENAS, 2, 4), dtype=np.float32)
+        for i, sim in enumerate(sims):
+            if sim.state.point_scored:
+                state = create_base_state()
+                random_toss(state, rng)
+                sim.set_state(state)
+            # f32 against f64 math drifts apart chaotically over a rally, so every env step starts from the scalar state
+            batched.set_state(i, sim.state)
+            chase = chase_ball(sim.state)
+            actions[i, 0], actions[i, 1] = chase[0], chase[1]
+        # Off the exact spots chase_ball parks slimes on (against the net), where an f32 rounding flips the net clamp
+        actions[:, :, :3] += rng.uniform(-0.5, 0.5, (ARENAS, 2, 3)) * (1, 0, 1)
+
+        point_scored, scoring_slime = batched.step_game(actions, TICK_SKIP)
+        for i, sim in enumerate(sims):
+            sim.step_game(actions[i], TICK_SKIP)
+            assert point_scored[i] == sim.state.point_scored
+            assert scoring_slime[i] == (-1 if sim.state.scoring_slime is None else sim.state.scoring_slime)
+            expected = CompactVolleyballState.from_state(sim.state).buffer
+            got = CompactVolleyballState.from_state(batched.get_state(i)).buffer
+            assert np.array_equal(got[FLAGS], expected[FLAGS])
+            assert np.allclose(got, expected, rtol=0, atol=1e-3), f"arena {i}: {np.flatnonzero(~np.isclose(got, expected, rtol=0, atol=1e-3))}"
+            if sim.state.point_scored and sim.state.ball_position[1] <= 0:
+                assert np.allclose(batched.landing_position[i], sim.state.ball_position[::2])
+            points += sim.state.point_scored
+    assert points > ARENAS  # Enough rallies ended to cover scoring
+
+
+if __name__ == "__main__":
+    test_batched_sim_plays_like_the_scalar_sim()
+    print("OK")
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+import numpy as np
+import pytest
+from slime_api.slimecapture import EpisodeRecorder, _EpisodeWriter
+from slime_api.slimeasyncrenderer import _READ
+from slime_api.slimeengine import IndieDevEngine
+from slime_api.sim.batched_sim import create_base_state
+
+FINISHED = (".npy", ".mp4")  # What example_main.MyLogger picks up
+
+
+def record(directory: str, format: str, monkeypatch, episodes: int = 3, steps: int = 40):
+    """Records in a thread, listing directory whenever a file is about to get its final name"""
+    listings = []
+    finish = _EpisodeWriter._finish
+
+    def listing_finish(writer, path):
+        listings.append((path, sorted(os.listdir(directory))))
+        finish(writer, path)
+
+    monkeypatch.setattr(_EpisodeWriter, "_finish", listing_finish)
+    saved = []
+    recorder = EpisodeRecorder(directory, stride=1, every=1, chunk_frames=16, format=format,
+                               on_saved=lambda path, n: saved.append(path), use_process=False)
+    state = create_base_state()
+    for episode in range(episodes):
+        for step in range(steps):
+            state.steps = step
+            state.ball_position[0] = step / 10
+            recorder.render(state, {"episode": episode})
+    recorder.close()
+    return listings, saved
+
+
+@pytest.mark.parametrize("format", ["npy", "mp4"])
+def test_recordings_dir_only_lists_finished_files(tmp_path, monkeypatch, format):
+    if format == "mp4":
+        pytest.importorskip("imageio")
+    directory = str(tmp_path)
+    listings, saved = record(directory, format, monkeypatch)
+
+    assert listings
+    for path, names in listings:
+        finished = {name for name in names if name.endswith(FINISHED)}
+        assert os.path.basename(path) not in finished, f"{path} was listed before it was done"
+        assert finished <= {os.path.basename(p) for p in saved}, f"unfinished files listed: {names}"
+    names = sorted(os.listdir(directory))
+    assert names == sorted(os.path.basename(p) for p in saved)
+    assert all(name.endswith(FINISHED) for name in names)
+    if format == "npy":
+        frames = sum(len(np.load(os.path.join(directory, name))) for name in names)
+        assert frames == 3 * 40
+
+
+def saved_episodes(directory: str):
+    """{recorded episode: its frames}, from the npy chunks in order"""
+    episodes = {}
+    for name in sorted(os.listdir(directory)):
+        n = int(name.split("_")[1])
+        episodes[n] = np.concatenate([episodes[n], np.load(os.path.join(directory, name))]) if n in episodes \
+            else np.load(os.path.join(directory, name))
+    return episodes
+
+
+def render_episode(recorder: EpisodeRecorder, state, shared_info, x: float, frames: int = 3):
+    # steps stays 0, like a reset straight after a reset
+    for _ in range(frames):
+        state.ball_position[0] = x
+        recorder.render(state, shared_info)
+
+
+def test_episodes_end_at_shared_info_episode_not_steps(tmp_path):
+    recorder = EpisodeRecorder(str(tmp_path), stride=1, every=1, use_process=False)
+    state = create_base_state()
+    for episode, x in enumerate((-4, 0, 4)):
+        render_episode(recorder, state, {"episode": episode}, x)
+    recorder.close()
+    episodes = saved_episodes(str(tmp_path))
+    assert sorted(episodes) == [0, 1, 2] and all(len(frames) == 3 for frames in episodes.values())
+    assert not np.array_equal(episodes[0][0], episodes[1][0]) and not np.array_equal(episodes[1][0], episodes[2][0])
+    assert recorder.stats() == {"episodes": 3, "frames": 9, "dropped": 0}
+
+
+def test_reset_starts_an_episode_without_shared_info(tmp_path):
+    recorder = EpisodeRecorder(str(tmp_path), stride=1, every=2, use_process=False)
+    state = create_base_state()
+    for x in (-4, 0, 4):
+        render_episode(recorder, state, {}, x)
+        recorder.reset()
+    recorder.close()
+    # Every other episode: the first and the third
+    assert [len(frames) for frames in saved_episodes(str(tmp_path)).values()] == [3, 3]
+    assert recorder.stats() == {"episodes": 3, "frames": 6, "dropped": 0}
+
+
+def test_engine_counts_episodes_in_shared_info():
+    engine = IndieDevEngine()
+    shared_info = {}
+    engine.set_state(engine.create_base_state(), shared_info)
+    first = shared_info["episode"]
+    engine.set_state(engine.create_base_state(), shared_info)
+    assert shared_info["episode"] != first
+
+
+def test_frames_get_dropped_while_the_writer_is_behind(tmp_path, monkeypatch):
+    go = threading.Event()
+    add = _EpisodeWriter.add
+
+    def waiting_add(writer, state):
+        go.wait()
+        add(writer, state)
+
+    monkeypatch.setattr(_EpisodeWriter, "add", waiting_add)
+    recorder = EpisodeRecorder(str(tmp_path), stride=1, every=1, capacity=16, use_process=False)
+    state = create_base_state()
+    render_episode(recorder, state, {"episode": 0}, -4)
+    # The writer is stuck, 15 frames fit in the ring (one slot stays free) and the rest get dropped
+    render_episode(recorder, state, {"episode": 1}, 4, frames=20)
+    assert recorder.stats() == {"episodes": 2, "frames": 15, "dropped": 8}
+    go.set()
+    while recorder.ring.header[_READ] < 15:
+        time.sleep(0.01)
+    render_episode(recorder, state, {"episode": 2}, 0)
+    recorder.close()
+
+    assert recorder.stats() == {"episodes": 3, "frames": 18, "dropped": 8}
+    episodes = saved_episodes(str(tmp_path))
+    assert [len(frames) for frames in episodes.values()] == [3, 12, 3]
+    assert not np.array_equal(episodes[0][0], episodes[1][0]) and not np.array_equal(episodes[1][0], episodes[2][0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,30 @@
+import numpy as np
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.common_values import SLIME_CENTER_ON_FLOOR, SLIME_RADIUS, BALL_RADIUS
+
+DT = 0.05
+
+
+def test_slime_bounce_keeps_the_rest_of_the_tick():
+    # The ball falls onto a resting slime halfway through the tick, it has to bounce back up for the other half
+    state = create_base_state()
+    for slime, x in ((state.slimes[0], 3), (state.slimes[1], -3)):
+        slime.position[:] = [x, SLIME_CENTER_ON_FLOOR, 0]
+        slime.target[:] = slime.position
+    contact = SLIME_CENTER_ON_FLOOR + SLIME_RADIUS + BALL_RADIUS
+    state.ball_position[:] = [3, contact + 0.25, 0]
+    state.ball_velocity[:] = [0, -10, 0]
+    sim = SlimeVolleyballSim(state, dt=DT, continuous_collision=True)
+    sim.step_game({}, 1)
+
+    velocity = sim.state.ball_velocity[1]
+    assert velocity > 0
+    # About half the tick is left after the impact
+    assert np.isclose(sim.state.ball_position[1] - contact, 0.5 * velocity * DT, rtol=0.1)
+    assert sim.state.slimes[0].touches_remaining == 2
+
+
+if __name__ == "__main__":
+    test_slime_bounce_keeps_the_rest_of_the_tick()
+    print("OK")
@@ -0,0 +1,67 @@
+import numpy as np
+from slime_api.slimedone import IndieDevDoneEvaluator
+from slime_api.slimeterminalcondition import IndieDevTerminalCondition
+from slime_api.slimetrucatedcondition import IndieDevTruncatedCondition
+from slime_api.sim.batched_sim import BatchedSlimeVolleyballSim, create_base_state
+
+AGENTS = [0, 1]
+MAX_STEPS = 600
+
+
+def test_flags_match_the_old_conditions():
+    rng = np.random.default_rng(0)
+    done = IndieDevDoneEvaluator(MAX_STEPS)
+    terminal, truncated = IndieDevTerminalCondition(), IndieDevTruncatedCondition(MAX_STEPS)
+    state = create_base_state()  # Stepped in place like the engine does
+    done.terminal.reset(AGENTS, state, {})
+    done.truncated.reset(AGENTS, state, {})
+    for _ in range(2000):
+        if rng.random() < 0.05:
+            # A reset can hand back the same object at the same step count with different flags
+            done.terminal.reset(AGENTS, state, {})
+            done.truncated.reset(AGENTS, state, {})
+        else:
+            state.steps += int(rng.integers(0, 13))
+        state.steps %= 2 * MAX_STEPS
+        state.point_scored = bool(rng.random() < 0.1)
+        for slime in state.slimes.values():
+            slime.touches_remaining = float(rng.integers(0, 4) if rng.random() < 0.2 else 3)
+
+        # RLGym's order: termination, then truncation
+        assert done.terminal.is_done(AGENTS, state, {}) == terminal.is_done(AGENTS, state, {})
+        assert done.truncated.is_done(AGENTS, state, {}) == truncated.is_done(AGENTS, state, {})
+        # Truncation asked on its own, or again
+        assert done.truncated.is_done(AGENTS, state, {}) == truncated.is_done(AGENTS, state, {})
+
+
+def test_truncated_follows_the_steps_of_a_new_state():
+    done = IndieDevDoneEvaluator(MAX_STEPS)
+    state = create_base_state()
+    state.steps = MAX_STEPS
+    assert done.terminal.is_done(AGENTS, state, {}) == {0: False, 1: False}
+    assert done.truncated.is_done(AGENTS, state, {}) == {0: True, 1: True}
+    other = create_base_state()  # Same step count, another state
+    other.steps = 0
+    assert done.truncated.is_done(AGENTS, other, {}) == {0: False, 1: False}
+    state.steps = 0
+    assert done.truncated.is_done(AGENTS, state, {}) == {0: False, 1: False}
+
+
+def test_batched_flags_match_the_old_conditions():
+    sim = BatchedSlimeVolleyballSim(64, auto_reset=False)
+    rng = np.random.default_rng(1)
+    sim.point_scored[:] = rng.random(64) < 0.3
+    sim.touches_remaining[:] = rng.integers(0, 4, (64, 2))
+    sim.steps[:] = rng.integers(0, 2 * MAX_STEPS, 64)
+    terminated, truncated = IndieDevDoneEvaluator(MAX_STEPS).evaluate_sim(sim)
+    for i in range(64):
+        state = sim.get_state(i)
+        assert terminated[i] == IndieDevTerminalCondition().is_done(AGENTS, state, {})[0]
+        assert truncated[i] == IndieDevTruncatedCondition(MAX_STEPS).is_done(AGENTS, state, {})[0]
+
+
+if __name__ == "__main__":
+    test_flags_match_the_old_conditions()
+    test_truncated_follows_the_steps_of_a_new_state()
+    test_batched_flags_match_the_old_conditions()
+    print("OK")
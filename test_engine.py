@@ -0,0 +1,75 @@
+import pytest
+from slime_api.common_values import DT
+from slime_api.slimeengine import IndieDevEngine
+from slime_api.slimetrucatedcondition import IndieDevTruncatedCondition
+from slime_api.slimedone import IndieDevDoneEvaluator
+from slime_api.sim.batched_sim import create_base_state
+
+AGENTS = [0, 1]
+MAX_STEPS = 600  # What example_main uses, in sim ticks
+
+
+def start_state():
+    state = create_base_state()
+    for sid, slime in state.slimes.items():
+        slime.position[:] = (3 if sid == 0 else -3, 0, 0)
+        slime.target[:] = slime.position
+    state.ball_position[:] = (3, 5, 0)
+    return state
+
+
+def keep_ball_up(state):
+    # No point gets scored, so only the timeout can end the episode
+    if state.ball_position[1] < 3:
+        state.ball_position[:] = (3, 5, 0)
+        state.ball_velocity[:] = 0
+
+
+@pytest.mark.parametrize("tick_skip", [1, 4, 6, 10])
+def test_steps_advance_by_tick_skip(tick_skip):
+    engine = IndieDevEngine(tick_skip=tick_skip)
+    engine.reset(start_state())
+    for step in range(1, 20):
+        state = engine.step({}, {})
+        assert state.steps == step * tick_skip
+        keep_ball_up(state)
+
+
+@pytest.mark.parametrize("tick_skip", [3, 4, 6, 8])
+def test_timeout_fires_at_the_same_game_time(tick_skip):
+    engine = IndieDevEngine(tick_skip=tick_skip)
+    engine.reset(start_state())
+    truncated = IndieDevTruncatedCondition(MAX_STEPS)
+    done = IndieDevDoneEvaluator(MAX_STEPS)
+    done.terminal.reset(AGENTS, engine.state, {})
+    done.truncated.reset(AGENTS, engine.state, {})
+    env_steps = 0
+    while True:
+        state = engine.step({}, {})
+        env_steps += 1
+        assert not done.terminal.is_done(AGENTS, state, {})[0]
+        assert done.truncated.is_done(AGENTS, state, {}) == truncated.is_done(AGENTS, state, {})
+        if truncated.is_done(AGENTS, state, {})[0]:
+            break
+        keep_ball_up(state)
+    # The first env step that reaches MAX_STEPS ticks, so MAX_STEPS * DT seconds of game whatever the tick skip
+    # (counting every tick twice, like the engine used to, cut that in half)
+    assert env_steps == -(-MAX_STEPS // tick_skip)
+    assert state.steps == env_steps * tick_skip
+    seconds = state.steps * float(DT[0])
+    assert MAX_STEPS * float(DT[0]) <= seconds < (MAX_STEPS + tick_skip) * float(DT[0])
+
+
+def test_a_point_stops_the_step_short():
+    engine = IndieDevEngine(tick_skip=6)
+    state = start_state()
+    state.ball_position[:] = (3, 0.01, 2)  # Lands on the next tick, away from the slime
+    state.ball_velocity[:] = (0, -1, 0)
+    engine.reset(state)
+    state = engine.step({}, {})
+    assert state.point_scored and state.steps == 1
+    assert engine.step({}, {}).steps == 1  # Nothing moves after a point
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
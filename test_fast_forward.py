@@ -0,0 +1,108 @@
+import copy
+import numpy as np
+import pytest
+from slime_api.sim.main_sim import SlimeVolleyballSim, make_tick_loop, make_ball_step, make_fast_forward_loop, \
+    _step_ball_swept, _cooldowns, _slime_controller, _integrate_slime, _sphere_collision, _touch_ball, _integrate_ball, \
+    _bounce_ball, _hit_floor, _free_flight_ticks, _fast_forward, BOUNCED_NET_SIDE, BOUNCED_NET_TOP
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss
+
+FLIGHTS = 40
+MAX_TICKS = 400
+
+
+class Events:
+    """What the flights did: net bounces seen by the reference loop, ticks skipped by the fast-forward one"""
+    def __init__(self):
+        self.net = False
+        self.skipped = 0
+
+    def watch(self, step_ball):
+        def watched_step_ball(slimes, ball, dt):
+            hit, touched = step_ball(slimes, ball, dt)
+            self.net |= bool(hit & (BOUNCED_NET_SIDE | BOUNCED_NET_TOP))
+            return hit, touched
+
+        return watched_step_ball
+
+    def fast_forward(self, slimes, ball, ticks, acceleration, dt):
+        self.skipped += ticks
+        _fast_forward(slimes, ball, ticks, acceleration, dt)
+
+
+def flight(rng: np.random.Generator):
+    """Slimes settled at their targets and a toss over the net, or every other time a low shot into it"""
+    state = create_base_state()
+    random_toss(state, rng)
+    if rng.random() < 0.5:
+        side = np.sign(state.ball_position[0])
+        state.ball_position[:] = (side * rng.uniform(1.5, 4), rng.uniform(0.5, 1.2), rng.uniform(-2, 2))
+        state.ball_velocity[:] = (-side * rng.uniform(4, 10), rng.uniform(0, 3), rng.uniform(-1, 1))
+    return state
+
+
+def tick_loops(events: Events, continuous_collision: bool):
+    step_ball = events.watch(_step_ball_swept if continuous_collision else make_ball_step(_integrate_ball, _bounce_ball))
+    reference = make_tick_loop(_cooldowns, _slime_controller, _integrate_slime, _sphere_collision, _touch_ball,
+                               step_ball, _hit_floor)
+    return reference, make_fast_forward_loop(reference, _free_flight_ticks, events.fast_forward)
+
+
+@pytest.mark.parametrize("continuous_collision", [False, True])
+def test_fast_forward_matches_every_tick(continuous_collision):
+    rng = np.random.default_rng(0)
+    events = Events()
+    reference, fast_forward = tick_loops(events, continuous_collision)
+    scores = net_bounces = total = skipped = 0
+    for _ in range(FLIGHTS):
+        sim = SlimeVolleyballSim(flight(rng))
+        sim._load_scratch({})
+        start = (copy.deepcopy(sim._slime_scratch), list(sim._ball_scratch))
+        physics = (sim._max_speed, sim._acceleration, sim._jump_force, sim.dt)
+
+        slimes, ball = copy.deepcopy(start)
+        events.net = False
+        for tick in range(1, MAX_TICKS + 1):
+            _, scored, scorer = reference(slimes, ball, 1, *physics)
+            ff_slimes, ff_ball = copy.deepcopy(start)
+            ticks_done, ff_scored, ff_scorer = fast_forward(ff_slimes, ff_ball, tick, *physics)
+            assert ticks_done == tick and ff_scored == scored and ff_scorer == scorer, f"tick {tick}"
+            assert np.allclose(ff_ball, ball, rtol=0, atol=1e-9), f"tick {tick}"
+            assert np.allclose(np.array(ff_slimes, dtype=float), np.array(slimes, dtype=float), rtol=0, atol=1e-9), f"tick {tick}"
+            if scored:
+                break
+        scores += scored
+        net_bounces += events.net
+
+        # The whole flight in one call
+        slimes, ball = copy.deepcopy(start)
+        events.skipped = 0
+        fast_forward(slimes, ball, tick, *physics)
+        total += tick
+        skipped += events.skipped
+
+    assert skipped > total // 2, f"only {skipped} of {total} ticks skipped"
+    assert scores > FLIGHTS // 2
+    assert net_bounces > FLIGHTS // 4
+
+
+def test_step_game_with_fast_forward():
+    rng = np.random.default_rng(1)
+    for _ in range(FLIGHTS):
+        state = flight(rng)
+        sims = [SlimeVolleyballSim(copy.deepcopy(state)), SlimeVolleyballSim(copy.deepcopy(state), fast_forward=True)]
+        while not sims[0].state.point_scored:
+            ticks = int(rng.integers(1, 30))
+            for sim in sims:
+                sim.step_game({}, ticks)
+            plain, fast = (sim.state for sim in sims)
+            assert fast.steps == plain.steps and fast.point_scored == plain.point_scored
+            assert fast.scoring_slime == plain.scoring_slime
+            assert np.allclose(fast.ball_position, plain.ball_position, atol=1e-5)
+            assert np.allclose(fast.ball_velocity, plain.ball_velocity, atol=1e-5)
+            for sid, slime in plain.slimes.items():
+                assert np.allclose(fast.slimes[sid].position, slime.position, atol=1e-5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from typing import Dict
+
+# What the env modules cost on their own (numpy and rlgym not counted), every spawned worker pays it at startup
+SLIME_API_BUDGET = 50_000  # In microseconds, about 12 ms when this was written
+ENV_MODULES = ["slime_api.slimeengine", "slime_api.slimeactions", "slime_api.slimedone", "slime_api.slimeexampleobs",
+               "slime_api.slimemutator", "slime_api.slimerewards", "slime_api.slimerenderer",
+               "slime_api.slimeasyncrenderer", "slime_api.slimecapture"]
+SIM_MODULES = ["slime_api.sim.main_sim", "slime_api.sim.batched_sim", "slime_api.slimestate",
+               "slime_api.slimetrajectory", "slime_api.slimeraster"]
+# Only imported when something actually renders, jits or records
+OPTIONAL = ["pygame", "numba", "imageio", "multiprocessing.shared_memory"]
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """Self time in microseconds of every module code imports, from a fresh python -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[0].startswith("import time:") and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[0].split(":")[1])
+    return times
+
+
+def test_env_modules_skip_optional_dependencies():
+    times = import_times("import " + ", ".join(ENV_MODULES))
+    imported = [module for module in OPTIONAL if module in times]
+    assert not imported, f"{imported} got imported by the env modules"
+
+
+def test_sim_imports_without_rlgym():
+    # None in sys.modules makes the import fail, like rlgym not being installed
+    times = import_times("import sys; sys.modules['rlgym'] = None; import " + ", ".join(SIM_MODULES))
+    imported = [module for module in OPTIONAL if module in times]
+    assert not imported, f"{imported} got imported by the sim"
+
+
+def test_slime_api_import_budget():
+    times = import_times("import " + ", ".join(ENV_MODULES))
+    own = {module: time for module, time in times.items() if module.startswith("slime_api")}
+    total = sum(own.values())
+    slowest = sorted(own.items(), key=lambda item: -item[1])[:3]
+    assert total < SLIME_API_BUDGET, f"slime_api took {total} us to import, slowest {slowest}"
+
+
+if __name__ == "__main__":
+    test_env_modules_skip_optional_dependencies()
+    test_sim_imports_without_rlgym()
+    test_slime_api_import_budget()
+    print("OK")
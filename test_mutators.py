@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from slime_api.slimemutator import BatchedMutator, WeightedMutator, IndieDevMutator, DropMutator, TossMutator, \
+    HardTossMutator
+from slime_api.slimestate import CompactVolleyballState
+from slime_api.sim.batched_sim import create_base_state
+
+
+def reset_states(mutator, n: int = 600):
+    # More than two batches, so refills are covered too
+    states = []
+    for _ in range(n):
+        state = create_base_state()
+        mutator.apply(state, {})
+        states.append(CompactVolleyballState.from_state(state).buffer)
+    return np.stack(states)
+
+
+def test_same_seed_same_states():
+    assert np.array_equal(reset_states(IndieDevMutator(seed=7)), reset_states(IndieDevMutator(seed=7)))
+    # A smaller batch draws differently but still reproducibly
+    assert np.array_equal(reset_states(IndieDevMutator(seed=7, batch_size=32)),
+                          reset_states(IndieDevMutator(seed=7, batch_size=32)))
+
+
+def test_different_seeds_different_states():
+    first, second = reset_states(IndieDevMutator(seed=7)), reset_states(IndieDevMutator(seed=8))
+    assert not np.any(np.all(first == second, axis=1)), "two seeds gave the same reset"
+
+
+class CountingMutator:
+    """Not a BatchedMutator, so WeightedMutator.apply calls it for every state it picks"""
+    def __init__(self):
+        self.calls = 0
+
+    def apply(self, state, shared_info):
+        self.calls += 1
+
+
+def test_from_zipped_picks_at_the_weights():
+    weights = (0.2, 0.5, 0.3)
+    n = 30_000
+    counting = [CountingMutator() for _ in weights]
+    mutator = WeightedMutator.from_zipped(*zip(counting, weights), seed=0)
+    state = create_base_state()
+    for _ in range(n):
+        mutator.apply(state, {})
+    # 4 sigma of a binomial at n draws
+    for weight, picked in zip(weights, counting):
+        assert abs(picked.calls / n - weight) < 4 * np.sqrt(weight * (1 - weight) / n)
+
+    batched = WeightedMutator.from_zipped((DropMutator(0), weights[0]), (TossMutator(1), weights[1]),
+                                          (HardTossMutator(2), weights[2]), seed=0)
+    _, choices = batched.sample_with_choices(n)
+    for idx, weight in enumerate(weights):
+        assert abs(np.mean(choices == idx) - weight) < 4 * np.sqrt(weight * (1 - weight) / n)
+
+
+def test_batched_mutator_needs_sample():
+    class NoSample(BatchedMutator):
+        pass
+
+    with pytest.raises(TypeError):
+        NoSample()
+
+
+if __name__ == "__main__":
+    test_same_seed_same_states()
+    test_different_seeds_different_states()
+    test_from_zipped_picks_at_the_weights()
+    test_batched_mutator_needs_sample()
+    print("OK")
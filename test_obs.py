@@ -0,0 +1,114 @@
+import numpy as np
+from slime_api.slimeexampleobs import IndieDevDefaultObs
+from slime_api.slimestate import CompactVolleyballState
+from slime_api.sim.batched_sim import BatchedSlimeVolleyballSim, create_base_state
+
+AGENTS = [0, 1]
+
+
+class BaselineObs:
+    """The obs builder before the shared buffer, one np.append at a time"""
+    def reset(self, agents, initial_state):
+        self.started_on_right = {agent: (initial_state.slimes[agent].position[0] > 0) for agent in agents}
+
+    def build_obs(self, agents, state):
+        observations = {}
+        for host_agent in agents:
+            invert = self.started_on_right[host_agent]
+            obs = np.array([], dtype=np.float32)
+            if invert:
+                ball_pos_x = -state.ball_position[0]
+                ball_pos_z = -state.ball_position[2]
+                ball_vel_x = -state.ball_velocity[0]
+                ball_vel_z = -state.ball_velocity[2]
+            else:
+                ball_pos_x = state.ball_position[0]
+                ball_pos_z = state.ball_position[2]
+                ball_vel_x = state.ball_velocity[0]
+                ball_vel_z = state.ball_velocity[2]
+            obs = np.append(obs, [ball_pos_x, state.ball_position[1], ball_pos_z,
+                                  ball_vel_x, state.ball_velocity[1], ball_vel_z])
+            obs = np.append(obs, self._build_obs_for_agent(host_agent, state, invert))
+            for agent in agents:
+                if agent != host_agent:
+                    obs = np.append(obs, self._build_obs_for_agent(agent, state, invert))
+            observations[host_agent] = obs
+        return observations
+
+    def _build_obs_for_agent(self, agent, state, invert):
+        pos = state.slimes[agent].position
+        vel = state.slimes[agent].velocity
+        if invert:
+            data = [-pos[0], -pos[2], -vel[0], -vel[2]]
+        else:
+            data = [pos[0], pos[2], vel[0], vel[2]]
+        data += [vel[1], pos[1], state.slimes[agent].touches_remaining / 3, float(state.slimes[agent].can_jump)]
+        return np.array(data, dtype=np.float32)
+
+
+def random_state(rng: np.random.Generator):
+    state = create_base_state()
+    for slime in state.slimes.values():
+        slime.position[:] = rng.uniform(-6, 6, 3)
+        slime.velocity[:] = rng.uniform(-10, 10, 3)
+        slime.touches_remaining = float(rng.integers(0, 4))
+        slime.can_jump = bool(rng.random() < 0.5)
+    state.ball_position[:] = rng.uniform(-6, 6, 3)
+    state.ball_velocity[:] = rng.uniform(-20, 20, 3)
+    return state
+
+
+def test_matches_the_baseline_obs():
+    rng = np.random.default_rng(0)
+    for compact in (False, True):
+        obs, baseline = IndieDevDefaultObs(), BaselineObs()
+        for episode in range(20):
+            # Every side combination, the started_on_right mirroring included
+            initial = random_state(rng)
+            initial.slimes[0].position[0] = [3, -3][episode % 2]
+            initial.slimes[1].position[0] = [3, -3][episode // 2 % 2]
+            obs.reset(AGENTS, initial, {})
+            baseline.reset(AGENTS, initial)
+            for _ in range(20):
+                state = random_state(rng)
+                built = obs.build_obs(AGENTS, CompactVolleyballState.from_state(state) if compact else state, {})
+                expected = baseline.build_obs(AGENTS, state)
+                for agent in AGENTS:
+                    assert built[agent].shape == (obs.obs_dim,)
+                    assert np.allclose(built[agent], expected[agent], rtol=1e-6, atol=0), f"agent {agent}"
+
+
+def test_obs_survive_the_next_build():
+    rng = np.random.default_rng(1)
+    obs = IndieDevDefaultObs()
+    obs.reset(AGENTS, random_state(rng), {})
+    kept, copies = [], []
+    for _ in range(5):
+        built = obs.build_obs(AGENTS, random_state(rng), {})
+        kept.append(built)  # Like a rollout buffer storing the dict values
+        copies.append({agent: values.copy() for agent, values in built.items()})
+    for built, copied in zip(kept, copies):
+        assert all(np.array_equal(built[agent], copied[agent]) for agent in AGENTS)
+
+
+def test_batch_matches_the_baseline_obs():
+    rng = np.random.default_rng(2)
+    sim = BatchedSlimeVolleyballSim(16, auto_reset=False)
+    states = [random_state(rng) for _ in range(16)]
+    for i, state in enumerate(states):
+        sim.set_state(i, state)
+    started_on_right = rng.random((16, 2)) < 0.5
+    batch = IndieDevDefaultObs().build_obs_batch(sim, started_on_right)
+    baseline = BaselineObs()
+    for i, state in enumerate(states):
+        baseline.started_on_right = dict(zip(AGENTS, started_on_right[i]))
+        expected = baseline.build_obs(AGENTS, sim.get_state(i))
+        for agent in AGENTS:
+            assert np.allclose(batch[i, agent], expected[agent], rtol=1e-6, atol=0)
+
+
+if __name__ == "__main__":
+    test_matches_the_baseline_obs()
+    test_obs_survive_the_next_build()
+    test_batch_matches_the_baseline_obs()
+    print("OK")
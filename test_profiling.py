@@ -0,0 +1,49 @@
+import copy
+import numpy as np
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss, chase_ball
+from slime_api.sim.profiling import PhaseProfiler, SIM_PHASES
+from slime_api.common_values import STAGE_RADIUS, BALL_RADIUS
+
+
+def test_profiled_loop_plays_the_same_game():
+    rng = np.random.default_rng(0)
+    for continuous_collision in (False, True):
+        profiler = PhaseProfiler()
+        for _ in range(10):
+            state = create_base_state()
+            random_toss(state, rng)
+            plain = SlimeVolleyballSim(copy.deepcopy(state), continuous_collision=continuous_collision)
+            profiled = SlimeVolleyballSim(copy.deepcopy(state), continuous_collision=continuous_collision,
+                                          profiler=profiler)
+            while not plain.state.point_scored and plain.state.steps < 600:
+                actions = chase_ball(plain.state)
+                plain.step_game(actions, 6)
+                profiled.step_game(actions, 6)
+                assert np.array_equal(plain.state.ball_position, profiled.state.ball_position)
+                assert plain.state.steps == profiled.state.steps
+            assert plain.state.scoring_slime == profiled.state.scoring_slime
+        # The sweep handles the net and walls itself, it's all ball_integration
+        timed = set(SIM_PHASES) - ({"net_walls"} if continuous_collision else set())
+        assert timed <= set(profiler.times), f"missing {timed - set(profiler.times)}"
+        assert profiler.events["points"] == 10
+
+
+def test_wall_hit_without_velocity_into_it_is_counted():
+    # Pushed past the side wall (a slime can do that) with no z velocity, the bounce doesn't change any velocity
+    state = create_base_state()
+    state.ball_position[:] = [3, 4, STAGE_RADIUS[1] - BALL_RADIUS + 0.05]
+    state.ball_velocity[:] = 0
+    profiler = PhaseProfiler()
+    sim = SlimeVolleyballSim(state, profiler=profiler)
+    sim.step_game({}, 1)
+
+    assert profiler.events.get("side_wall_bounces") == 1
+    assert np.isclose(sim.state.ball_position[2], STAGE_RADIUS[1] - BALL_RADIUS)
+
+
+if __name__ == "__main__":
+    test_profiled_loop_plays_the_same_game()
+    test_wall_hit_without_velocity_into_it_is_counted()
+    print("OK")
@@ -0,0 +1,61 @@
+import numpy as np
+from rlgym.rocket_league.reward_functions import CombinedReward
+from martico_rewards import PointRward, TouchesReward, BallDistanceReward
+from slime_api.slimerewards import WeightedReward, RewardArrays, PointTerm, TouchesTerm, BallDistanceTerm
+from slime_api.slimestate import CompactVolleyballState
+from slime_api.sim.batched_sim import create_base_state
+
+AGENTS = [0, 1]
+NOT_DONE = {agent: False for agent in AGENTS}
+PAIRS = [(PointTerm, PointRward), (TouchesTerm, TouchesReward), (BallDistanceTerm, BallDistanceReward)]
+
+
+def random_states(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        state = create_base_state()
+        for slime in state.slimes.values():
+            slime.position[:] = rng.uniform(-7, 7, 3)
+            slime.touches_remaining = float(rng.integers(0, 4))
+        state.ball_position[:] = rng.uniform(-7, 7, 3)
+        state.point_scored = bool(rng.random() < 0.5)
+        state.scoring_slime = [None, 0, 1][rng.integers(0, 3)] if state.point_scored else None
+        yield state
+
+
+def test_terms_match_martico_rewards():
+    for term_type, reward_type in PAIRS:
+        term, reward = term_type(), reward_type()
+        arrays = RewardArrays(AGENTS)
+        for state in random_states(500):
+            expected = reward.get_rewards(AGENTS, state, NOT_DONE, NOT_DONE, {})
+            expected = [expected[agent] for agent in AGENTS]
+            scalar = term.compute_state(AGENTS, state, NOT_DONE, NOT_DONE, {})
+            vectorized = term.compute(arrays.load(state))
+            compact = term.compute(arrays.load(CompactVolleyballState.from_state(state)))
+            for values in (scalar, vectorized, compact):
+                assert np.allclose(values, expected, rtol=1e-6, atol=1e-7), f"{term_type.__name__}: {values} vs {expected}"
+
+
+def test_weighted_reward_matches_combined_reward():
+    weights = (50, 0.2, 1)
+    combined = CombinedReward(*((reward(), weight) for (_, reward), weight in zip(PAIRS, weights)))
+    weighted = WeightedReward(*((term(), weight) for (term, _), weight in zip(PAIRS, weights)))
+    states = list(random_states(200, seed=1))
+    combined.reset(AGENTS, states[0], {})
+    weighted.reset(AGENTS, states[0], {})
+    for state in states:
+        expected = combined.get_rewards(AGENTS, state, NOT_DONE, NOT_DONE, {})
+        rewards = weighted.get_rewards(AGENTS, state, NOT_DONE, NOT_DONE, {})
+        assert rewards.keys() == expected.keys()
+        assert np.allclose([rewards[a] for a in AGENTS], [expected[a] for a in AGENTS], rtol=1e-6, atol=1e-6)
+        # The breakdown of that call, as arrays
+        assert weighted.last_terms.shape == (3, 2)
+        assert np.allclose(weighted.weights @ weighted.last_terms, weighted.last_total)
+        assert np.allclose(weighted.last_total, [rewards[a] for a in AGENTS])
+
+
+if __name__ == "__main__":
+    test_terms_match_martico_rewards()
+    test_weighted_reward_matches_combined_reward()
+    print("OK")
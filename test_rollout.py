@@ -0,0 +1,56 @@
+import copy
+import numpy as np
+import pytest
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss
+from slime_api.slimestate import CompactVolleyballState
+
+BRANCHES = 6
+ACTIONS = 30
+TICKS_PER_ACTION = 3
+
+
+def drop_on_slime(rng: np.random.Generator):
+    """The ball falls onto slime 0, every branch wanders around it differently (some hit it, some let it drop)"""
+    state = create_base_state()
+    random_toss(state, rng)
+    state.ball_position[:] = state.slimes[0].position + (0, 3, 0)
+    state.ball_velocity[:] = 0
+    actions = np.zeros((BRANCHES, ACTIONS, 2, 4), dtype=np.float32)
+    actions[:, :, 0, :3] = state.slimes[0].position + rng.uniform(-1.5, 1.5, (BRANCHES, ACTIONS, 3)) * (1, 0, 1)
+    actions[:, :, 0, 0] = np.clip(actions[:, :, 0, 0], 0.5, 6)  # Everyone stays on their side
+    actions[:, :, 1, :3] = state.slimes[1].position
+    actions[..., 3] = rng.random((BRANCHES, ACTIONS, 2)) < 0.3
+    return state, actions
+
+
+@pytest.mark.parametrize("backend", ["python", "numba"])
+@pytest.mark.parametrize("continuous_collision", [False, True])
+def test_rollout_plays_like_step_game(backend, continuous_collision):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    state, actions = drop_on_slime(rng)
+    config = dict(dt=0.038, continuous_collision=continuous_collision, backend=backend)
+    sim = SlimeVolleyballSim(copy.deepcopy(state), **config)
+    before = CompactVolleyballState.from_state(sim.state)
+    outcome = sim.rollout(actions, TICKS_PER_ACTION)
+
+    assert np.array_equal(CompactVolleyballState.from_state(sim.state).buffer, before.buffer), "rollout moved the sim"
+    for m in range(BRANCHES):
+        branch = SlimeVolleyballSim(copy.deepcopy(state), **config)
+        for action in actions[m]:
+            branch.step_game(action, TICKS_PER_ACTION)
+        assert outcome.point_scored[m] == branch.state.point_scored
+        assert outcome.ticks[m] == branch.state.steps
+        assert np.array_equal(sim.rollout_states[m], CompactVolleyballState.from_state(branch.state).buffer)
+        if branch.state.point_scored:
+            assert outcome.scoring_slime[m] == branch.state.scoring_slime
+            if branch.state.ball_position[1] <= 0:
+                assert np.allclose(outcome.landing_position[m], branch.state.ball_position[::2])
+    assert outcome.point_scored.any() and outcome.touches.any()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
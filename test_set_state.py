@@ -0,0 +1,74 @@
+import os
+import numpy as np
+import pytest
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss
+from slime_api.slimestate import CompactVolleyballState
+
+
+def arrays_of(state):
+    return [state.ball_position, state.ball_velocity] + [array for slime in state.slimes.values()
+                                                         for array in (slime.position, slime.velocity, slime.target)]
+
+
+def toss(seed: int):
+    state = create_base_state()
+    random_toss(state, np.random.default_rng(seed))
+    return state
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_set_state_copies_without_aliasing(compact):
+    start = toss(0)
+    sim = SlimeVolleyballSim(CompactVolleyballState.from_state(start) if compact else start)
+    state = sim.state
+    arrays = arrays_of(state)
+
+    goal = toss(1)
+    goal.ball_position = goal.ball_position.astype(np.float64)  # Gets cast, not adopted
+    goal.slimes[0].touches_remaining = 1
+    goal.steps = 42
+    sim.set_state(goal)
+    assert sim.state is state and all(mine is kept for mine, kept in zip(arrays_of(state), arrays))
+    assert state.ball_position.dtype == np.float32
+    assert np.allclose(state.ball_position, goal.ball_position) and state.slimes[0].touches_remaining == 1
+    assert state.steps == 42
+
+    # Neither side sees the other's writes afterwards
+    expected = CompactVolleyballState.from_state(state).buffer.copy()
+    goal.ball_position[:] = 0
+    goal.slimes[1].velocity[:] = 5
+    goal.slimes[1].target[:] = 5
+    assert np.array_equal(CompactVolleyballState.from_state(state).buffer, expected)
+    sim.step_game({0: np.array([1, 0, 1, 1], dtype=np.float32)}, 6)
+    assert not goal.point_scored and goal.steps == 42 and np.all(goal.slimes[0].target != 1)
+
+
+def test_set_state_keeps_stats_and_renderer():
+    sim = SlimeVolleyballSim(toss(0), max_speed=9, acceleration=4, jump_force=1, render_mode="numpy", dt=0.03,
+                             fast_forward=True)
+    before = sim.render()
+    rasterizer = sim.rasterizer
+    sim.set_state(toss(1))
+    assert sim.rasterizer is rasterizer and sim.render_mode == "numpy"
+    assert (sim.max_speed_points, sim.acceleration_points, sim.jump_force_points) == (9, 4, 1)
+    assert sim.dt == 0.03 and sim.fast_forward
+    after = sim.render()
+    assert after.shape == before.shape and not np.array_equal(after, before)  # Draws the new state
+
+
+def test_set_state_keeps_the_pygame_view():
+    pytest.importorskip("pygame")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    sim = SlimeVolleyballSim(toss(0), render_mode="rgb_array")
+    before = sim.render()
+    view = sim.view
+    sim.set_state(toss(1))
+    assert sim.view is view
+    assert not np.array_equal(sim.render(), before)
+    sim.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,100 @@
+import pickle
+import numpy as np
+import pytest
+from slime_api.slimestate import CompactVolleyballState, STEPS_LIMIT
+from slime_api.sim.batched_sim import create_base_state
+
+
+def random_state(rng: np.random.Generator):
+    state = create_base_state()
+    for slime in state.slimes.values():
+        slime.position[:] = rng.uniform(-6, 6, 3)
+        slime.velocity[:] = rng.uniform(-10, 10, 3)
+        slime.target[:] = rng.uniform(-6, 6, 3)
+        slime.touches_remaining = float(rng.integers(0, 4))
+        slime.can_jump = bool(rng.random() < 0.5)
+        slime.jump_cooldown = float(np.float32(rng.uniform(0, 0.5)))  # What f32 can hold, so round trips are exact
+        slime.touch_cooldown = float(np.float32(rng.uniform(0, 0.1)))
+    state.ball_position[:] = rng.uniform(-6, 6, 3)
+    state.ball_velocity[:] = rng.uniform(-20, 20, 3)
+    state.point_scored = bool(rng.random() < 0.5)
+    state.scoring_slime = [None, 0, 1][rng.integers(0, 3)]
+    state.steps = int(rng.integers(0, STEPS_LIMIT))
+    return state
+
+
+def assert_same_state(state, other):
+    assert state.slimes.keys() == other.slimes.keys()
+    for sid, slime in state.slimes.items():
+        theirs = other.slimes[sid]
+        for name in ("position", "velocity", "target"):
+            assert np.array_equal(getattr(slime, name), getattr(theirs, name)), name
+        for name in ("touches_remaining", "can_jump", "jump_cooldown", "touch_cooldown"):
+            assert getattr(slime, name) == getattr(theirs, name), name
+            assert type(getattr(slime, name)) is type(getattr(theirs, name)), name
+    assert np.array_equal(state.ball_position, other.ball_position)
+    assert np.array_equal(state.ball_velocity, other.ball_velocity)
+    assert state.point_scored is other.point_scored
+    assert state.scoring_slime == other.scoring_slime
+    assert state.steps == other.steps and isinstance(other.steps, int)
+
+
+def test_load_store_round_trip():
+    rng = np.random.default_rng(0)
+    compact = CompactVolleyballState()
+    for _ in range(200):
+        state = random_state(rng)
+        compact.load(state)
+        assert_same_state(state, compact)
+        out = create_base_state()
+        arrays = [out.ball_position, out.slimes[0].position]
+        compact.store(out)
+        assert_same_state(state, out)
+        assert out.ball_position is arrays[0] and out.slimes[0].position is arrays[1]  # Written in place
+
+        # Compact to compact is a buffer copy
+        other = CompactVolleyballState()
+        other.load(compact)
+        assert np.array_equal(other.buffer, compact.buffer) and other.buffer is not compact.buffer
+
+
+def test_copy_is_independent():
+    compact = CompactVolleyballState.from_state(random_state(np.random.default_rng(1)))
+    copied = compact.copy()
+    assert_same_state(compact, copied)
+    copied.slimes[0].position[0] += 1
+    copied.ball_velocity = (0, 0, 0)
+    copied.steps += 1
+    assert copied.slimes[0].position[0] != compact.slimes[0].position[0]
+    assert not np.array_equal(copied.ball_velocity, compact.ball_velocity)
+    assert copied.steps == compact.steps + 1
+
+
+def test_pickle_round_trip():
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        compact = CompactVolleyballState.from_state(random_state(rng))
+        unpickled = pickle.loads(pickle.dumps(compact))
+        assert_same_state(compact, unpickled)
+        # The slimes are views into the new buffer, not the old one
+        assert np.shares_memory(unpickled.slimes[1].velocity, unpickled.buffer)
+        assert not np.shares_memory(unpickled.buffer, compact.buffer)
+
+
+def test_steps_stay_exact():
+    compact = CompactVolleyballState()
+    compact.steps = STEPS_LIMIT - 1
+    assert compact.steps == STEPS_LIMIT - 1
+    with pytest.raises(ValueError):
+        compact.steps = STEPS_LIMIT
+    with pytest.raises(ValueError):
+        compact.steps += 1
+    assert compact.steps == STEPS_LIMIT - 1
+
+
+if __name__ == "__main__":
+    test_load_store_round_trip()
+    test_copy_is_independent()
+    test_pickle_round_trip()
+    test_steps_stay_exact()
+    print("OK")
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from slime_api.sim.main_sim import SlimeVolleyballSim
+from slime_api.sim.batched_sim import create_base_state
+from slime_api.sim.fidelity import random_toss, chase_ball
+from slime_api.slimestate import CompactVolleyballState
+
+
+def buffer_of(sim):
+    return CompactVolleyballState.from_state(sim.state).buffer.copy()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_restore_goes_back_to_the_snapshot(compact):
+    state = create_base_state()
+    random_toss(state, np.random.default_rng(0))
+    sim = SlimeVolleyballSim(CompactVolleyballState.from_state(state) if compact else state)
+    handles, saved = [], []
+    for _ in range(10):
+        handles.append(sim.snapshot())
+        saved.append(buffer_of(sim))
+        sim.step_game(chase_ball(sim.state), 6)
+    state = sim.state
+    for handle, expected in reversed(list(zip(handles, saved))):
+        assert sim.restore(handle) is state  # Loaded into the state we had
+        assert np.array_equal(buffer_of(sim), expected)
+        # Playing on from a snapshot gives the same game as the first time
+        sim.step_game(chase_ball(sim.state), 6)
+        if handle + 1 < len(saved):
+            assert np.array_equal(buffer_of(sim), saved[handle + 1])
+    # A snapshot can be restored more than once
+    sim.restore(handles[3])
+    assert np.array_equal(buffer_of(sim), saved[3])
+
+
+def test_overwritten_snapshot_raises():
+    sim = SlimeVolleyballSim(create_base_state(), snapshot_capacity=4)
+    with pytest.raises(ValueError):
+        sim.restore(0)  # Nothing taken yet
+    handles = []
+    for steps in range(6):
+        sim.state.steps = steps
+        handles.append(sim.snapshot())
+    for handle in handles[:2]:
+        with pytest.raises(ValueError, match="overwritten"):
+            sim.restore(handle)
+    for handle in handles[2:]:
+        assert sim.restore(handle).steps == handle
+    for handle in (-1, 6):
+        with pytest.raises(ValueError, match="No snapshot"):
+            sim.restore(handle)
+    assert sim.state.steps == 5  # The failed restores changed nothing
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
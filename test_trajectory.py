@@ -0,0 +1,74 @@
+import numpy as np
+from slime_api.common_values import *
+from slime_api.sim.main_sim import make_ball_step, _integrate_ball, _bounce_ball, _hit_floor, NEAR_NET, \
+    BOUNCED_NET_SIDE, BOUNCED_NET_TOP, BOUNCED_BACK_WALL
+from slime_api.slimetrajectory import predict_landing, time_to_net, NET_SIDE_X, NET_TOP_Y
+
+_DT = float(DT[0])
+TOSSES = 3000
+MAX_BOUNCES = 8
+step_ball = make_ball_step(_integrate_ball, _bounce_ball)
+
+
+def random_tosses(n: int, seed: int = 0):
+    """Balls anywhere over the court (not inside the net) going any way at up to 15 units/s per axis"""
+    rng = np.random.default_rng(seed)
+    positions = np.column_stack([rng.uniform(-6, 6, n), rng.uniform(0.5, 5, n), rng.uniform(-3, 3, n)]).astype(np.float32)
+    velocities = rng.uniform(-15, 15, (n, 3)).astype(np.float32)
+    inside = (np.abs(positions[:, 0]) < NET_SIDE_X) & (positions[:, 1] < NET_TOP_Y)
+    return positions[~inside], velocities[~inside]
+
+
+def fly(position, velocity):
+    """The sim's ball alone, tick by tick until the floor: (ticks, ball, first net tick, first back wall tick, bounces)"""
+    ball = [*map(float, position), *map(float, velocity)]
+    ticks, net, back_wall, bounces = 0, None, None, 0
+    while True:
+        hit, _ = step_ball([], ball, _DT)
+        ticks += 1
+        bounces += bool(hit & ~NEAR_NET)
+        if net is None and hit & (BOUNCED_NET_SIDE | BOUNCED_NET_TOP):
+            net = ticks
+        if back_wall is None and hit & BOUNCED_BACK_WALL:
+            back_wall = ticks
+        if _hit_floor(ball):
+            return ticks, ball, net, back_wall, bounces
+
+
+def test_predict_landing_matches_simulated_flight():
+    positions, velocities = random_tosses(TOSSES)
+    times, landing_xz, sides = predict_landing(positions, velocities, MAX_BOUNCES)
+    beyond = 0
+    for i in range(len(positions)):
+        ticks, ball, _, _, bounces = fly(positions[i], velocities[i])
+        if bounces > MAX_BOUNCES:
+            # Past max_bounces the prediction flies free. A ball rolling along the net top bounces every tick.
+            beyond += 1
+            continue
+        assert round(float(times[i]) / _DT) == ticks, f"toss {i}"
+        assert np.allclose(landing_xz[i], (ball[0], ball[2]), atol=1e-4), f"toss {i}"
+        assert sides[i] == (1 if ball[0] > 0 else -1), f"toss {i}"
+    # Every flight within max_bounces matches, and the rest stay rare
+    assert beyond < 0.01 * len(positions)
+
+
+def test_time_to_net_matches_simulated_flight():
+    positions, velocities = random_tosses(TOSSES, seed=1)
+    times = time_to_net(positions, velocities)
+    hits = 0
+    for i in range(len(positions)):
+        ticks, _, net, back_wall, _ = fly(positions[i], velocities[i])
+        # time_to_net ignores the back walls (side walls only change z)
+        if net is not None and (back_wall is None or back_wall > net):
+            assert round(float(times[i]) / _DT) == net, f"toss {i}"
+            hits += 1
+        else:
+            first = ticks if back_wall is None else min(ticks, back_wall)
+            assert times[i] > (first - 0.5) * _DT, f"toss {i}"
+    assert hits > 100
+
+
+if __name__ == "__main__":
+    test_predict_landing_matches_simulated_flight()
+    test_time_to_net_matches_simulated_flight()
+    print("OK")
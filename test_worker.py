@@ -0,0 +1,79 @@
+import multiprocessing
+import pytest
+from slime_api.slimeworker import worker_index, WORKER_ENV_VAR
+from slime_api.slimerenderer import renderer_for_worker, NullRenderer
+
+
+class Built:
+    def __init__(self, made: list):
+        made.append(self)
+
+    def close(self):
+        pass
+
+
+def test_explicit_index_wins(monkeypatch):
+    monkeypatch.delenv(WORKER_ENV_VAR, raising=False)
+    assert worker_index() == -1  # The main process
+    assert worker_index(3) == 3
+    monkeypatch.setenv(WORKER_ENV_VAR, "2")
+    assert worker_index() == 2
+    assert worker_index(0) == 0
+
+
+def test_only_worker_0_builds_the_renderer(monkeypatch):
+    monkeypatch.delenv(WORKER_ENV_VAR, raising=False)
+    made = []
+    renderers = [renderer_for_worker(lambda: Built(made), index=index) for index in range(4)]
+    assert len(made) == 1 and renderers[0] is made[0]
+    assert all(isinstance(renderer, NullRenderer) for renderer in renderers[1:])
+    # The main process is -1, it doesn't render unless asked to
+    assert isinstance(renderer_for_worker(lambda: Built(made)), NullRenderer) and len(made) == 1
+    assert renderer_for_worker(lambda: Built(made), worker=-1) is made[1]
+    monkeypatch.setenv(WORKER_ENV_VAR, "0")
+    assert renderer_for_worker(lambda: Built(made)) is made[2]
+
+
+def _context():
+    return multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+def _build_in_worker(results, index) -> None:
+    made = []
+    renderer_for_worker(lambda: Built(made), index=index)
+    results.put((worker_index(index), len(made)))
+
+
+def _launch(results, other_process_first: bool, pass_index: bool) -> None:
+    # A launcher of its own, multiprocessing numbers the processes per parent
+    context = _context()
+    if other_process_first:
+        other = context.Process(target=int)
+        other.start()
+        other.join()
+    workers = [context.Process(target=_build_in_worker, args=(results, index if pass_index else None))
+               for index in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+@pytest.mark.parametrize("other_process_first, pass_index, expected", [
+    (False, False, {0: 1, 1: 0, 2: 0}),  # Like rlgym_ppo: workers started first and in order
+    (True, True, {0: 1, 1: 0, 2: 0}),
+    (True, False, {1: 0, 2: 0, 3: 0}),  # Why the index should be passed: the fallback counts every process
+])
+def test_one_worker_builds_the_renderer(monkeypatch, other_process_first, pass_index, expected):
+    monkeypatch.delenv(WORKER_ENV_VAR, raising=False)
+    context = _context()
+    results = context.Queue()
+    launcher = context.Process(target=_launch, args=(results, other_process_first, pass_index))
+    launcher.start()
+    built = dict(results.get(timeout=60) for _ in range(3))
+    launcher.join()
+    assert built == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])